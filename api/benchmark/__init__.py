@@ -0,0 +1 @@
+"""Offline load test for the API, see `python -m api.benchmark --help`."""
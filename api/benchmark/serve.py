@@ -0,0 +1,32 @@
+"""Runs the API with all outgoing requests routed to the stand-in server, started by `python -m api.benchmark`."""
+
+import argparse
+import os
+
+import uvicorn
+
+from api.benchmark.standins import install_routing
+
+# uvicorn imports `api.benchmark.serve:app` in every worker process, which is where the routing has to be installed
+STANDINS_ENV = "DEMOCRACIV_API_BENCHMARK_STANDINS"
+
+if __name__ != "__main__":
+    install_routing(os.environ[STANDINS_ENV])
+
+    from api.main import app  # noqa: F401
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--standins", required=True)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ[STANDINS_ENV] = args.standins
+    uvicorn.run(
+        "api.benchmark.serve:app",
+        host="127.0.0.1",
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+    )
@@ -0,0 +1,262 @@
+"""
+Local stand-ins for Meilisearch, Reddit, Twitch and Discord webhooks, so that the API can be benchmarked
+without network access. Every service answers with just enough JSON for our providers to be happy after
+waiting a typical response time for that service.
+"""
+
+import asyncio
+import collections
+import itertools
+import random
+import typing
+
+import aiohttp
+import yarl
+
+from aiohttp import web
+
+# host -> path prefix on the stand-in server
+HOSTS = {
+    "oauth.reddit.com": "reddit",
+    "www.reddit.com": "reddit",
+    "reddit.com": "reddit",
+    "api.twitch.tv": "twitch",
+    "id.twitch.tv": "twitch",
+    "discord.com": "discord",
+}
+
+# seconds, roughly what these services take from a VPS in Europe
+LATENCY = {
+    "meilisearch": 0.015,
+    "reddit": 0.25,
+    "twitch": 0.12,
+    "discord": 0.08,
+}
+
+_task_ids = itertools.count(1)
+
+
+def route(
+    base_url: str, url: typing.Union[str, yarl.URL]
+) -> typing.Union[str, yarl.URL]:
+    """Rewrite requests to the real services to the stand-in server at `base_url`."""
+
+    parsed = yarl.URL(url)
+
+    if parsed.host not in HOSTS:
+        return url
+
+    return f"{base_url}/{HOSTS[parsed.host]}{parsed.raw_path_qs}"
+
+
+def install_routing(base_url: str):
+    """Send every request of every aiohttp.ClientSession in this process that would go to one of `HOSTS`
+    to the stand-in server instead."""
+
+    original = aiohttp.ClientSession._request
+
+    async def _request(session, method, str_or_url, **kwargs):
+        return await original(session, method, route(base_url, str_or_url), **kwargs)
+
+    aiohttp.ClientSession._request = _request
+
+
+class StandIns:
+    def __init__(self, *, port: int, latency_factor: float = 1.0):
+        self.port = port
+        self.latency_factor = latency_factor
+        self.calls: typing.Counter[str] = collections.Counter()
+        # Discord webhook posts by the token of the webhook, which the load test sets to the provider
+        self.webhook_posts: typing.Counter[str] = collections.Counter()
+        self.app = web.Application(middlewares=[self._account])
+        self.runner = web.AppRunner(self.app, access_log=None)
+        self._posts = itertools.count(1)
+
+        self.app.add_routes(
+            [
+                web.get("/meilisearch/indexes/{index}", self.meili_get_index),
+                web.post("/meilisearch/indexes", self.meili_task),
+                web.delete("/meilisearch/indexes/{index}", self.meili_task),
+                web.patch("/meilisearch/indexes/{index}/settings", self.meili_task),
+                web.put(
+                    "/meilisearch/indexes/{index}/settings/{setting}", self.meili_task
+                ),
+                web.post("/meilisearch/indexes/{index}/documents", self.meili_task),
+                web.post(
+                    "/meilisearch/indexes/{index}/documents/delete-batch",
+                    self.meili_task,
+                ),
+                web.delete(
+                    "/meilisearch/indexes/{index}/documents/{id}", self.meili_task
+                ),
+                web.post("/meilisearch/indexes/{index}/search", self.meili_search),
+                web.post("/reddit/api/v1/access_token", self.oauth_token),
+                web.post("/reddit/api/submit", self.reddit_submit),
+                web.post("/reddit/api/del", self.empty_json),
+                web.get("/reddit/r/{subreddit}/new.json", self.reddit_new),
+                web.get("/reddit/{path:.*}", self.reddit_post_json),
+                web.post("/twitch/oauth2/token", self.oauth_token),
+                web.get("/twitch/helix/users", self.twitch_users),
+                web.get("/twitch/helix/streams", self.twitch_streams),
+                web.post("/twitch/helix/eventsub/subscriptions", self.twitch_subscribe),
+                web.delete("/twitch/helix/eventsub/subscriptions", self.no_content),
+                web.post("/discord/api/webhooks/{id}/{token}", self.discord_webhook),
+            ]
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", self.port).start()
+
+    async def close(self):
+        await self.runner.cleanup()
+
+    @web.middleware
+    async def _account(self, request, handler):
+        service = request.path.split("/", 2)[1]
+        self.calls[f"{service} {request.method}"] += 1
+        latency = LATENCY.get(service, 0) * self.latency_factor
+
+        if latency:
+            # some jitter, real services have a long tail too
+            await asyncio.sleep(random.expovariate(1 / latency))
+
+        return await handler(request)
+
+    async def no_content(self, request):
+        return web.Response(status=204)
+
+    async def discord_webhook(self, request):
+        self.webhook_posts[request.match_info["token"]] += 1
+        return web.Response(status=204)
+
+    async def empty_json(self, request):
+        return web.json_response({})
+
+    async def oauth_token(self, request):
+        return web.json_response({"access_token": "benchmark", "expires_in": 3600})
+
+    async def meili_get_index(self, request):
+        return web.json_response(
+            {
+                "uid": request.match_info["index"],
+                "primaryKey": "id",
+                "createdAt": "2024-01-01T00:00:00.000000Z",
+                "updatedAt": "2024-01-01T00:00:00.000000Z",
+            }
+        )
+
+    async def meili_task(self, request):
+        return web.json_response(
+            {
+                "taskUid": next(_task_ids),
+                "indexUid": request.match_info.get("index"),
+                "status": "enqueued",
+                "type": "documentAdditionOrUpdate",
+                "enqueuedAt": "2024-01-01T00:00:00.000000Z",
+            },
+            status=202,
+        )
+
+    async def meili_search(self, request):
+        js = await request.json()
+        hits = [
+            {
+                "id": random.randint(1, 1000),
+                "_formatted": {"content": f"...<DBS>{js.get('q', '')}<DBE>..."},
+                "_rankingScore": round(random.uniform(0.2, 1), 3),
+            }
+            for _ in range(random.randint(0, 20))
+        ]
+        return web.json_response(
+            {
+                "hits": hits,
+                "query": js.get("q", ""),
+                "processingTimeMs": 3,
+                "limit": 20,
+                "offset": 0,
+                "estimatedTotalHits": len(hits),
+            }
+        )
+
+    async def reddit_submit(self, request):
+        post_id = f"bench{next(self._posts)}"
+        return web.json_response(
+            {
+                "json": {
+                    "errors": [],
+                    "data": {
+                        "id": post_id,
+                        "name": f"t3_{post_id}",
+                        "url": f"https://www.reddit.com/r/benchmark/comments/{post_id}/",
+                    },
+                }
+            }
+        )
+
+    def _reddit_post(self, subreddit: str, post_id: str) -> typing.Dict:
+        return {
+            "kind": "t3",
+            "data": {
+                "id": post_id,
+                "title": f"Benchmark post {post_id}",
+                "author": "benchmark",
+                "permalink": f"/r/{subreddit}/comments/{post_id}/",
+                "subreddit": subreddit,
+                "created_utc": 1700000000.0,
+            },
+        }
+
+    async def reddit_new(self, request):
+        subreddit = request.match_info["subreddit"]
+
+        # mostly posts that were seen before, sometimes a new one
+        posts = [
+            self._reddit_post(subreddit, f"bench_{subreddit}_{i}") for i in range(4)
+        ]
+
+        if random.random() < 0.3:
+            posts.insert(
+                0,
+                self._reddit_post(subreddit, f"bench_{subreddit}_{next(self._posts)}"),
+            )
+
+        return web.json_response({"kind": "Listing", "data": {"children": posts}})
+
+    async def reddit_post_json(self, request):
+        return web.json_response(
+            [
+                {
+                    "kind": "Listing",
+                    "data": {"children": [self._reddit_post("benchmark", "bench0")]},
+                }
+            ]
+        )
+
+    async def twitch_users(self, request):
+        login = request.query.get("login", "benchmark")
+        user_id = request.query.get("id", str(abs(hash(login)) % 10**9))
+        return web.json_response({"data": [{"id": user_id, "login": login}]})
+
+    async def twitch_streams(self, request):
+        return web.json_response(
+            {
+                "data": [
+                    {
+                        "title": "Democraciv MK13 - Turn 42",
+                        "thumbnail_url": "https://static-cdn.jtvnw.net/previews-ttv/live_user_benchmark-{width}x{height}.jpg",
+                        "game_name": "Sid Meier's Civilization VI",
+                    }
+                ]
+            }
+        )
+
+    async def twitch_subscribe(self, request):
+        return web.json_response(
+            {"data": [{"id": f"bench-{next(_task_ids)}", "status": "pending"}]},
+            status=202,
+        )
@@ -0,0 +1,38 @@
+CREATE TABLE IF NOT EXISTS reddit_webhook(
+    id serial PRIMARY KEY,
+    subreddit text NOT NULL,
+    webhook_id bigint NOT NULL,
+    webhook_url text NOT NULL,
+    guild_id bigint NOT NULL,
+    channel_id bigint NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS twitch_webhook(
+    id serial PRIMARY KEY,
+    streamer text NOT NULL,
+    webhook_id bigint NOT NULL,
+    webhook_url text NOT NULL,
+    guild_id bigint NOT NULL,
+    channel_id bigint NOT NULL,
+    everyone_ping bool DEFAULT FALSE NOT NULL,
+    post_to_reddit bool DEFAULT FALSE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS twitch_eventsub_subscription(
+    id serial PRIMARY KEY,
+    twitch_subscription_id text UNIQUE NOT NULL,
+    streamer text NOT NULL,
+    streamer_id text NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reddit_post(
+    id text UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS youtube_upload(
+    id text UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS youtube_stream(
+    id text UNIQUE NOT NULL
+);
@@ -0,0 +1,19 @@
+-- State that used to live in one API process, so that several workers can share it.
+
+-- Twitch retries notifications it isn't sure we received, every worker has to know which ones were handled already
+CREATE TABLE IF NOT EXISTS twitch_notification(
+    id text PRIMARY KEY,
+    received_at timestamp WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc') NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS twitch_notification_received_at_idx ON twitch_notification (received_at);
+
+-- access tokens that one worker refreshed are used by all others, instead of each refreshing its own
+CREATE TABLE IF NOT EXISTS provider_token(
+    provider text PRIMARY KEY,
+    token text NOT NULL,
+    updated_at timestamp WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc') NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS reddit_webhook_subreddit_idx ON reddit_webhook (subreddit);
+CREATE INDEX IF NOT EXISTS twitch_webhook_streamer_idx ON twitch_webhook (streamer);
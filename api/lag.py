@@ -0,0 +1,91 @@
+import asyncio
+import collections
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+import typing
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up from a short sleep and logs the stack of whatever blocks
+    the loop for longer than `slow_callback` seconds. The bot polls `summary()` through `GET /lag` and
+    reports to Discord if the lag is over budget."""
+
+    def __init__(
+        self, *, interval: float = 0.5, slow_callback: float = 0.1, window: int = 600
+    ):
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self._samples: typing.Deque[float] = collections.deque(maxlen=window)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: typing.Optional[int] = None
+        self._task: typing.Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self.stalls = 0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        loop.slow_callback_duration = self.slow_callback
+        self._loop_thread_id = threading.get_ident()
+        threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        ).start()
+        self._task = loop.create_task(self._sample())
+
+    def close(self):
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+
+    def summary(self) -> typing.Dict[str, float]:
+        samples = list(self._samples)
+
+        if len(samples) >= 2:
+            quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+            p50, p99 = quantiles[49], quantiles[98]
+        else:
+            p50 = p99 = samples[0] if samples else 0.0
+
+        return {
+            "samples": len(samples),
+            "p50_ms": round(p50 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round(max(samples, default=0) * 1000, 2),
+            "stalls": self.stalls,
+        }
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def _watch(self):
+        # runs in its own thread, so it keeps running while the loop is blocked
+        reported_heartbeat = None
+
+        while not self._stopped.wait(self.slow_callback / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+
+            if blocked_for < self.slow_callback or heartbeat == reported_heartbeat:
+                continue
+
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+
+            if frame is None:
+                continue
+
+            self.stalls += 1
+            stack = "".join(traceback.format_stack(frame, limit=8))
+            logging.warning(
+                f"Event loop blocked for more than {blocked_for * 1000:.0f}ms in:\n{stack}"
+            )
@@ -0,0 +1,84 @@
+import asyncio
+import time
+import typing
+
+from fastapi.logger import logger
+
+# same as in bot/utils/leader.py, the bot and the API are told apart by the name of their election
+NAMESPACE = 4_912_072
+
+
+class LeaderElection:
+    """Elects one of the API's uvicorn workers (or instances) as the leader that runs the pollers.
+
+    The leader holds a session-level advisory lock on a connection it keeps checked out of the pool. If it
+    dies, Postgres releases the lock with the connection and the first follower to retry, every `interval`
+    seconds, takes over.
+    """
+
+    def __init__(self, db, name: str = "api", *, interval: float = 5.0):
+        self.db = db
+        self.name = name
+        self.interval = interval
+        self.elected_at: typing.Optional[float] = None
+        self._elected = asyncio.Event()
+        self._connection = None
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._elected.is_set()
+
+    async def wait_until_leader(self):
+        await self._elected.wait()
+
+    async def start(self):
+        await self._campaign()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._campaign()
+
+    async def _campaign(self):
+        try:
+            if self._connection is None:
+                self._connection = await self.db.pool.acquire()
+
+            if self.is_leader:
+                await self._connection.fetchval("SELECT 1")
+                return
+
+            if await self._connection.fetchval(
+                "SELECT pg_try_advisory_lock($1, hashtext($2))", NAMESPACE, self.name
+            ):
+                self.elected_at = time.time()
+                self._elected.set()
+                logger.info(f"this worker is now the leader of '{self.name}'")
+        except Exception as e:
+            logger.warning(f"lost connection of leader election '{self.name}': {e!r}")
+            await self._step_down()
+
+    async def _step_down(self):
+        if self.is_leader:
+            logger.warning(f"this worker is no longer the leader of '{self.name}'")
+
+        self._elected.clear()
+        self.elected_at = None
+        connection, self._connection = self._connection, None
+
+        if connection is None:
+            return
+
+        try:
+            # the pool resets the connection on release, which unlocks all advisory locks
+            await self.db.pool.release(connection, timeout=self.interval)
+        except Exception:
+            connection.terminate()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+        await self._step_down()
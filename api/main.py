@@ -1,9 +1,12 @@
 import asyncio
 import json
 import logging
+import os
 import pathlib
 import secrets
 import sys
+import time
+import typing
 import asyncpg
 import pydantic
 import uvicorn
@@ -26,13 +29,18 @@ sys.path.append(str(pathlib.Path(__file__).parent.parent))
 
 from api.provider import RedditManager, TwitchManager, YouTubeManager
 from fastapi import FastAPI, BackgroundTasks, Request, HTTPException, Depends
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi.responses import PlainTextResponse, JSONResponse, HTMLResponse, Response
 from fastapi.logger import logger
 from api.search import meilisearch
+from api.lag import LoopLagMonitor
+from api.leader import LeaderElection
+from api.migrations import MigrationRunner
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from starlette import status
 
-TOKEN_PATH = f"{pathlib.Path(__file__).parent}/token.json"
+TOKEN_PATH = os.environ.get(
+    "DEMOCRACIV_API_TOKEN_PATH", f"{pathlib.Path(__file__).parent}/token.json"
+)
 
 
 class Database:
@@ -50,51 +58,16 @@ class Database:
             self.dsn = token_json["db"]["dsn"]
 
     async def apply_schema(self):
-        schema = """CREATE TABLE IF NOT EXISTS reddit_webhook(
-                    id serial PRIMARY KEY,
-                    subreddit text NOT NULL,
-                    webhook_id bigint NOT NULL,
-                    webhook_url text NOT NULL,
-                    guild_id bigint NOT NULL,
-                    channel_id bigint NOT NULL
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS twitch_webhook(
-                    id serial PRIMARY KEY,
-                    streamer text NOT NULL,
-                    webhook_id bigint NOT NULL,
-                    webhook_url text NOT NULL,
-                    guild_id bigint NOT NULL,
-                    channel_id bigint NOT NULL,
-                    everyone_ping bool DEFAULT FALSE NOT NULL,
-                    post_to_reddit bool DEFAULT FALSE NOT NULL
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS twitch_eventsub_subscription(
-                    id serial PRIMARY KEY,
-                    twitch_subscription_id text UNIQUE NOT NULL,
-                    streamer text NOT NULL,
-                    streamer_id text NOT NULL
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS reddit_post(
-                    id text UNIQUE NOT NULL
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS youtube_upload(
-                    id text UNIQUE NOT NULL
-                    );
-                    
-                    CREATE TABLE IF NOT EXISTS youtube_stream(
-                    id text UNIQUE NOT NULL
-                    );"""
-
-        await self.pool.execute(schema)
+        await MigrationRunner(self.pool).upgrade()
 
     async def make_pool(self, retry=False):
         # todo - why does this throw ConnectionRefusedError on the first try with docker-compose
 
         async with self._lock:
+            # every worker has its own pool, don't open a second one if it was created already
+            if self.pool is not None:
+                return self.pool
+
             try:
                 self.pool = await asyncpg.create_pool(self.dsn)
             except ConnectionRefusedError:
@@ -111,31 +84,40 @@ class Database:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    start = time.perf_counter()
+    app.loop_lag = LoopLagMonitor()
+    app.loop_lag.start()
+
     db = Database()
     app.db = db
+    app.leader = LeaderElection(app.db)
     app.reddit_manager = RedditManager(
-        db=app.db, token_path=TOKEN_PATH, app_ready=app_ready
+        db=app.db, token_path=TOKEN_PATH, app_ready=app_ready, leader=app.leader
     )
     app.twitch_manager = TwitchManager(
         db=app.db,
         token_path=TOKEN_PATH,
         reddit_manager=app.reddit_manager,
         app_ready=app_ready,
+        leader=app.leader,
     )
     app.youtube_manager = YouTubeManager(
         db=app.db,
         token_path=TOKEN_PATH,
         reddit_manager=app.reddit_manager,
         app_ready=app_ready,
+        leader=app.leader,
     )
 
     app.search_client = meilisearch.SearchClient(db=app.db, token_path=TOKEN_PATH)
 
     await app.db.make_pool()
+    await app.leader.start()
 
-    await app.search_client.setup()
+    # the documents are only registered once, not by every worker
+    await app.search_client.setup(register_documents=app.leader.is_leader)
 
-    logger.info("API ready to serve")
+    logger.info(f"API ready to serve after {time.perf_counter() - start:.2f}s")
     app_ready.set()
 
     yield
@@ -143,6 +125,9 @@ async def lifespan(app: FastAPI):
     logger.info("Waiting 1 second for all tasks to finish...")
     await asyncio.wait(asyncio.all_tasks() - {asyncio.current_task()}, timeout=1)
 
+    app.loop_lag.close()
+    await app.leader.close()
+
     await app.youtube_manager.session.close()
     await app.reddit_manager._session.close()
     await app.twitch_manager._session.close()
@@ -151,6 +136,7 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 app.db = None
+app.leader = None
 app.reddit_manager = None
 app.twitch_manager = None
 app.youtube_manager = None
@@ -222,6 +208,11 @@ class Document(pydantic.BaseModel):
     type: str
 
 
+class BulkDocument(pydantic.BaseModel):
+    ids: typing.List[int]
+    type: str
+
+
 class Question(pydantic.BaseModel):
     question: str
     index: str
@@ -234,6 +225,16 @@ async def ok():
     return {"ok": "ok"}
 
 
+@app.get("/lag")
+async def loop_lag(auth: str = Depends(ensure_auth)):
+    # with several workers, this is the lag of whichever worker answered
+    return {
+        **app.loop_lag.summary(),
+        "worker": os.getpid(),
+        "leader": app.leader.is_leader,
+    }
+
+
 @app.get("/reddit/list/{guild_id}")
 async def reddit_list(guild_id: int, auth: str = Depends(ensure_auth)):
     webhooks = await app.reddit_manager.get_webhooks_per_guild(guild_id)
@@ -433,6 +434,18 @@ async def update_bill(document: Document, auth: str = Depends(ensure_auth)):
     return {"ok": "ok"}
 
 
+@app.post("/document/bulk/update")
+async def bulk_update_bill(documents: BulkDocument, auth: str = Depends(ensure_auth)):
+    await app.search_client.add_documents(documents.type, documents.ids)
+    return {"ok": "ok"}
+
+
+@app.post("/document/bulk/delete")
+async def bulk_delete_bill(documents: BulkDocument, auth: str = Depends(ensure_auth)):
+    app.search_client.delete_documents(documents.type, documents.ids)
+    return {"ok": "ok"}
+
+
 @app.post("/document/delete")
 async def delete_bill(document: Document, auth: str = Depends(ensure_auth)):
     app.search_client.delete_document(document.type, document.id)
@@ -445,6 +458,49 @@ async def delete_bill(auth: str = Depends(ensure_auth)):
     return {"ok": "ok"}
 
 
+LEGAL_CODE_FORMATS = {
+    "html": HTMLResponse,
+    "markdown": PlainTextResponse,
+    "json": lambda content: Response(content, media_type="application/json"),
+}
+
+
+@app.get("/legalcode/{fmt}")
+async def legal_code(fmt: str, request: Request):
+    # rendered by the bot into legal_code_snapshot, see bot/utils/legalcode.py
+    if fmt not in LEGAL_CODE_FORMATS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    snapshot = await app.db.pool.fetchrow(
+        "SELECT content, law_hash, generated_at FROM legal_code_snapshot WHERE format = $1",
+        fmt,
+    )
+
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The Legal Code has not been rendered yet",
+        )
+
+    headers = {
+        "ETag": f'"{snapshot["law_hash"]}"',
+        "Last-Modified": snapshot["generated_at"].strftime("%a, %d %b %Y %H:%M:%S GMT"),
+    }
+
+    # clients that already have this version get an empty 304 instead of the whole Legal Code again
+    if_none_match = request.headers.get("If-None-Match")
+
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = LEGAL_CODE_FORMATS[fmt](snapshot["content"])
+    response.headers.update(headers)
+    return response
+
+
 if __name__ == "__main__":
     logger.info("Starting app...")
     uvicorn.run("main:app", host="0.0.0.0", port=8000)
@@ -0,0 +1,119 @@
+import hashlib
+import pathlib
+import re
+import time
+import typing
+
+from fastapi.logger import logger
+
+MIGRATIONS_PATH = pathlib.Path(__file__).parent / "db" / "migrations"
+
+# same as in bot/utils/migrations.py, the bot and the API share one database and both migrate it on startup
+LOCK_ID = 4_912_071
+
+_filename = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    name: str
+    path: pathlib.Path
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+
+def discover(path: pathlib.Path = MIGRATIONS_PATH) -> typing.List[Migration]:
+    migrations = []
+
+    for file in path.iterdir():
+        match = _filename.match(file.name)
+
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), file))
+
+    return sorted(migrations)
+
+
+class MigrationRunner:
+    """Applies the numbered SQL files in `api/db/migrations` that weren't applied yet and records them in
+    `schema_version`, which the API shares with the bot. If the schema is up to date, no DDL is executed.
+    """
+
+    component = "api"
+
+    def __init__(self, pool, *, path: pathlib.Path = MIGRATIONS_PATH):
+        self.pool = pool
+        self.migrations = discover(path)
+
+    async def current_version(self, connection) -> int:
+        if not await connection.fetchval(
+            "SELECT to_regclass('schema_version') IS NOT NULL"
+        ):
+            return 0
+
+        return await connection.fetchval(
+            "SELECT coalesce(max(version), 0) FROM schema_version WHERE component = $1",
+            self.component,
+        )
+
+    async def upgrade(self) -> typing.List[Migration]:
+        start = time.perf_counter()
+        latest = self.migrations[-1].version if self.migrations else 0
+
+        async with self.pool.acquire() as connection:
+            current = await self.current_version(connection)
+
+            if current >= latest:
+                logger.info(
+                    f"database schema is up to date at version {current}, "
+                    f"checked in {(time.perf_counter() - start) * 1000:.1f}ms"
+                )
+                return []
+
+            async with connection.transaction():
+                await connection.execute("SELECT pg_advisory_xact_lock($1)", LOCK_ID)
+                await connection.execute(
+                    "CREATE TABLE IF NOT EXISTS schema_version("
+                    "component text NOT NULL, "
+                    "version int NOT NULL, "
+                    "name text NOT NULL, "
+                    "checksum text NOT NULL, "
+                    "duration_ms real NOT NULL, "
+                    "applied_at timestamp WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc') NOT NULL, "
+                    "PRIMARY KEY (component, version))"
+                )
+
+                applied = {
+                    record["version"]
+                    for record in await connection.fetch(
+                        "SELECT version FROM schema_version WHERE component = $1",
+                        self.component,
+                    )
+                }
+                pending = [m for m in self.migrations if m.version not in applied]
+
+                for migration in pending:
+                    migration_start = time.perf_counter()
+                    await connection.execute(migration.path.read_text())
+                    duration = (time.perf_counter() - migration_start) * 1000
+
+                    await connection.execute(
+                        "INSERT INTO schema_version (component, version, name, checksum, duration_ms) "
+                        "VALUES ($1, $2, $3, $4, $5)",
+                        self.component,
+                        migration.version,
+                        migration.name,
+                        migration.checksum,
+                        duration,
+                    )
+                    logger.info(
+                        f"applied migration {migration.path.name} in {duration:.1f}ms"
+                    )
+
+        logger.info(
+            f"database schema migrated from version {current} to {latest} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return pending
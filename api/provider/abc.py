@@ -3,21 +3,39 @@ import asyncio
 import typing
 import aiohttp
 
+from discord.ext import tasks
 from fastapi.logger import logger
 
+# first key of the advisory locks that keep workers from changing the same target or token at the same time
+LOCK_NAMESPACE = 4_912_073
+
+# seconds, how often the leader picks up webhooks that were added or removed by other workers
+SYNC_INTERVAL = 30
+
 
 class ProviderManager(abc.ABC):
+    """Manages the webhooks of one provider, stored in `table` and shared by all workers of the API.
+
+    Every worker can add and remove webhooks. The first webhook of a target and the last one to be removed
+    trigger `new_webhook_for_target` and `no_more_webhooks_for_target` while holding an advisory lock for
+    that target, so that concurrent requests on different workers agree on which of them was first or last.
+    Only the leader runs pollers for the targets, it keeps `_webhooks` in sync with the table.
+    """
+
     provider: str
     target: str
     table: str
 
-    def __init__(self, *, db, app_ready):
+    def __init__(self, *, db, app_ready, leader):
         self.db = db
         self.app_ready = app_ready
+        self.leader = leader
         self._loop = asyncio.get_event_loop()
         self._loop.create_task(self._make_aiohttp_session())
         self._lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
         self._webhooks: typing.Dict[str, typing.Any] = {}
+        self._synced: typing.Set[typing.Tuple[str, str]] = set()
         self._loop.create_task(self._bulk_start_all())
 
     async def _make_aiohttp_session(self):
@@ -27,21 +45,61 @@ class ProviderManager(abc.ABC):
         await self.db.ready.wait()
         await self.app_ready.wait()
 
-        webhooks = await self.db.pool.fetch(
-            f"SELECT {self.target}, webhook_url FROM {self.table}"
-        )
+        # only the leader polls and (re-)subscribes, the other workers just serve requests
+        await self.leader.wait_until_leader()
+        await self.sync()
 
-        for webhook in webhooks:
-            self._loop.create_task(
-                self._start_webhook(
-                    target=webhook[self.target], webhook_url=webhook["webhook_url"]
-                )
+        # renew what was set up for every target, i.e. Twitch subscriptions, in case it expired in the meantime
+        for target, webhook_url in dict(self._synced).items():
+            await self.new_webhook_for_target(target=target, webhook_url=webhook_url)
+
+        self._sync_task.start()
+        logger.info(f"started {len(self._synced)} {self.provider} hooks")
+
+    @tasks.loop(seconds=SYNC_INTERVAL)
+    async def _sync_task(self):
+        if self.leader.is_leader:
+            await self.sync()
+
+    async def sync(self):
+        """Start and stop this worker's pollers so that they match the webhooks in the database."""
+
+        async with self._sync_lock:
+            records = await self.db.pool.fetch(
+                f"SELECT {self.target}, webhook_url FROM {self.table}"
             )
+            wanted = {
+                (record[self.target], record["webhook_url"]) for record in records
+            }
 
-        logger.info(f"started {len(webhooks)} {self.provider} hooks")
+            for target, webhook_url in wanted - self._synced:
+                await self._start_webhook(target=target, webhook_url=webhook_url)
 
-    async def add_webhook(self, config):
-        await self.db.pool.execute(
+            for target, webhook_url in self._synced - wanted:
+                await self._remove_webhook(target=target, webhook_url=webhook_url)
+
+            self._synced = wanted
+
+    async def _changed(self):
+        # other workers' changes reach the leader with its next sync
+        if self.leader.is_leader:
+            await self.sync()
+
+    async def _lock_target(self, connection, target: str) -> bool:
+        """Lock the target until the end of the transaction and return whether it has any webhooks."""
+
+        await connection.execute(
+            "SELECT pg_advisory_xact_lock($1, hashtext($2))",
+            LOCK_NAMESPACE,
+            f"{self.table}:{target}",
+        )
+        return await connection.fetchval(
+            f"SELECT EXISTS(SELECT 1 FROM {self.table} WHERE {self.target} = $1)",
+            target,
+        )
+
+    async def _insert_webhook(self, connection, config):
+        await connection.execute(
             f"INSERT INTO {self.table} ({self.target}, webhook_id, webhook_url, "
             "guild_id, channel_id)"
             "VALUES ($1, $2, $3, $4, $5)",
@@ -51,9 +109,22 @@ class ProviderManager(abc.ABC):
             config.guild_id,
             config.channel_id,
         )
-        return await self._start_webhook(
-            target=config.target, webhook_url=config.webhook_url
-        )
+
+    async def add_webhook(self, config):
+        result = {"ok": "ok"}
+
+        async with self.db.pool.acquire() as connection:
+            async with connection.transaction():
+                is_first = not await self._lock_target(connection, config.target)
+                await self._insert_webhook(connection, config)
+
+                if is_first:
+                    result = await self.new_webhook_for_target(
+                        target=config.target, webhook_url=config.webhook_url
+                    )
+
+        await self._changed()
+        return result
 
     async def new_webhook_for_target(self, *, target: str, webhook_url: str):
         pass
@@ -63,42 +134,35 @@ class ProviderManager(abc.ABC):
 
     async def _start_webhook(self, *, target: str, webhook_url: str):
         async with self._lock:
-            if target in self._webhooks:
-                self._webhooks[target].add(webhook_url)
-                return self._webhooks[target]
-            else:
-                result = await self.new_webhook_for_target(
-                    target=target, webhook_url=webhook_url
-                )
-                self._webhooks[target] = {webhook_url}
-                return result
+            self._webhooks.setdefault(target, set()).add(webhook_url)
 
     async def _remove_webhook(self, *, target: str, webhook_url: str):
-        if target not in self._webhooks:
-            return
-
         async with self._lock:
-            if (
-                len(self._webhooks[target]) == 1
-                and webhook_url in self._webhooks[target]
-            ):
-                await self.no_more_webhooks_for_target(
-                    target=target, webhook_url=webhook_url
-                )
+            if target not in self._webhooks:
+                return
+
+            self._webhooks[target].discard(webhook_url)
+
+            if not self._webhooks[target]:
                 del self._webhooks[target]
-            else:
-                self._webhooks[target].remove(webhook_url)
 
     async def remove_webhook(self, *, hook_id: int, guild_id: int):
-        record = await self.db.pool.fetchrow(
-            f"DELETE FROM {self.table} WHERE id = $1 AND guild_id = $2 "
-            f"RETURNING {self.target}, webhook_url, channel_id",
-            hook_id,
-            guild_id,
-        )
+        async with self.db.pool.acquire() as connection:
+            async with connection.transaction():
+                record = await connection.fetchrow(
+                    f"DELETE FROM {self.table} WHERE id = $1 AND guild_id = $2 "
+                    f"RETURNING {self.target}, webhook_url, channel_id",
+                    hook_id,
+                    guild_id,
+                )
+
+                if not record:
+                    return {"error": "not found"}
 
-        if not record:
-            return {"error": "not found"}
+                if not await self._lock_target(connection, record[self.target]):
+                    await self.no_more_webhooks_for_target(
+                        target=record[self.target], webhook_url=record["webhook_url"]
+                    )
 
         safe_to_delete = await self._can_discord_webhook_be_deleted(
             record["channel_id"]
@@ -106,13 +170,30 @@ class ProviderManager(abc.ABC):
         js = dict(record)
         js["safe_to_delete"] = safe_to_delete
 
-        self._loop.create_task(
-            self._remove_webhook(
-                target=record[self.target], webhook_url=record["webhook_url"]
-            )
-        )
+        await self._changed()
         return js
 
+    async def remove_deleted_webhook(self, webhook_url: str):
+        """Remove a Discord webhook that was deleted in Discord from every target it was added to."""
+
+        async with self.db.pool.acquire() as connection:
+            async with connection.transaction():
+                records = await connection.fetch(
+                    f"DELETE FROM {self.table} WHERE webhook_url = $1 RETURNING {self.target}",
+                    webhook_url,
+                )
+
+                for target in {record[self.target] for record in records}:
+                    if not await self._lock_target(connection, target):
+                        await self.no_more_webhooks_for_target(
+                            target=target, webhook_url=webhook_url
+                        )
+
+        logger.info(f"removed deleted webhook_url {webhook_url} for {self.provider}")
+
+        # not awaited, this is called from the poller that the sync might stop
+        self._loop.create_task(self._changed())
+
     async def _can_discord_webhook_be_deleted(self, channel_id: int):
         others_exist = await self.db.pool.fetch(
             "SELECT true AS other_exists FROM reddit_webhook FULL "
@@ -142,3 +223,49 @@ class ProviderManager(abc.ABC):
             result.append(js)
 
         return result
+
+    async def get_shared_token(self) -> typing.Optional[str]:
+        await self.db.ready.wait()
+        return await self.db.pool.fetchval(
+            "SELECT token FROM provider_token WHERE provider = $1", self.provider
+        )
+
+    async def refresh_shared_token(
+        self,
+        used: str,
+        request: typing.Callable[[], typing.Awaitable[typing.Optional[str]]],
+    ) -> str:
+        """Refresh the access token of this provider once for all workers.
+
+        `used` is the token that was rejected. If another worker already replaced it, its new token is returned
+        without asking the provider for yet another one, otherwise `request` is called for a new token.
+        """
+
+        async with self.db.pool.acquire() as connection:
+            async with connection.transaction():
+                await connection.execute(
+                    "SELECT pg_advisory_xact_lock($1, hashtext($2))",
+                    LOCK_NAMESPACE,
+                    f"token:{self.provider}",
+                )
+                stored = await connection.fetchval(
+                    "SELECT token FROM provider_token WHERE provider = $1",
+                    self.provider,
+                )
+
+                if stored and stored != used:
+                    return stored
+
+                token = await request()
+
+                if not token:
+                    return used
+
+                await connection.execute(
+                    "INSERT INTO provider_token (provider, token) VALUES ($1, $2) "
+                    "ON CONFLICT (provider) DO UPDATE SET token = $2, "
+                    "updated_at = (now() AT TIME ZONE 'utc')",
+                    self.provider,
+                    token,
+                )
+                return token
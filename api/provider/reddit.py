@@ -24,7 +24,7 @@ class RedditManager(ProviderManager):
         self._webhooks: typing.Dict[str, SubredditScraper] = {}
         self._token_path = token_path
         self._get_token()
-        self._loop.create_task(self.refresh_reddit_bearer_token())
+        self._loop.create_task(self._load_token())
 
     def _get_token(self):
         with open(self._token_path, "r") as token_file:
@@ -34,16 +34,21 @@ class RedditManager(ProviderManager):
             self.REDDIT_REFRESH_TOKEN: str = token_json["reddit"]["refresh_token"]
             self.REDDIT_BEARER_TOKEN: str = token_json["reddit"]["bearer_token"]
 
-    def _save_token(self):
-        with open(self._token_path, "r") as token_file:
-            js = json.load(token_file)
-
-        js["reddit"]["bearer_token"] = self.REDDIT_BEARER_TOKEN
+    async def _load_token(self):
+        # another worker might have refreshed the token already
+        token = await self.get_shared_token()
 
-        with open(self._token_path, "w") as token_file:
-            json.dump(js, token_file)
+        if token:
+            self.REDDIT_BEARER_TOKEN = token
+        else:
+            await self.refresh_reddit_bearer_token()
 
     async def refresh_reddit_bearer_token(self):
+        self.REDDIT_BEARER_TOKEN = await self.refresh_shared_token(
+            self.REDDIT_BEARER_TOKEN, self._request_reddit_bearer_token
+        )
+
+    async def _request_reddit_bearer_token(self) -> typing.Optional[str]:
         """Gets a new access_token for the Reddit API with a refresh token that was previously acquired by following
         this guide: https://github.com/reddit-archive/reddit/wiki/OAuth2"""
 
@@ -66,8 +71,7 @@ class RedditManager(ProviderManager):
         ) as response:
             if response.status == 200:
                 r = await response.json()
-                self.REDDIT_BEARER_TOKEN = r["access_token"]
-                self._save_token()
+                return r["access_token"]
 
     async def post_to_reddit(
         self,
@@ -209,7 +213,7 @@ class RedditManager(ProviderManager):
                 )
                 del self._webhooks[target]
             else:
-                self._webhooks[target].webhook_urls.remove(webhook_url)
+                self._webhooks[target].webhook_urls.discard(webhook_url)
 
 
 class RedditPost:
@@ -290,7 +294,7 @@ class SubredditScraper:
             "embeds": [reddit_post.to_embed()],
         }
 
-        for webhook in self.webhook_urls:
+        for webhook in list(self.webhook_urls):
             async with self._session.post(url=webhook, json=post_data) as response:
                 if response.status not in (200, 204):
                     logger.error(
@@ -299,17 +303,8 @@ class SubredditScraper:
 
                 if response.status == 404:
                     # webhook was deleted
-                    await self.manager._remove_webhook(
-                        target=self.subreddit, webhook_url=webhook
-                    )
                     try:
-                        await self.db.pool.execute(
-                            f"DELETE FROM {self.manager.table} WHERE webhook_url = $1",
-                            webhook,
-                        )
-                        logger.info(
-                            f"removed deleted webhook_url {webhook} for r/{self.subreddit}"
-                        )
+                        await self.manager.remove_deleted_webhook(webhook)
                     except Exception as e:
                         traceback.print_exception(type(e), e, e.__traceback__)
 
@@ -333,6 +328,9 @@ class SubredditScraper:
 
     @tasks.loop(seconds=1200)
     async def reddit_task(self):
+        if not self.manager.leader.is_leader:
+            return
+
         reddit_json = await self.get_newest_reddit_post()
 
         if reddit_json is None:
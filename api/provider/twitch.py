@@ -1,4 +1,3 @@
-import collections
 import datetime
 import hashlib
 import hmac
@@ -46,8 +45,7 @@ class TwitchManager(ProviderManager):
         self._token_path = token_path
         self._get_token()
         self.reddit_manager = reddit_manager
-
-        self.seen_notifications = collections.deque(maxlen=100)
+        self._loop.create_task(self._load_token())
 
     def _get_token(self):
         with open(self._token_path, "r") as token_file:
@@ -64,14 +62,12 @@ class TwitchManager(ProviderManager):
             )
             self.TWITCH_CALLBACK: str = token_json["twitch"]["callback_url"]
 
-    def _save_token(self):
-        with open(self._token_path, "r") as token_file:
-            js = json.load(token_file)
-
-        js["twitch"]["oauth_token"] = self.TWITCH_OAUTH_APP_ACCESS_TOKEN
+    async def _load_token(self):
+        # another worker might have refreshed the token already
+        token = await self.get_shared_token()
 
-        with open(self._token_path, "w") as token_file:
-            json.dump(js, token_file)
+        if token:
+            self.TWITCH_OAUTH_APP_ACCESS_TOKEN = token
 
     @property
     def _headers(self):
@@ -82,6 +78,11 @@ class TwitchManager(ProviderManager):
         }
 
     async def _refresh_twitch_oauth_token(self):
+        self.TWITCH_OAUTH_APP_ACCESS_TOKEN = await self.refresh_shared_token(
+            self.TWITCH_OAUTH_APP_ACCESS_TOKEN, self._request_twitch_oauth_token
+        )
+
+    async def _request_twitch_oauth_token(self) -> typing.Optional[str]:
         """Gets a new app access_token for the Twitch Helix API"""
 
         post_data = {
@@ -95,8 +96,7 @@ class TwitchManager(ProviderManager):
         ) as response:
             if response.status == 200:
                 r = await response.json()
-                self.TWITCH_OAUTH_APP_ACCESS_TOKEN = r["access_token"]
-                self._save_token()
+                return r["access_token"]
 
     async def _get_user_id_from_username(self, username: str):
         response = await self.twitch_request(
@@ -109,8 +109,8 @@ class TwitchManager(ProviderManager):
             except (KeyError, IndexError):
                 return None
 
-    async def add_webhook(self, config):
-        await self.db.pool.execute(
+    async def _insert_webhook(self, connection, config):
+        await connection.execute(
             "INSERT INTO twitch_webhook (streamer, webhook_id, webhook_url, "
             "guild_id, channel_id, everyone_ping, post_to_reddit)"
             "VALUES ($1, $2, $3, $4, $5, $6, $7)",
@@ -122,9 +122,6 @@ class TwitchManager(ProviderManager):
             config.everyone_ping,
             config.post_to_reddit,
         )
-        return await self._start_webhook(
-            target=config.target, webhook_url=config.webhook_url
-        )
 
     async def twitch_request(self, method, url, *, retry=False, **kwargs):
         async with self._session.request(
@@ -134,7 +131,7 @@ class TwitchManager(ProviderManager):
             if resp.status in (401, 403):
                 if not retry:
                     await self._refresh_twitch_oauth_token()
-                    await self.twitch_request(method, url, retry=True, **kwargs)
+                    return await self.twitch_request(method, url, retry=True, **kwargs)
 
             elif resp.status == 200:
                 return await resp.json()
@@ -142,15 +139,8 @@ class TwitchManager(ProviderManager):
             else:
                 return {}
 
-    async def _start_webhook(self, *, target: str, webhook_url: str):
-        async with self._lock:
-            if target in self._webhooks:
-                self._webhooks[target].add(webhook_url)
-                return self._webhooks[target]
-            else:
-                result = await self.subscribe(target)
-                self._webhooks[target] = {webhook_url}
-                return result
+    async def new_webhook_for_target(self, *, target: str, webhook_url: str):
+        return await self.subscribe(target)
 
     async def no_more_webhooks_for_target(self, *, target: str, webhook_url: str):
         return await self.unsubscribe(target)
@@ -210,11 +200,6 @@ class TwitchManager(ProviderManager):
     async def handle_twitch_callback(self, request: Request):
         headers = request.headers
         notification_id = headers["Twitch-Eventsub-Message-Id"]
-
-        if notification_id in self.seen_notifications:
-            return
-
-        self.seen_notifications.append(notification_id)
         timestamp = headers["Twitch-Eventsub-Message-Timestamp"]
 
         try:
@@ -237,6 +222,18 @@ class TwitchManager(ProviderManager):
         if headers["Twitch-Eventsub-Message-Signature"] != expected_signature_header:
             return
 
+        # Twitch retries notifications, possibly to another worker. Notifications older than 10 minutes are
+        # ignored above, so ids only have to be remembered for a while.
+        status = await self.db.pool.execute(
+            "WITH expired AS (DELETE FROM twitch_notification "
+            "WHERE received_at < (now() AT TIME ZONE 'utc') - interval '1 hour') "
+            "INSERT INTO twitch_notification (id) VALUES ($1) ON CONFLICT DO NOTHING",
+            notification_id,
+        )
+
+        if status == "INSERT 0 0":
+            return
+
         js = await request.json()
 
         if "challenge" in js:
@@ -298,16 +295,7 @@ class TwitchManager(ProviderManager):
 
             if response.status == 404:
                 # webhook was deleted
-                await self._remove_webhook(
-                    target=stream.streamer, webhook_url=context.webhook_url
-                )
-                await self.db.pool.execute(
-                    f"DELETE FROM {self.table} WHERE webhook_url = $1",
-                    context.webhook_url,
-                )
-                logger.info(
-                    f"removed deleted webhook_url {context.webhook_url} for {stream.streamer}"
-                )
+                await self.remove_deleted_webhook(context.webhook_url)
 
         if context.post_to_reddit:
             await self.reddit_manager.post_to_reddit(
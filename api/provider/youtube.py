@@ -9,8 +9,9 @@ from fastapi.logger import logger
 
 
 class YouTubeManager:
-    def __init__(self, db, *, token_path, reddit_manager, app_ready):
+    def __init__(self, db, *, token_path, reddit_manager, app_ready, leader):
         self.app_ready = app_ready
+        self.leader = leader
         self.db = db
         self._token_path = token_path
         self.reddit_manager = reddit_manager
@@ -169,6 +170,9 @@ class YouTubeManager:
         await self.db.ready.wait()
         await self.app_ready.wait()
 
+        if not self.leader.is_leader:
+            return
+
         youtube_data = await self.get_newest_upload()
 
         if youtube_data is None:
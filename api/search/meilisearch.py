@@ -23,7 +23,7 @@ class SearchClient:
             ]
             self.OPENAI_KEY: str = token_json["meilisearch"]["openai_key"]
 
-    async def setup(self):
+    async def setup(self, *, register_documents=True):
         await self._make_aiohttp_session()
 
         try:
@@ -37,7 +37,9 @@ class SearchClient:
             self.meilisearch_client.create_index("motion", {"primaryKey": "id"})
 
         await self.enable_vector_store()
-        await self.register_documents()
+
+        if register_documents:
+            await self.register_documents()
 
     async def _make_aiohttp_session(self):
         self._session = aiohttp.ClientSession()
@@ -73,11 +75,8 @@ class SearchClient:
         bills = await self.db.pool.fetch("SELECT id FROM bill")
         motions = await self.db.pool.fetch("SELECT id FROM motion")
 
-        for bill in bills:
-            await self.add_document("bill", bill["id"])
-
-        for motion in motions:
-            await self.add_document("motion", motion["id"])
+        await self.add_documents("bill", [bill["id"] for bill in bills])
+        await self.add_documents("motion", [motion["id"] for motion in motions])
 
     async def add_document(self, document_type, document_id):
 
@@ -109,9 +108,57 @@ class SearchClient:
 
         return self.meilisearch_client.index(document_type).add_documents(as_json)
 
+    async def add_documents(self, document_type, document_ids):
+        # one query and one Meilisearch task for a whole batch of documents
+        if document_type == "bill":
+            docs = await self.db.pool.fetch(
+                "SELECT id, name, content, status FROM bill WHERE id = ANY($1::int[])",
+                document_ids,
+            )
+
+            as_json = [
+                {
+                    "id": doc["id"],
+                    "title": doc["name"],
+                    "content": doc["content"],
+                    "is_law": doc["status"] == 10,
+                }
+                for doc in docs
+            ]
+
+        elif document_type == "motion":
+            docs = await self.db.pool.fetch(
+                "SELECT id, title, description FROM motion WHERE id = ANY($1::int[])",
+                document_ids,
+            )
+            as_json = [
+                {
+                    "id": doc["id"],
+                    "title": doc["title"],
+                    "content": f"{doc['title']}\n\n{doc['description']}",
+                }
+                for doc in docs
+            ]
+
+        else:
+            return "invalid label"
+
+        if not as_json:
+            return
+
+        return self.meilisearch_client.index(document_type).add_documents(as_json)
+
     def delete_document(self, document_type, document_id):
         return self.meilisearch_client.index(document_type).delete_document(document_id)
 
+    def delete_documents(self, document_type, document_ids):
+        if not document_ids:
+            return
+
+        return self.meilisearch_client.index(document_type).delete_documents(
+            document_ids
+        )
+
     def drop_index(self):
         self.meilisearch_client.delete_index("bill")
         self.meilisearch_client.delete_index("motion")
@@ -0,0 +1 @@
+"""Offline benchmark for the bot's event listeners, see `python -m bot.benchmark --help`."""
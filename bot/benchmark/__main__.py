@@ -0,0 +1,115 @@
+"""
+Replays synthetic or recorded Discord events through the bot's message, reaction and join listeners and
+reports how long every listener took. Nothing is sent to Discord, but a real PostgreSQL server is needed.
+
+    python -m bot.benchmark
+    python -m bot.benchmark --scenario tags npcs --events 5000 --concurrency 50 --api-latency 0.05
+    python -m bot.benchmark --replay events.jsonl
+    python -m bot.benchmark --json > baseline.json
+    python -m bot.benchmark --baseline baseline.json --tolerance 0.25
+
+Exits with 1 if `--baseline` is given and any listener's p99 got slower than the baseline by more than
+`--tolerance`.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from bot.benchmark import scenarios
+from bot.benchmark.harness import (
+    Harness,
+    find_regressions,
+    format_report,
+    load_baseline,
+)
+from bot.config import token
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.benchmark", description=__doc__.split("\n\n")[1]
+    )
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=list(scenarios.SCENARIOS),
+        default=list(scenarios.SCENARIOS),
+    )
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="how many events are dispatched at the same time",
+    )
+    parser.add_argument(
+        "--api-latency",
+        type=float,
+        default=0.0,
+        help="seconds every call that would go to Discord takes",
+    )
+    parser.add_argument(
+        "--replay", help="JSON Lines file with recorded events, see scenarios.replay"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--database",
+        default="democraciv_benchmark",
+        help="the benchmark writes to this database, it must not be the bot's own",
+    )
+    return parser.parse_args()
+
+
+async def main(args) -> int:
+    if args.database == token.POSTGRESQL_DATABASE:
+        logging.error(
+            "Refusing to run the benchmark against the bot's own database, use --database."
+        )
+        return 2
+
+    harness = Harness(
+        database=args.database,
+        api_latency=args.api_latency,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+    results = {}
+
+    async with harness.running():
+        if args.replay:
+            results["replay"] = await harness.run(
+                scenarios.replay(harness.world, args.replay)
+            )
+        else:
+            for name in args.scenario:
+                events = scenarios.SCENARIOS[name](
+                    harness.world, args.events, harness.rng
+                )
+                results[name] = await harness.run(events)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results))
+
+    if not args.baseline:
+        return 0
+
+    regressions = find_regressions(
+        results, load_baseline(args.baseline), tolerance=args.tolerance
+    )
+
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,264 @@
+"""
+Minimal stand-ins for the discord.py models that our listeners touch, so that events can be replayed
+without a connection to Discord. They pretend to be the real classes for `isinstance()` checks, and
+everything that would hit the Discord API only waits `api_latency` seconds and records the call.
+"""
+
+import asyncio
+import collections
+import datetime
+import itertools
+import typing
+
+import discord
+
+_snowflakes = itertools.count(900_000_000_000_000_000)
+
+
+def snowflake() -> int:
+    return next(_snowflakes)
+
+
+class FakeAPI:
+    """Counts the calls that would have gone to Discord."""
+
+    def __init__(self, *, latency: float = 0.0):
+        self.latency = latency
+        self.calls: typing.Counter[str] = collections.Counter()
+
+    async def call(self, route: str):
+        self.calls[route] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+    def __str__(self):
+        return self.url
+
+
+class FakeUser:
+    def __init__(self, *, id: int = None, name: str = None, bot: bool = False):
+        self.id = id or snowflake()
+        self.name = name or f"user{self.id % 100_000}"
+        self.display_name = self.name
+        self.global_name = self.name
+        self.discriminator = "0"
+        self.bot = bot
+        self.display_avatar = FakeAsset(
+            f"https://cdn.discordapp.com/embed/avatars/{self.id % 5}.png"
+        )
+
+    @property
+    def __class__(self):
+        return discord.User
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild: "FakeGuild", **kwargs):
+        super().__init__(**kwargs)
+        self.guild = guild
+        self.roles = []
+        self.nick = None
+        self.joined_at = discord.utils.utcnow()
+        self.guild_permissions = discord.Permissions.none()
+
+    @property
+    def __class__(self):
+        return discord.Member
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        *,
+        channel: "FakeChannel",
+        author: FakeUser,
+        content: str,
+        id: int = None,
+        created_at: datetime.datetime = None,
+    ):
+        self.id = id or snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.created_at = created_at or discord.utils.utcnow()
+        self.attachments = []
+        self.embeds = []
+        self.mentions = []
+        self.raw_mentions = []
+        self.role_mentions = []
+        self.type = discord.MessageType.default
+        self.reference = None
+        self._state = channel.guild.state
+
+    @property
+    def __class__(self):
+        return discord.Message
+
+    @property
+    def clean_content(self) -> str:
+        return self.content
+
+    @property
+    def jump_url(self) -> str:
+        return (
+            f"https://discord.com/channels/{self.guild.id}/{self.channel.id}/{self.id}"
+        )
+
+    async def delete(self, *, delay=None):
+        await self.guild.api.call("DELETE message")
+        self.channel.messages.pop(self.id, None)
+
+    async def edit(self, **kwargs):
+        await self.guild.api.call("PATCH message")
+        self.content = kwargs.get("content", self.content)
+        return self
+
+    async def add_reaction(self, emoji):
+        await self.guild.api.call("PUT reaction")
+
+
+class FakeChannel:
+    def __init__(
+        self,
+        guild: "FakeGuild",
+        *,
+        id: int = None,
+        name: str = None,
+        category_id: int = None,
+    ):
+        self.id = id or snowflake()
+        self.guild = guild
+        self.name = name or f"channel{self.id % 100_000}"
+        self.category_id = category_id
+        self.category = None
+        self.parent = None
+        self.messages: typing.Dict[int, FakeMessage] = {}
+
+    @property
+    def __class__(self):
+        return discord.TextChannel
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    def add_message(self, **kwargs) -> FakeMessage:
+        message = FakeMessage(channel=self, **kwargs)
+        self.messages[message.id] = message
+        return message
+
+    async def send(self, content=None, *, embed=None, delete_after=None, **kwargs):
+        await self.guild.api.call("POST message")
+        return self.add_message(
+            author=self.guild.me, content=str(content) if content else ""
+        )
+
+    async def fetch_message(self, id: int) -> FakeMessage:
+        await self.guild.api.call("GET message")
+
+        try:
+            return self.messages[id]
+        except KeyError:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+
+    def typing(self):
+        return _NullContext()
+
+
+class FakeGuild:
+    def __init__(
+        self, *, state, api: FakeAPI, me: FakeUser, id: int = None, name="Benchmark"
+    ):
+        self.id = id or snowflake()
+        self.name = name
+        self.state = state
+        self.api = api
+        self.icon = None
+        self.roles = []
+        self.channels: typing.Dict[int, FakeChannel] = {}
+        self.members: typing.Dict[int, FakeMember] = {}
+        self.me = FakeMember(self, id=me.id, name=me.name, bot=True)
+
+    @property
+    def __class__(self):
+        return discord.Guild
+
+    def add_channel(self, **kwargs) -> FakeChannel:
+        channel = FakeChannel(self, **kwargs)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_member(self, **kwargs) -> FakeMember:
+        member = FakeMember(self, **kwargs)
+        self.members[member.id] = member
+        return member
+
+    def get_channel(self, id: int) -> typing.Optional[FakeChannel]:
+        return self.channels.get(id)
+
+    get_channel_or_thread = get_channel
+
+    def get_member(self, id: int) -> typing.Optional[FakeMember]:
+        return self.members.get(id)
+
+    def get_role(self, id: int):
+        return None
+
+
+class FakeReactionEvent:
+    """Stands in for discord.RawReactionActionEvent."""
+
+    def __init__(
+        self,
+        *,
+        message: FakeMessage,
+        member: FakeMember,
+        emoji: str,
+        event_type: str = "REACTION_ADD",
+    ):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.guild_id = message.guild.id
+        self.user_id = member.id
+        self.member = member
+        self.emoji = discord.PartialEmoji(name=emoji)
+        self.event_type = event_type
+        self.burst = False
+
+    @property
+    def __class__(self):
+        return discord.RawReactionActionEvent
+
+
+class _FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+
+class _NullContext:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
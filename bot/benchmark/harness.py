@@ -0,0 +1,376 @@
+import asyncio
+import collections
+import contextlib
+import json
+import logging
+import random
+import statistics
+import time
+import typing
+
+import discord
+
+from bot.benchmark.fakes import FakeAPI, FakeGuild, FakeUser, snowflake
+from bot.config import config
+from bot.main import DemocracivBot
+
+EXTENSIONS = (
+    "bot.module.logs",
+    "bot.module.npcs",
+    "bot.module.tags",
+    "bot.module.starboard",
+)
+
+
+class BenchmarkBot(DemocracivBot):
+    """The real bot with the real cogs, but never connected to Discord. The guilds it sees are fakes
+    that live in `World`."""
+
+    def __init__(self, *, api: FakeAPI):
+        super().__init__()
+        self.api = api
+        self._connection.user = FakeUser(name="Democraciv Bot", bot=True)
+        self._fake_guilds: typing.Dict[int, FakeGuild] = {}
+
+    @property
+    def guilds(self):
+        return list(self._fake_guilds.values())
+
+    def get_guild(self, id, /):
+        return self._fake_guilds.get(id)
+
+    def get_channel(self, id, /):
+        for guild in self._fake_guilds.values():
+            channel = guild.get_channel(id)
+
+            if channel:
+                return channel
+
+    def get_user(self, id, /):
+        for guild in self._fake_guilds.values():
+            member = guild.get_member(id)
+
+            if member:
+                return member
+
+
+class World:
+    """The fake Democraciv server with its channels, members, tags and NPCs."""
+
+    def __init__(
+        self,
+        bot: BenchmarkBot,
+        *,
+        members: int = 200,
+        channels: int = 20,
+        tags: int = 200,
+        npcs: int = 20,
+    ):
+        self.bot = bot
+        self.guild = FakeGuild(
+            state=bot._connection,
+            api=bot.api,
+            me=bot.user,
+            id=config.DEMOCRACIV_GUILD_ID,
+            name="Democraciv",
+        )
+        bot._fake_guilds[self.guild.id] = self.guild
+        bot.democraciv_guild_id = self.guild.id
+
+        self.log_channel = self.guild.add_channel(name="logs")
+        self.guild.add_channel(id=config.STARBOARD_CHANNEL, name="starboard")
+        self.channels = [self.guild.add_channel() for _ in range(channels)]
+        self.members = [self.guild.add_member() for _ in range(members)]
+        self.tags = [f"benchtag{i}" for i in range(tags)]
+        self.npcs: typing.List[typing.Tuple[FakeUser, str]] = [
+            (self.members[i % len(self.members)], f"npc{i}: text") for i in range(npcs)
+        ]
+
+        # channel id -> webhook id
+        self.webhooks = {channel.id: snowflake() for channel in self.channels}
+
+    def member(self, id: int):
+        return self.guild.get_member(id) or self.guild.add_member(id=id)
+
+    def channel(self, id: int):
+        return self.guild.get_channel(id) or self.guild.add_channel(id=id)
+
+    async def seed(self):
+        db = self.bot.db
+
+        await self.cleanup()
+        await self.bot.update_guild_config_cache()
+        await db.execute(
+            "UPDATE guild SET logging_enabled = true, logging_channel = $2, npc_usage_allowed = true "
+            "WHERE id = $1",
+            self.guild.id,
+            self.log_channel.id,
+        )
+        await self.bot.update_guild_config_cache()
+
+        for name in self.tags:
+            tag_id = await db.fetchval(
+                "INSERT INTO tag (guild_id, name, title, content, global, author) "
+                "VALUES ($1, $2, $3, $4, false, $5) RETURNING id",
+                self.guild.id,
+                name,
+                f"The {name} Tag",
+                f"This is the content of {name}.",
+                self.members[0].id,
+            )
+            await db.execute(
+                "INSERT INTO tag_lookup (tag_id, alias) VALUES ($1, $2)", tag_id, name
+            )
+
+        for i, (owner, trigger) in enumerate(self.npcs):
+            await db.execute(
+                "INSERT INTO npc (name, avatar_url, owner_id, trigger_phrase) VALUES ($1, $2, $3, $4)",
+                f"Benchmark NPC {i}",
+                owner.display_avatar.url,
+                owner.id,
+                trigger,
+            )
+
+        await db.executemany(
+            "INSERT INTO npc_webhook (guild_id, channel_id, webhook_id, webhook_token) "
+            "VALUES ($1, $2, $3, 'benchmark') ON CONFLICT DO NOTHING",
+            [
+                (self.guild.id, channel_id, webhook_id)
+                for channel_id, webhook_id in self.webhooks.items()
+            ],
+        )
+
+    async def cleanup(self):
+        db = self.bot.db
+        member_ids = [member.id for member in self.members]
+
+        await db.execute("DELETE FROM tag WHERE guild_id = $1", self.guild.id)
+        await db.execute(
+            "DELETE FROM npc WHERE owner_id = ANY($1::bigint[])", member_ids
+        )
+        await db.execute("DELETE FROM npc_webhook WHERE guild_id = $1", self.guild.id)
+        await db.execute(
+            "DELETE FROM starboard_entry WHERE guild_id = $1", self.guild.id
+        )
+
+
+class ListenerStats:
+    def __init__(self):
+        self.durations: typing.List[float] = []
+        self.errors = 0
+
+    @staticmethod
+    def _percentile(samples, percentile: int) -> float:
+        if len(samples) < 2:
+            return samples[0] if samples else 0.0
+
+        return statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+    def to_dict(self) -> typing.Dict[str, float]:
+        return {
+            "calls": len(self.durations),
+            "errors": self.errors,
+            "total_ms": round(sum(self.durations) * 1000, 3),
+            "p50_ms": round(self._percentile(self.durations, 50) * 1000, 3),
+            "p99_ms": round(self._percentile(self.durations, 99) * 1000, 3),
+            "max_ms": round(max(self.durations, default=0) * 1000, 3),
+        }
+
+
+class Harness:
+    def __init__(
+        self,
+        *,
+        database: str,
+        api_latency: float = 0.0,
+        concurrency: int = 1,
+        seed: int = 0,
+    ):
+        self.database = database
+        self.concurrency = concurrency
+        self.rng = random.Random(seed)
+        self.api = FakeAPI(latency=api_latency)
+        self.bot: typing.Optional[BenchmarkBot] = None
+        self.world: typing.Optional[World] = None
+
+    @contextlib.asynccontextmanager
+    async def running(self, **world_options):
+        self.bot = bot = BenchmarkBot(api=self.api)
+
+        async with bot:
+            bot._ready.set()
+            await bot.initialize_aiohttp_session()
+
+            async def connect():
+                await bot.connect_to_db(database=self.database)
+
+            # the cogs' cache loaders wait for this phase
+            bot.startup.add("database", connect)
+            bot.startup.start()
+            await bot.startup.wait("database")
+
+            if bot.startup.phases["database"].failed:
+                raise RuntimeError("Could not connect to the benchmark database.")
+
+            self.world = World(bot, **world_options)
+            await self.world.seed()
+
+            for extension in EXTENSIONS:
+                await bot.load_extension(extension)
+
+            npc_cog = bot.get_cog("NPC")
+            await npc_cog._load_webhook_cache()
+            await npc_cog._load_npc_cache()
+
+            with self._patched_webhooks():
+                try:
+                    yield self
+                finally:
+                    await self.world.cleanup()
+
+    @contextlib.contextmanager
+    def _patched_webhooks(self):
+        # NPC messages are sent through webhooks, which talk to Discord on their own
+        original = discord.Webhook.send
+        api = self.api
+        world = self.world
+        channels = {
+            webhook_id: world.guild.get_channel(channel_id)
+            for channel_id, webhook_id in world.webhooks.items()
+        }
+
+        async def send(webhook, content=None, **kwargs):
+            await api.call("POST webhook")
+            return channels[webhook.id].add_message(
+                author=world.guild.me, content=content or ""
+            )
+
+        discord.Webhook.send = send
+
+        try:
+            yield
+        finally:
+            discord.Webhook.send = original
+
+    def _listeners(
+        self,
+    ) -> typing.Dict[str, typing.List[typing.Tuple[str, typing.Callable]]]:
+        listeners = collections.defaultdict(list)
+
+        for cog in self.bot.cogs.values():
+            for event, listener in cog.get_listeners():
+                listeners[event].append(
+                    (f"{cog.qualified_name}.{listener.__name__}", listener)
+                )
+
+        return listeners
+
+    def _query_count(self) -> int:
+        return sum(
+            histogram.count
+            for name, histogram in self.bot.metrics.histograms.items()
+            if name.startswith("db:")
+        )
+
+    async def run(self, events: typing.Iterable) -> typing.Dict[str, typing.Any]:
+        listeners = self._listeners()
+        stats: typing.DefaultDict[str, ListenerStats] = collections.defaultdict(
+            ListenerStats
+        )
+
+        async def call(name, listener, args):
+            start = time.perf_counter()
+
+            try:
+                await listener(*args)
+            except Exception as e:
+                stats[name].errors += 1
+                logging.debug(f"{name} raised {e!r}")
+            finally:
+                stats[name].durations.append(time.perf_counter() - start)
+
+        async def dispatch(event, args):
+            # discord.py schedules every listener of an event as its own task, too
+            await asyncio.gather(
+                *[call(name, listener, args) for name, listener in listeners[event]]
+            )
+
+        api_calls = sum(self.api.calls.values())
+        queries = self._query_count()
+        tasks = set()
+        amount = 0
+        start = time.perf_counter()
+
+        for event, args in events:
+            amount += 1
+            task = asyncio.create_task(dispatch(event, args))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+            if len(tasks) >= self.concurrency:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+        elapsed = time.perf_counter() - start
+
+        # let the background tasks the listeners started (tag uses, NPC logs) finish before the next run
+        await asyncio.sleep(0.1)
+
+        return {
+            "events": amount,
+            "seconds": round(elapsed, 3),
+            "events_per_second": round(amount / elapsed, 1) if elapsed else 0,
+            "queries": self._query_count() - queries,
+            "api_calls": sum(self.api.calls.values()) - api_calls,
+            "listeners": {name: s.to_dict() for name, s in sorted(stats.items())},
+        }
+
+
+def format_report(results: typing.Dict[str, typing.Dict[str, typing.Any]]) -> str:
+    lines = []
+
+    for scenario, result in results.items():
+        lines.append(
+            f"\n{scenario}: {result['events']} events in {result['seconds']}s "
+            f"({result['events_per_second']}/s), {result['queries']} queries, "
+            f"{result['api_calls']} Discord API calls"
+        )
+        lines.append(
+            f"  {'listener':<36} {'calls':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+        )
+
+        for name, stats in result["listeners"].items():
+            lines.append(
+                f"  {name:<36} {stats['calls']:>7} {stats['errors']:>7} "
+                f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}"
+            )
+
+    return "\n".join(lines)
+
+
+def find_regressions(results, baseline, *, tolerance: float) -> typing.List[str]:
+    """Listeners whose p99 got slower than the baseline by more than `tolerance` (0.25 = 25%)."""
+
+    regressions = []
+
+    for scenario, result in results.items():
+        for name, stats in result["listeners"].items():
+            try:
+                before = baseline[scenario]["listeners"][name]["p99_ms"]
+            except KeyError:
+                continue
+
+            # ignore noise on listeners that return almost immediately
+            if stats["p99_ms"] > max(before, 0.05) * (1 + tolerance):
+                regressions.append(
+                    f"{scenario} / {name}: p99 {before}ms -> {stats['p99_ms']}ms"
+                )
+
+    return regressions
+
+
+def load_baseline(path: str) -> typing.Dict[str, typing.Any]:
+    with open(path) as file:
+        return json.load(file)
@@ -0,0 +1,141 @@
+"""
+Event streams for the benchmark. Every scenario is a generator of `(event, args)` tuples, where `event` is the
+name of the listener's event (i.e. `on_message`) and `args` are the arguments the listener is called with.
+"""
+
+import json
+import random
+import typing
+
+from bot.benchmark.fakes import FakeReactionEvent
+from bot.config import config
+
+Event = typing.Tuple[str, tuple]
+
+WORDS = (
+    "the senate should vote on this bill before the session closes and the "
+    "ministry has to sign it into law unless the supreme court strikes it down "
+    "great speech party election campaign civ turn city district wonder trade"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, words)))
+
+
+def message_flood(world, count: int, rng: random.Random) -> typing.Iterator[Event]:
+    """Ordinary chatter that every on_message listener has to look at and then ignore."""
+
+    for _ in range(count):
+        message = rng.choice(world.channels).add_message(
+            author=rng.choice(world.members), content=_sentence(rng, 30)
+        )
+        yield "on_message", (message,)
+
+
+def tag_spam(world, count: int, rng: random.Random) -> typing.Iterator[Event]:
+    """Tag invocations, one in five of them for tags that don't exist."""
+
+    for _ in range(count):
+        if rng.random() < 0.8:
+            name = rng.choice(world.tags)
+        else:
+            name = f"missing{rng.randint(0, 10_000)}"
+
+        message = rng.choice(world.channels).add_message(
+            author=rng.choice(world.members), content=f"{config.BOT_PREFIX}{name}"
+        )
+        yield "on_message", (message,)
+
+
+def npc_session(world, count: int, rng: random.Random) -> typing.Iterator[Event]:
+    """Role-play with NPCs, a few people writing many messages in the same channels."""
+
+    channels = world.channels[:3]
+
+    for _ in range(count):
+        owner, trigger = rng.choice(world.npcs)
+        content = trigger.replace("text", _sentence(rng))
+        message = rng.choice(channels).add_message(author=owner, content=content)
+        yield "on_message", (message,)
+
+
+def star_burst(world, count: int, rng: random.Random) -> typing.Iterator[Event]:
+    """Many people starring the same few messages, enough to get every one of them onto the Starboard."""
+
+    per_message = config.STARBOARD_MIN_STARS + 5
+    messages = [
+        rng.choice(world.channels).add_message(
+            author=rng.choice(world.members), content=_sentence(rng)
+        )
+        for _ in range(max(1, count // per_message))
+    ]
+
+    for i in range(count):
+        message = messages[i % len(messages)]
+        starrer = world.members[(i // len(messages)) % len(world.members)]
+
+        if starrer == message.author:
+            starrer = world.members[-1]
+
+        yield "on_raw_reaction_add", (
+            FakeReactionEvent(
+                message=message, member=starrer, emoji=config.STARBOARD_STAR_EMOJI
+            ),
+        )
+
+
+def join_wave(world, count: int, rng: random.Random) -> typing.Iterator[Event]:
+    """A raid or an announcement, lots of people joining at once."""
+
+    for _ in range(count):
+        yield "on_member_join", (world.guild.add_member(),)
+
+
+def replay(world, path: str) -> typing.Iterator[Event]:
+    """Replay a recorded event stream, a JSON Lines file with one event per line:
+
+    {"event": "message", "id": 1, "author": 2, "channel": 3, "content": "-tag"}
+    {"event": "reaction_add", "message": 1, "user": 4, "emoji": "⭐"}
+    {"event": "member_join", "user": 5}
+    """
+
+    messages = {}
+
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            kind = record["event"]
+
+            if kind == "message":
+                message = world.channel(record["channel"]).add_message(
+                    id=record.get("id"),
+                    author=world.member(record["author"]),
+                    content=record["content"],
+                )
+                messages[message.id] = message
+                yield "on_message", (message,)
+
+            elif kind == "reaction_add":
+                yield "on_raw_reaction_add", (
+                    FakeReactionEvent(
+                        message=messages[record["message"]],
+                        member=world.member(record["user"]),
+                        emoji=record.get("emoji", config.STARBOARD_STAR_EMOJI),
+                    ),
+                )
+
+            elif kind == "member_join":
+                yield "on_member_join", (world.member(record["user"]),)
+
+
+SCENARIOS = {
+    "messages": message_flood,
+    "tags": tag_spam,
+    "npcs": npc_session,
+    "stars": star_burst,
+    "joins": join_wave,
+}
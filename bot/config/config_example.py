@@ -59,6 +59,24 @@ HELP_NUMBERS = "<:numbers:843614662762561556>"
 DATABASE_DAILY_BACKUP_ENABLED = True
 DATABASE_DAILY_BACKUP_DISCORD_CHANNEL = 738903909535318086
 DATABASE_DAILY_BACKUP_INTERVAL = 72  # hours
+DATABASE_BACKUP_KEEP = 10  # newest backups per database that are kept in bot/db/backup/
+DATABASE_BACKUP_COMPRESSION = 6  # pg_dump's zlib level, 0-9
+
+# Metrics (command, listener, database & HTTP latencies), served as JSON on http://127.0.0.1:<port>/metrics
+METRICS_SERVER_ENABLED = True
+METRICS_SERVER_PORT = 8081
+
+# Event Loop Lag Monitor, posts to BOT_TECHNICAL_NOTIFICATIONS_CHANNEL if the p99 lag is over budget
+LOOP_LAG_BUDGET_MS = 250
+LOOP_LAG_SLOW_CALLBACK_MS = (
+    100  # capture the stack of anything that blocks the loop for longer
+)
+LOOP_LAG_ASYNCIO_DEBUG = False  # additionally enable asyncio's debug mode (expensive)
+
+# Query Profiler, logs statements that are executed this often within one command, listener or task
+# Can be toggled at runtime with -jsk profiler
+QUERY_PROFILER_ENABLED = False
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = 10
 
 # Google Cloud Platform
 GOOGLE_CLOUD_PLATFORM_CLIENT_SECRETS_FILE = (
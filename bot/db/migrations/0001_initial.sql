@@ -1,3 +1,6 @@
+-- The schema as of 2.x. Everything is IF NOT EXISTS, so databases that were created before migrations existed
+-- are adopted as version 1 without changes. New migrations go into their own, higher numbered file.
+
 CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 CREATE TABLE IF NOT EXISTS guild(
@@ -161,6 +164,34 @@ CREATE TABLE IF NOT EXISTS motion_sponsor(
     UNIQUE (motion_id, sponsor)
 );
 
+CREATE TABLE IF NOT EXISTS bill_keyword_cache(
+    content_hash text PRIMARY KEY,
+    keywords text[] NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS legal_code_snapshot(
+    format text PRIMARY KEY,
+    content text NOT NULL,
+    law_hash text NOT NULL,
+    generated_at timestamp WITHOUT TIME ZONE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS announcement_queue(
+    id serial PRIMARY KEY,
+    kind text NOT NULL,
+    object_id integer NOT NULL,
+    added_at timestamp WITHOUT TIME ZONE NOT NULL,
+    flags text[] DEFAULT '{}' NOT NULL,
+    flush_key text,
+    UNIQUE (kind, object_id)
+);
+
+CREATE TABLE IF NOT EXISTS announcement_flush_step(
+    flush_key text NOT NULL,
+    step text NOT NULL,
+    PRIMARY KEY (flush_key, step)
+);
+
 CREATE INDEX IF NOT EXISTS bill_lookup_tag_tag_trgm_idx ON bill_lookup_tag USING gin (tag gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS bill_name_lower_idx ON bill (LOWER(name));
 CREATE INDEX IF NOT EXISTS bill_session_leg_session_idx ON bill_session (leg_session);
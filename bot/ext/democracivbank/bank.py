@@ -1,8 +1,12 @@
+import asyncio
 import collections
 import datetime
 import logging
 import sys
 import textwrap
+import time
+import traceback
+import typing
 import uuid
 import decimal
 import aiohttp
@@ -43,15 +47,54 @@ class BankError(exceptions.DemocracivBotException):
     pass
 
 
+@dataclass
+class DMJob:
+    id: str
+    total: int
+    status: str = "queued"
+    delivered: int = 0
+    failed: int = 0
+    not_found: int = 0
+
+    def to_dict(self):
+        return {
+            "job": self.id,
+            "status": self.status,
+            "total": self.total,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "not_found": self.not_found,
+        }
+
+
 class BankListener:
+    """Receives DM notifications from the bank server. Requests are queued as jobs and answered with
+    `202 Accepted` right away, the DMs are then delivered in the background with bounded concurrency.
+
+    Requests carrying an idempotency key (`Idempotency-Key` header or `idempotency_key` field) that was
+    seen before return the existing job instead of sending the DMs again, so retries don't cause duplicates.
+    """
+
+    MAX_CONCURRENT_DMS = 5
+    MAX_REMEMBERED_JOBS = 500
+
     def __init__(self, bot):
         self.bot = bot
         self.app = web.Application()
-        self.app.add_routes([web.post("/dm", self.send_dm)])
+        self.app.add_routes(
+            [web.post("/dm", self.send_dm), web.get("/dm/{job_id}", self.dm_status)]
+        )
         self.runner = web.AppRunner(self.app)
+        self._jobs: typing.OrderedDict[str, DMJob] = collections.OrderedDict()
+        self._idempotency_keys: typing.Dict[str, str] = {}
+        self._tasks: typing.Set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DMS)
         self.bot.loop.create_task(self.setup())
 
     async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+
         await self.runner.cleanup()
 
     async def setup(self):
@@ -59,24 +102,74 @@ class BankListener:
         site = web.TCPSite(self.runner, "0.0.0.0", 8080)
         await site.start()
 
+    def _remember(self, job: DMJob, idempotency_key: typing.Optional[str]):
+        self._jobs[job.id] = job
+
+        if idempotency_key:
+            self._idempotency_keys[idempotency_key] = job.id
+
+        while len(self._jobs) > self.MAX_REMEMBERED_JOBS:
+            old_id, _ = self._jobs.popitem(last=False)
+            self._idempotency_keys = {
+                k: v for k, v in self._idempotency_keys.items() if v != old_id
+            }
+
     async def send_dm(self, request):
         json = await request.json()
+        idempotency_key = request.headers.get("Idempotency-Key") or json.get(
+            "idempotency_key"
+        )
+
+        if idempotency_key in self._idempotency_keys:
+            job = self._jobs[self._idempotency_keys[idempotency_key]]
+            return web.json_response(job.to_dict(), status=202)
+
+        msg = json["message"] if json["message"] else None
+        embed = discord.Embed.from_dict(json["embed"]) if json["embed"] else None
+        targets = list(dict.fromkeys(json["targets"]))
+
+        job = DMJob(id=uuid.uuid4().hex, total=len(targets))
+        self._remember(job, idempotency_key)
+
+        task = self.bot.loop.create_task(self._run_job(job, targets, msg, embed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return web.json_response(job.to_dict(), status=202)
+
+    async def dm_status(self, request):
+        try:
+            job = self._jobs[request.match_info["job_id"]]
+        except KeyError:
+            return web.json_response({"error": "unknown job"}, status=404)
 
-        for target in json["targets"]:
-            user = self.bot.get_user(target)
+        return web.json_response(job.to_dict())
 
-            if user is None:
-                continue
+    async def _deliver(self, job: DMJob, target: int, msg, embed):
+        user = self.bot.get_user(target)
 
-            msg = json["message"] if json["message"] else None
-            embed = discord.Embed.from_dict(json["embed"]) if json["embed"] else None
+        if user is None:
+            job.not_found += 1
+            return
 
+        async with self._semaphore:
             try:
                 await user.send(content=msg, embed=embed)
-            except discord.Forbidden:
-                continue
+                job.delivered += 1
+            except discord.HTTPException:
+                job.failed += 1
+
+    async def _run_job(self, job: DMJob, targets, msg, embed):
+        job.status = "running"
+        await asyncio.gather(
+            *[self._deliver(job, target, msg, embed) for target in targets]
+        )
+        job.status = "done"
 
-        return web.json_response({"ok": "ok"})
+        logging.info(
+            f"Bank DM job {job.id}: {job.delivered}/{job.total} delivered, "
+            f"{job.failed} failed, {job.not_found} not found."
+        )
 
 
 class BankRoute:
@@ -97,6 +190,84 @@ class BankRoute:
         }
 
 
+class BankResponse:
+    """A fully read response of the bank API. The body is read before the connection goes back to the pool,
+    `json()` stays a coroutine so that callers don't care."""
+
+    def __init__(self, status: int, data):
+        self.status = status
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+class BankClient:
+    """Talks to the bank API over its own connection pool, with a timeout for every request so that a slow
+    bank server doesn't hang commands forever. If the bank can't be reached in time, BankError is raised.
+    """
+
+    def __init__(self, *, timeout: float = 15, connection_limit: int = 10):
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._connection_limit = connection_limit
+        self._session: typing.Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._connection_limit),
+                timeout=self._timeout,
+            )
+
+        return self._session
+
+    async def request(
+        self, route: "BankRoute", *, data=None, params=None
+    ) -> BankResponse:
+        try:
+            async with self.session.request(
+                route.method, route.url, headers=route.headers, data=data, params=params
+            ) as response:
+                try:
+                    js = await response.json(content_type=None)
+                except ValueError:
+                    js = None
+
+                return BankResponse(response.status, js)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            logging.warning(f"cannot connect to {route.url}")
+            raise BankError(f"{config.NO} The bank is not reachable right now.")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: typing.Dict[typing.Hashable, typing.Tuple[float, typing.Any]] = {}
+
+    def get(self, key):
+        stored_at, value = self._data[key]
+
+        if time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            raise KeyError(key)
+
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+
 class BankUUIDConverter(commands.Converter):
     async def convert(self, ctx, argument):
         try:
@@ -126,9 +297,7 @@ class BankCorporationMarketplace(commands.Converter):
 
     @classmethod
     async def convert(cls, ctx, argument, *, allow_private=False):
-        response = await ctx.bot.get_cog("Bank").request(
-            BankRoute("GET", f"corporation/{argument}/")
-        )
+        response = await ctx.bot.get_cog("Bank").get_corporation(argument)
 
         if response.status == 404:
             raise commands.BadArgument(
@@ -272,6 +441,7 @@ class Bank(context.CustomCog):
     """Open as many bank accounts as you want and send money in multiple currencies with https://democracivbank.com"""
 
     BANANA_INC_IBAN = "de2f6399-ea16-4687-b5bf-a3840271ebf8"
+    CURRENCIES_TTL = 3600
 
     def __init__(self, bot):
         super().__init__(bot)
@@ -282,18 +452,34 @@ class Bank(context.CustomCog):
         if not bot.IS_DEBUG:
             self.bank_db_backup.start()
 
+        self.client = BankClient()
+        self._corporations = TTLCache(ttl=300)
+        self._iban_currencies = TTLCache(ttl=3600)
+        self._default_accounts = TTLCache(ttl=300)
+
         self._currencies = {}
+        self._currencies_fetched_at = 0
         self.bot.loop.create_task(self._fetch_currencies())
 
     def cog_unload(self):
         self.bot.loop.create_task(self.bank_listener.shutdown())
+        self.bot.loop.create_task(self.client.close())
 
         if not self.bot.IS_DEBUG:
             self.bank_db_backup.cancel()
 
     @tasks.loop(hours=config.DATABASE_DAILY_BACKUP_INTERVAL)
     async def bank_db_backup(self):
-        await self.bot.do_db_backup("live_bank")
+        await self.bot.wait_until_ready()
+
+        if not self.bot.leader.is_leader:
+            return
+
+        try:
+            await self.bot.do_db_backup("live_bank")
+        except Exception:
+            logging.error("Unexpected error during bank database backup")
+            traceback.print_exc()
 
     async def is_connected_with_bank_user(self, ctx):
         response = await self.request(
@@ -307,31 +493,50 @@ class Bank(context.CustomCog):
                 f"https://democracivbank.com/me/discord"
             )
 
-    async def request(self, route: BankRoute, **kwargs):
-        try:
-            response = await self.bot.session.request(
-                route.method,
-                route.url,
-                headers=route.headers,
-                data=kwargs.get("data", None),
-                params=kwargs.get("params", None),
+    async def request(self, route: BankRoute, **kwargs) -> BankResponse:
+        response = await self.client.request(
+            route, data=kwargs.get("data", None), params=kwargs.get("params", None)
+        )
+
+        if response.status >= 500:
+            raise BankError(
+                f"{config.NO} {self.bot.owner.mention}, something went wrong!\n`Status >= 500`"
             )
 
-            if response.status >= 500:
-                raise BankError(
-                    f"{config.NO} {self.bot.owner.mention}, something went wrong!\n`Status >= 500`"
-                )
+        return response
 
-            return response
-        except aiohttp.ClientConnectionError:
-            logging.warning(f"cannot connect to {route.url}")
+    async def get_corporation(self, abbreviation: str) -> BankResponse:
+        key = abbreviation.lower()
 
-    async def _fetch_currencies(self):
-        response = await self.request(BankRoute("GET", f"currencies/"))
+        try:
+            return self._corporations.get(key)
+        except KeyError:
+            pass
+
+        response = await self.request(BankRoute("GET", f"corporation/{abbreviation}/"))
+
+        if response.status in (200, 404):
+            self._corporations.set(key, response)
+
+        return response
 
-        if not response:
+    def invalidate_accounts(self, *ibans: str):
+        """Called after money was moved, so that the next lookups ask the bank again."""
+
+        for iban in ibans:
+            self._iban_currencies.invalidate(str(iban))
+
+        self._default_accounts.invalidate()
+
+    async def _fetch_currencies(self):
+        try:
+            response = await self.request(BankRoute("GET", f"currencies/"))
+        except BankError:
+            # this runs in the background, the stale currencies are kept until the bank is back
             return
 
+        self._currencies_fetched_at = time.monotonic()
+
         js = await response.json()
         currencies = {}
 
@@ -346,6 +551,11 @@ class Bank(context.CustomCog):
         self._currencies = currencies
 
     def get_currency(self, code) -> Currency:
+        if time.monotonic() - self._currencies_fetched_at > self.CURRENCIES_TTL:
+            # serve the stale currencies this time, they are refreshed in the background
+            self._currencies_fetched_at = time.monotonic()
+            self.bot.loop.create_task(self._fetch_currencies())
+
         try:
             return self._currencies[code]
         except KeyError:
@@ -353,6 +563,11 @@ class Bank(context.CustomCog):
             return Currency(code="???", name="Unknown Currency", prefix="", suffix="?")
 
     async def get_currency_from_iban(self, iban: str) -> str:
+        try:
+            return self._iban_currencies.get(str(iban))
+        except KeyError:
+            pass
+
         response = await self.request(BankRoute("GET", f"account/{iban}/"))
 
         if response.status != 200:
@@ -361,6 +576,7 @@ class Bank(context.CustomCog):
             )
 
         json = await response.json()
+        self._iban_currencies.set(str(iban), json["balance_currency"])
         return json["balance_currency"]
 
     async def resolve_iban(self, member_id_or_corp, currency, is_sender=False) -> str:
@@ -371,12 +587,21 @@ class Bank(context.CustomCog):
         else:
             get_params["corporation"] = member_id_or_corp
 
+        cache_key = tuple(get_params.items())
+
+        try:
+            return self._default_accounts.get(cache_key)
+        except KeyError:
+            pass
+
         response = await self.request(
             BankRoute("GET", "default_account/"), params=get_params
         )
 
         if response.status == 200:
             json = await response.json()
+            self._default_accounts.set(cache_key, json["iban"])
+            self._iban_currencies.set(json["iban"], currency)
             return json["iban"]
 
         elif response.status == 404:
@@ -428,6 +653,7 @@ class Bank(context.CustomCog):
         json = await response.json()
 
         if response.status == 201:
+            self.invalidate_accounts(from_iban, to_iban)
             return json
 
         elif response.status == 400:
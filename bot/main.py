@@ -1,4 +1,3 @@
-import io
 import os
 import pathlib
 import platform
@@ -10,6 +9,7 @@ import math
 import asyncio
 import typing
 import pickle
+import threading
 
 try:
     import uvloop
@@ -27,15 +27,28 @@ import traceback
 
 from typing import Optional, Union
 from discord.ext import commands, tasks
-from googleapiclient import errors
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport import requests
-from async_lru import alru_cache
 
 sys.path.append(str(pathlib.Path(__file__).parent.parent))
 
-from bot.utils import exceptions, text, context, converter
+from bot.utils import (
+    backup,
+    exceptions,
+    text,
+    context,
+    converter,
+    dms,
+    help,
+    legalcode,
+    keywords,
+    lag,
+    leader,
+    metrics,
+    migrations,
+    profiler,
+    scheduler,
+    search,
+    startup,
+)
 from bot.config import token, config, mk
 
 logging.basicConfig(
@@ -160,6 +173,14 @@ class DemocracivBot(commands.Bot):
         intents.members = True
         intents.message_content = True
 
+        self.metrics = metrics.Metrics()
+        self.startup = startup.StartupGraph(self)
+        self.leader = leader.LeaderElection(self)
+
+        # Apps Scripts run concurrently in the default executor, but the OAuth token is loaded and refreshed once
+        self._google_credentials = None
+        self._google_credentials_lock = threading.Lock()
+
         super().__init__(
             max_messages=100 if mk.MarkConfig.IS_NATION_BOT else 1000,
             command_prefix=get_prefix,
@@ -169,6 +190,7 @@ class DemocracivBot(commands.Bot):
             activity=discord.Game(
                 name=f"{config.BOT_PREFIX}help | {config.BOT_PREFIX}commands | {config.BOT_PREFIX}about"
             ),
+            http_trace=self.metrics.trace_config("discord"),
         )
 
         self._BotBase__cogs = (
@@ -179,33 +201,87 @@ class DemocracivBot(commands.Bot):
         self.mk = mk.MarkConfig(self)
         self.is_api_running = False
         self.democraciv_guild_id = 0
+        self.legal_code = legalcode.LegalCodeGenerator(self)
+        self.legal_code_renderer = legalcode.LegalCodeRenderer(self)
+        self.keyword_extractor = keywords.KeywordExtractor(self)
+        self.search_index = search.SearchIndexQueue(self)
+        self.scheduler = scheduler.TimerScheduler(self)
+        self.dm_dispatcher = dms.DMDispatcher(self)
+        self.help_index = help.HelpIndex(self)
+        self.db_backup = backup.DatabaseBackup(
+            self,
+            path=pathlib.Path(__file__).parent / "db" / "backup",
+            keep=config.DATABASE_BACKUP_KEEP,
+            compression=config.DATABASE_BACKUP_COMPRESSION,
+        )
+
+        self.metrics_server = metrics.MetricsServer(
+            self, port=config.METRICS_SERVER_PORT
+        )
+        self.query_profiler = profiler.QueryProfiler(
+            self,
+            enabled=config.QUERY_PROFILER_ENABLED,
+            threshold=config.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+        )
+        self.loop_lag = lag.LoopLagMonitor(
+            self,
+            budget=config.LOOP_LAG_BUDGET_MS / 1000,
+            slow_callback=config.LOOP_LAG_SLOW_CALLBACK_MS / 1000,
+        )
+        self.before_invoke(self._start_command_timer)
+        self.after_invoke(self._stop_command_timer)
 
         # for Google Apps Script
         socket.setdefaulttimeout(600)
 
-    async def setup_hook(self) -> None:
-        self.loop.create_task(self.initialize_aiohttp_session())
+    async def add_cog(self, cog: commands.Cog, /, **kwargs) -> None:
+        await super().add_cog(cog, **kwargs)
+        self.help_index.invalidate()
+
+    async def remove_cog(self, name: str, /, **kwargs) -> typing.Optional[commands.Cog]:
+        cog = await super().remove_cog(name, **kwargs)
+        self.help_index.invalidate()
+        return cog
 
-        self.loop.create_task(self.connect_to_db())
+    async def setup_hook(self) -> None:
+        self.loop_lag.start()
 
         if config.DATABASE_DAILY_BACKUP_ENABLED and not self.IS_DEBUG:
             self.daily_db_backup.start()
 
-        self.loop.create_task(self.initialize_democraciv_guild())
+        self.startup.add("http", self.initialize_aiohttp_session)
 
-        self.loop.create_task(self.check_custom_emoji_availability())
-        self.loop.create_task(self.fetch_owner())
-        self.loop.create_task(self.update_guild_config_cache())
+        if config.METRICS_SERVER_ENABLED:
+            self.startup.add("metrics server", self.metrics_server.setup)
 
-        self.loop.create_task(self.check_api_running(first_time=True))
+        self.startup.add("database", self.connect_to_db)
+        self.startup.add("leader election", self.leader.start, after=("database",))
+        self.startup.add(
+            "extensions", lambda: self.startup.load_extensions(initial_extensions)
+        )
+        self.startup.add("gateway", self.wait_until_ready, after=("extensions",))
+        self.startup.add(
+            "guild config cache",
+            self.update_guild_config_cache,
+            after=("database", "gateway"),
+        )
+        self.startup.add(
+            "democraciv guild", self.initialize_democraciv_guild, after=("gateway",)
+        )
+        self.startup.add(
+            "custom emoji", self.check_custom_emoji_availability, after=("gateway",)
+        )
+        self.startup.add("owner", self.fetch_owner, after=("gateway",))
+        self.startup.add(
+            "api", lambda: self.check_api_running(first_time=True), after=("http",)
+        )
+        self.startup.start()
 
-        for extension in initial_extensions:
-            try:
-                await self.load_extension(extension)
-                logging.info(f"Successfully loaded {extension}")
-            except Exception:
-                logging.error(f"Failed to load module {extension}.")
-                traceback.print_exc()
+        # commands and listeners have to be registered, and everything that waits for the gateway to be ready
+        # expects the database to be there and to know whether this process runs the periodic jobs
+        await self.startup.wait("extensions")
+        await self.startup.wait("database")
+        await self.startup.wait("leader election")
 
     async def check_api_running(self, first_time=False):
         if first_time:
@@ -543,21 +619,24 @@ class DemocracivBot(commands.Bot):
     async def update_guild_config_cache(self):
         await self.wait_until_ready()
 
-        records = await self.db.fetch("SELECT * FROM guild")
-        guild_config = {}
-
-        for record in records:
-            guild_config[record["id"]] = await self._populate_guild_config_cache(record)
+        with self.query_profiler.profile("task:update_guild_config_cache"):
+            records = await self.db.fetch("SELECT * FROM guild")
+            guild_config = {}
 
-        for guild in self.guilds:
-            if guild.id not in guild_config:
-                settings = await self.db.fetchrow(
-                    "INSERT INTO guild (id) VALUES ($1) RETURNING *", guild.id
-                )
-                guild_config[settings["id"]] = await self._populate_guild_config_cache(
-                    settings
+            for record in records:
+                guild_config[record["id"]] = await self._populate_guild_config_cache(
+                    record
                 )
 
+            for guild in self.guilds:
+                if guild.id not in guild_config:
+                    settings = await self.db.fetchrow(
+                        "INSERT INTO guild (id) VALUES ($1) RETURNING *", guild.id
+                    )
+                    guild_config[settings["id"]] = (
+                        await self._populate_guild_config_cache(settings)
+                    )
+
         self.guild_config = guild_config
         logging.info("Guild config cache was updated.")
         return guild_config
@@ -571,17 +650,6 @@ class DemocracivBot(commands.Bot):
         else:
             return f"{config.GUILD_SETTINGS_DISABLED}{config.GUILD_SETTINGS_GRAY_ENABLED}\u200b"
 
-    async def make_file_from_image_link(self, url: str) -> discord.File:
-        img = await self._make_file_from_image_link(url)
-        img.seek(0)
-        return discord.File(img, filename="image.png")
-
-    @alru_cache()
-    async def _make_file_from_image_link(self, url: str):
-        async with self.session.get(url) as response:
-            image = await response.read()
-            return io.BytesIO(image)
-
     async def get_guild_setting(
         self, guild_id: int, setting: str
     ) -> typing.Union[typing.Any, typing.List]:
@@ -608,7 +676,9 @@ class DemocracivBot(commands.Bot):
         self.owner_id: int = self.owner.id
 
     async def initialize_aiohttp_session(self):
-        self.session: aiohttp.ClientSession = aiohttp.ClientSession()
+        self.session: aiohttp.ClientSession = aiohttp.ClientSession(
+            trace_configs=[self.metrics.trace_config("http")]
+        )
 
     async def check_custom_emoji_availability(self):
         # If these custom emoji are not set in config.py, -help and -leg submit will break.
@@ -657,16 +727,45 @@ class DemocracivBot(commands.Bot):
                     f"you replace the emojis in /bot/config/config.py/ to emojis that exist!"
                 )
 
-    async def connect_to_db(self):
+    async def _init_db_connection(self, connection: asyncpg.Connection):
+        connection.add_query_logger(self.metrics.log_query)
+        connection.add_query_logger(self.query_profiler.log_query)
+
+    async def invoke(self, ctx: commands.Context, /) -> None:
+        # profile the whole invocation, including checks and converters
+        name = ctx.command.qualified_name if ctx.command else "unknown"
+
+        with self.query_profiler.profile(f"command:{name}"):
+            await super().invoke(ctx)
+
+    async def _start_command_timer(self, ctx):
+        ctx.command_started_at = time.perf_counter()
+
+    async def _stop_command_timer(self, ctx):
+        started_at = getattr(ctx, "command_started_at", None)
+
+        if started_at is None:
+            return
+
+        name = ctx.command.qualified_name
+        self.metrics.observe(f"command:{name}", time.perf_counter() - started_at)
+        self.metrics.increment(
+            f"commands_{'failed' if ctx.command_failed else 'completed'}"
+        )
+
+    async def connect_to_db(self, *, database: typing.Optional[str] = None):
         """Attempt to connect to PostgreSQL database with specified credentials from token.py.
-        This will also fill an empty database with tables needed by the bot"""
+        This will also bring the database schema up to date, see bot/db/migrations"""
+
+        start = time.perf_counter()
 
         try:
             self.db: asyncpg.pool.Pool = await asyncpg.create_pool(
                 user=token.POSTGRESQL_USER,
                 password=token.POSTGRESQL_PASSWORD,
-                database=token.POSTGRESQL_DATABASE,
+                database=database or token.POSTGRESQL_DATABASE,
                 host=token.POSTGRESQL_HOST,
+                init=self._init_db_connection,
             )
         except Exception:
             logging.error(
@@ -675,25 +774,27 @@ class DemocracivBot(commands.Bot):
             self.db_ready = False
             raise
 
-        with open(str(pathlib.Path(__file__).parent) + "/db/schema.sql") as sql:
-            try:
-                await self.db.execute(sql.read())
-            except asyncpg.InsufficientPrivilegeError:
-                logging.error(
-                    "Could not create extension 'pg_trgm' as this user. Login as the"
-                    " postgres user and manually create extension on database."
-                )
-                self.db_ready = False
-                raise
-            except Exception:
-                logging.error(
-                    "Unexpected error occurred while executing default schema on PostgreSQL database"
-                )
-                self.db_ready = False
-                raise
+        try:
+            await migrations.MigrationRunner(self.db).upgrade()
+        except asyncpg.InsufficientPrivilegeError:
+            logging.error(
+                "Could not create extension 'pg_trgm' as this user. Login as the"
+                " postgres user and manually create extension on database."
+            )
+            self.db_ready = False
+            raise
+        except Exception:
+            logging.error(
+                "Unexpected error occurred while migrating the PostgreSQL database"
+            )
+            self.db_ready = False
+            raise
 
-        logging.info("Successfully initialised database")
+        logging.info(
+            f"Successfully initialised database in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
         self.db_ready = True
+        self.loop.create_task(self.legal_code_renderer.refresh())
 
     async def initialize_democraciv_guild(self):
         """Saves the Democraciv guild object (main guild) as a class attribute. If config.DEMOCRACIV_GUILD_ID is
@@ -735,6 +836,9 @@ class DemocracivBot(commands.Bot):
         return self.get_guild(self.democraciv_guild_id)
 
     async def run_apps_script(self, script_id, function, parameters):
+        # the Google API client takes a while to import and is rarely used
+        from googleapiclient import errors
+
         try:
             result = await self.loop.run_in_executor(
                 None, self._execute_apps_script, script_id, function, parameters
@@ -749,33 +853,51 @@ class DemocracivBot(commands.Bot):
             logging.error(f"Error while executing Apps Script {script_id}: {e.content}")
             raise exceptions.GoogleAPIError() from e
 
-    def _execute_apps_script(self, script_id, function, parameters):
-        google_credentials = None
-        path = str(pathlib.Path(__file__).parent) + "/config/google_oauth_token.pickle"
-
-        if os.path.exists(path):
-            with open(path, "rb") as google_token:
-                google_credentials = pickle.load(google_token)
-
-        if not google_credentials or not google_credentials.valid:
-            if (
-                google_credentials
-                and google_credentials.expired
-                and google_credentials.refresh_token
-            ):
-                google_credentials.refresh(requests.Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    config.GOOGLE_CLOUD_PLATFORM_CLIENT_SECRETS_FILE,
-                    config.GOOGLE_CLOUD_PLATFORM_OAUTH_SCOPES,
-                )
-                google_credentials = flow.run_local_server(port=0)
+    def _get_google_credentials(self):
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport import requests
+
+        with self._google_credentials_lock:
+            google_credentials = self._google_credentials
+            path = (
+                str(pathlib.Path(__file__).parent) + "/config/google_oauth_token.pickle"
+            )
+
+            if not google_credentials and os.path.exists(path):
+                with open(path, "rb") as google_token:
+                    google_credentials = pickle.load(google_token)
+
+            if not google_credentials or not google_credentials.valid:
+                if (
+                    google_credentials
+                    and google_credentials.expired
+                    and google_credentials.refresh_token
+                ):
+                    google_credentials.refresh(requests.Request())
+                else:
+                    flow = InstalledAppFlow.from_client_secrets_file(
+                        config.GOOGLE_CLOUD_PLATFORM_CLIENT_SECRETS_FILE,
+                        config.GOOGLE_CLOUD_PLATFORM_OAUTH_SCOPES,
+                    )
+                    google_credentials = flow.run_local_server(port=0)
+
+                # written next to it first, so that the pickle is never read half-written
+                with open(f"{path}.tmp", "wb") as google_token:
+                    pickle.dump(google_credentials, google_token)
 
-            with open(path, "wb") as google_token:
-                pickle.dump(google_credentials, google_token)
+                os.replace(f"{path}.tmp", path)
+
+            self._google_credentials = google_credentials
+            return google_credentials
+
+    def _execute_apps_script(self, script_id, function, parameters):
+        from googleapiclient.discovery import build
 
         service = build(
-            "script", "v1", credentials=google_credentials, cache_discovery=False
+            "script",
+            "v1",
+            credentials=self._get_google_credentials(),
+            cache_discovery=False,
         )
         request = {"function": function, "parameters": parameters, "devMode": True}
         return service.scripts().run(body=request, scriptId=script_id).execute()
@@ -787,40 +909,9 @@ class DemocracivBot(commands.Bot):
         message: str = None,
         embed: discord.Embed = None,
     ):
-        if target.bot:
-            return
-
-        dm_settings = await self.db.fetchrow(
-            "SELECT * FROM dm_setting WHERE user_id = $1", target.id
+        await self.dm_dispatcher.send(
+            [target], reason=reason, message=message, embed=embed
         )
-        p = config.BOT_PREFIX
-        if not dm_settings:
-            dm_settings = await self.db.fetchrow(
-                "INSERT INTO dm_setting (user_id) VALUES ($1) RETURNING *", target.id
-            )
-
-        try:
-            is_enabled = dm_settings[reason]
-        except (KeyError, TypeError):
-            is_enabled = True
-
-        if not is_enabled:
-            return
-
-        base_msg = (
-            f"{config.HINT} *You can enable and disable these DM notifications based on their subject. "
-            f"Check `{p}dms` for more information.*"
-        )
-
-        if message:
-            message = f"{message}\n\n{base_msg}"
-        else:
-            message = base_msg
-
-        try:
-            await target.send(content=message, embed=embed)
-        except discord.HTTPException:
-            pass
 
     async def close(self):
         """Closes the aiohttp ClientSession, the connection pool to the PostgreSQL database and the bot itself."""
@@ -832,8 +923,14 @@ class DemocracivBot(commands.Bot):
             await channel.send(embed=embed)
 
         await super().close()
+        await self.search_index.flush()
         await self.session.close()
+        await self.leader.close()
         await self.db.close()
+        self.keyword_extractor.close()
+        self.scheduler.close()
+        self.loop_lag.close()
+        await self.metrics_server.shutdown()
 
     async def on_ready(self):
         if not self.db_ready:
@@ -945,43 +1042,31 @@ class DemocracivBot(commands.Bot):
         except discord.Forbidden:
             pass
 
-    async def do_db_backup(self, database_name: str):
-        now = time.time()
-        pretty_time = datetime.datetime.fromtimestamp(
-            now, tz=datetime.timezone.utc
-        ).strftime("%A, %B %d %Y %H:%M:%S")
-        file_name = f"{database_name}-backup-{now}"
-
-        parent = str(pathlib.Path(__file__).parent) + "/db/"
-
-        command = (
-            f'PGPASSWORD="{token.POSTGRESQL_PASSWORD}" pg_dump -Fc {database_name} > '
-            f"{parent}backup/{database_name}/{file_name} -U {token.POSTGRESQL_USER} "
-            f"-h {token.POSTGRESQL_HOST} -w"
-        )
-
-        if not os.path.isdir(f"{parent}backup"):
-            os.mkdir(f"{parent}backup")
-
-        if not os.path.isdir(f"{parent}backup/{database_name}"):
-            os.mkdir(f"{parent}backup/{database_name}")
-
-        await asyncio.create_subprocess_shell(command)
-        await asyncio.sleep(20)
+    async def do_db_backup(self, database_name: str) -> Optional[backup.Backup]:
+        backup_channel = self.get_channel(config.DATABASE_DAILY_BACKUP_DISCORD_CHANNEL)
 
-        file = discord.File(f"{parent}backup/{database_name}/{file_name}")
+        try:
+            result = await self.db_backup.run(database_name)
+        except backup.BackupError as e:
+            logging.error(f"Database backup failed: {e}")
+
+            if backup_channel is not None:
+                await backup_channel.send(
+                    f"{config.NO} Database backup of `{database_name}` failed: {e}"[
+                        :2000
+                    ]
+                )
 
-        backup_channel = self.get_channel(config.DATABASE_DAILY_BACKUP_DISCORD_CHANNEL)
+            return None
 
         if backup_channel is None:
             logging.warning(
-                f"Couldn't find Backup Discord channel for database backup 'bot/db/backup/{database_name}/{file_name}'"
+                f"Couldn't find Backup Discord channel for database backup '{result.path}'"
             )
-            return
+            return result
 
-        await backup_channel.send(
-            f"---- Database Backup from {pretty_time} (UTC) ----", file=file
-        )
+        await self.db_backup.upload(result, backup_channel)
+        return result
 
     @tasks.loop(hours=config.DATABASE_DAILY_BACKUP_INTERVAL)
     async def daily_db_backup(self):
@@ -989,9 +1074,17 @@ class DemocracivBot(commands.Bot):
         that backup to the #backup channel to the Democraciv Discord guild."""
 
         # first startup: let bot get ready
-        await asyncio.sleep(30)
+        await self.wait_until_ready()
+
+        if not self.leader.is_leader:
+            return
 
-        await self.do_db_backup(token.POSTGRESQL_DATABASE)
+        try:
+            await self.do_db_backup(token.POSTGRESQL_DATABASE)
+        except Exception:
+            # an unhandled error would stop the task for good
+            logging.error("Unexpected error during database backup")
+            traceback.print_exc()
 
     async def get_logging_channel(
         self, guild: discord.Guild
@@ -8,7 +8,7 @@ from discord.ext import commands
 from jishaku.cog import STANDARD_FEATURES
 from jishaku.features.baseclass import Feature
 
-from bot.utils import models, context, paginator
+from bot.utils import models, context, paginator, text
 from bot.config import config, token
 from config import mk
 
@@ -35,8 +35,141 @@ class Admin(*STANDARD_FEATURES, command_attrs=dict(hidden=True)):
     @Feature.Command(parent="jsk", name="backup")
     async def jsk_backup(self, ctx):
         """Trigger a database backup"""
-        await self.bot.do_db_backup(token.POSTGRESQL_DATABASE)
-        await ctx.send(config.YES)
+        async with ctx.typing():
+            result = await self.bot.do_db_backup(token.POSTGRESQL_DATABASE)
+
+        if result is None:
+            return await ctx.send(f"{config.NO} The backup failed, see the log.")
+
+        await ctx.send(
+            f"{config.YES} Backed up {result.entries} entries "
+            f"({result.size / 1024 / 1024:.1f} MB) in {result.duration:.1f}s."
+        )
+
+    @Feature.Command(parent="jsk", name="timers", aliases=["scheduler", "pending"])
+    async def jsk_timers(self, ctx):
+        """List all pending timers of the bot-wide scheduler"""
+
+        pending = self.bot.scheduler.pending
+
+        if not pending:
+            return await ctx.send(f"{config.YES} There are no pending timers.")
+
+        fmt = "\n".join(
+            f"-  **{timer.name}** {discord.utils.format_dt(timer.when, 'R')} "
+            f"({discord.utils.format_dt(timer.when, 'T')})"
+            for timer in pending
+        )
+        await ctx.send(f"**{len(pending)} pending timer(s)**\n{fmt}")
+
+    @commands.group(name="stats", hidden=True, invoke_without_command=True)
+    @commands.is_owner()
+    async def stats(self, ctx):
+        """Statistics about the bot itself"""
+        await ctx.send_help(ctx.command)
+
+    @stats.command(name="perf", aliases=["performance", "latency"])
+    @commands.is_owner()
+    async def stats_perf(self, ctx):
+        """Summarise where the bot spends its time"""
+
+        collected = self.bot.metrics
+        embed = text.SafeEmbed(
+            title="Performance",
+            description=f"Collected since {discord.utils.format_dt(datetime.datetime.fromtimestamp(collected.started_at), 'R')}. "
+            f"Full metrics are served on `127.0.0.1:{config.METRICS_SERVER_PORT}/metrics`.",
+        )
+
+        for kind, name in (
+            ("command", "Commands"),
+            ("listener", "Listeners"),
+            ("db", "Database Queries"),
+            ("discord", "Discord API"),
+            ("http", "Other HTTP Requests"),
+        ):
+            top = collected.top(kind)
+
+            if not top:
+                continue
+
+            fmt = "\n".join(
+                f"`{label[:60]}`\n{histogram.count}x, {histogram.total / 1000:.1f}s total, "
+                f"p50 {histogram.percentile(50):g}ms, p99 {histogram.percentile(99):g}ms, "
+                f"max {histogram.max:.0f}ms"
+                for label, histogram in top
+            )
+            embed.add_field(name=name, value=fmt, inline=False)
+
+        counters = ", ".join(
+            f"{name}: {amount}"
+            for name, amount in sorted(collected.counters.items())
+            if not name.startswith(("discord_status", "http_status"))
+        )
+
+        if counters:
+            embed.add_field(name="Counters", value=counters, inline=False)
+
+        await ctx.send(embed=embed)
+
+    @stats.command(name="startup", aliases=["boot"])
+    @commands.is_owner()
+    async def stats_startup(self, ctx):
+        """Show how long each phase and each extension took during startup"""
+
+        graph = self.bot.startup
+        embed = text.SafeEmbed(title="Startup")
+        embed.add_field(
+            name="Phases", value="\n".join(graph.report()) or "-", inline=False
+        )
+        embed.add_field(
+            name="Extensions",
+            value="\n".join(graph.extension_report()[:25]) or "-",
+            inline=False,
+        )
+
+        if self.bot.leader.is_leader:
+            leader = f"This process, since <t:{self.bot.leader.elected_at:.0f}:R>"
+        else:
+            leader = "Another process, periodic jobs are skipped here"
+
+        embed.add_field(name="Leader", value=leader, inline=False)
+        await ctx.send(embed=embed)
+
+    @Feature.Command(parent="jsk", name="profiler", aliases=["queries", "nplusone"])
+    async def jsk_profiler(self, ctx, toggle: typing.Optional[bool] = None):
+        """Toggle the query profiler or list the likely N+1 queries it found"""
+
+        profiler = self.bot.query_profiler
+
+        if toggle is not None:
+            profiler.enabled = toggle
+            state = "enabled" if toggle else "disabled"
+            return await ctx.send(f"{config.YES} The query profiler is now {state}.")
+
+        suspects = profiler.suspects.most_common(10)
+        fmt = [
+            f"The query profiler is **{'enabled' if profiler.enabled else 'disabled'}**, "
+            f"statements executed at least {profiler.threshold} times within one command, "
+            f"listener or task are flagged.\n"
+        ]
+
+        for (name, query), times in suspects:
+            fmt.append(f"**{name}** (flagged {times}x)\n```sql\n{query[:300]}```")
+
+        if not suspects:
+            fmt.append("*Nothing was flagged yet.*")
+
+        busiest = sorted(profiler.recent, key=lambda p: p.elapsed, reverse=True)[:5]
+
+        if busiest:
+            fmt.append("\n**Most expensive recent profiles**")
+            fmt.extend(
+                f"-  {profile.name}: {profile.count} queries, {profile.elapsed * 1000:.1f}ms"
+                for profile in busiest
+            )
+
+        pages = paginator.SimplePages(entries=fmt, author="Query Profiler")
+        await pages.start(ctx)
 
     @Feature.Command(parent="jsk", name="sql")
     async def jsk_sql(self, ctx, *, query: str):
@@ -1,3 +1,4 @@
+import asyncio
 import collections
 
 import discord
@@ -23,6 +24,8 @@ from bot.utils.models import Bill, SessionStatus
 class Bills(context.CustomCog, mixin.GovernmentMixin, name="Bill"):
     """List, search, edit, sponsor, and withdraw bills across the Senate and Commons."""
 
+    SYNCHRONIZE_CONCURRENCY = 5
+
     @commands.group(
         name="bill",
         aliases=["b", "bills"],
@@ -70,45 +73,80 @@ class Bills(context.CustomCog, mixin.GovernmentMixin, name="Bill"):
             return
 
         sync_errors = []
+        unchanged = 0
+        semaphore = asyncio.Semaphore(self.SYNCHRONIZE_CONCURRENCY)
+        hash_content = self.bot.keyword_extractor.hash_content
+
+        async def fetch(bill: models.Bill):
+            old_name, old_hash = bill.name, hash_content(bill.content or "")
+
+            async with semaphore:
+                name, content = await bill.fetch_name_and_content()
+
+            return old_name, old_hash, name, content
 
         async with ctx.typing():
-            async with self.bot.db.acquire() as connection:
-                async with connection.transaction():
-                    for bill in passed:
-                        name, keywords, content = await bill.fetch_name_and_keywords()
+            fetched = []
 
-                        if not name:
-                            sync_errors.append(
-                                f"Error synchronizing Bill #{bill.id} - {bill.name}. Skipping update."
-                            )
-                            continue
+            for bill, (old_name, old_hash, name, content) in zip(
+                passed, await asyncio.gather(*[fetch(bill) for bill in passed])
+            ):
+                if not name:
+                    sync_errors.append(
+                        f"Error synchronizing Bill #{bill.id} - {bill.name}. Skipping update."
+                    )
+                    continue
 
-                        await connection.execute(
+                if name == old_name and hash_content(content) == old_hash:
+                    unchanged += 1
+                    continue
+
+                fetched.append((bill, name, content))
+
+            if fetched:
+                # all documents go through the keyword extractor's process pool at once
+                all_keywords = await self.bot.keyword_extractor.extract_many(
+                    [content for _, _, content in fetched]
+                )
+
+                bill_ids = [bill.id for bill, _, _ in fetched]
+                tags = [
+                    (bill.id, tag)
+                    for (bill, name, _), keywords in zip(fetched, all_keywords)
+                    for tag in Bill.make_lookup_tags(name, keywords)
+                ]
+
+                async with self.bot.db.acquire() as connection:
+                    async with connection.transaction():
+                        await connection.executemany(
                             "UPDATE bill SET name = $1, content = $3 WHERE id = $2",
-                            name,
-                            bill.id,
-                            content,
+                            [
+                                (name, bill.id, content)
+                                for bill, name, content in fetched
+                            ],
                         )
                         await connection.execute(
-                            "DELETE FROM bill_lookup_tag WHERE bill_id = $1", bill.id
+                            "DELETE FROM bill_lookup_tag WHERE bill_id = ANY($1::int[])",
+                            bill_ids,
                         )
-
-                        id_with_kws = [(bill.id, keyword) for keyword in keywords]
-                        self.bot.loop.create_task(
-                            connection.executemany(
-                                "INSERT INTO bill_lookup_tag (bill_id, tag) VALUES ($1, $2) ON CONFLICT DO NOTHING ",
-                                id_with_kws,
-                            )
+                        await connection.executemany(
+                            "INSERT INTO bill_lookup_tag (bill_id, tag) VALUES ($1, $2) ON CONFLICT DO NOTHING ",
+                            tags,
                         )
 
-                        await self.bot.api_request(
-                            "POST",
-                            "document/update",
-                            json={"id": bill.id, "type": "bill"},
-                        )
+                await self.bot.api_request(
+                    "POST",
+                    "document/bulk/update",
+                    json={"ids": bill_ids, "type": "bill"},
+                )
+
+        await self.bot.legal_code_renderer.refresh()
 
         message = f"{config.YES} Synchronized {len(passed) - len(sync_errors)}/{len(passed)} bills with Google Docs."
 
+        if unchanged:
+            message = f"{message} {unchanged} of them were already up-to-date."
+
         if sync_errors:
             message = f"{chr(10).join(sync_errors)}\n\n{message}"
 
@@ -555,12 +593,11 @@ class Bills(context.CustomCog, mixin.GovernmentMixin, name="Bill"):
                 f"{chr(10).join(formatted_bills)}"
             )
 
-            for leader in self.get_cabinet_members_for_house(house):
-                await self.bot.safe_send_dm(
-                    target=leader,
-                    reason="leg_session_withdraw",
-                    message=message,
-                )
+            await self.bot.dm_dispatcher.send(
+                self.get_cabinet_members_for_house(house),
+                reason="leg_session_withdraw",
+                message=message,
+            )
 
     @bill.command(name="resubmit", aliases=["rs"])
     @checks.is_citizen_if_multiciv()
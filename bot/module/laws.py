@@ -5,7 +5,7 @@ from discord.ext import commands
 from discord.ext.commands import Greedy
 
 from bot.config import config, mk
-from bot.utils import text, checks, context, models, mixin, paginator
+from bot.utils import text, checks, context, models, mixin, paginator, legalcode
 from bot.utils.converter import (
     CaseInsensitiveMember,
     PoliticalParty,
@@ -119,7 +119,7 @@ class Laws(context.CustomCog, mixin.GovernmentMixin, name="Law"):
         #        f"{config.NO} That doesn't look like a Google Docs URL."
         #    )
 
-        doc_url = "https://docs.google.com/document/d/1ywV_F70odxHh5fLcqcghpFOToPao85CjfT5Y_mYcml0/edit?usp=sharing"
+        doc_url = legalcode.LEGAL_CODE_DOC_URL
 
         if not doc_url or not self.is_google_doc_link(doc_url):
             return await ctx.send(
@@ -138,22 +138,8 @@ class Laws(context.CustomCog, mixin.GovernmentMixin, name="Law"):
         await asyncio.sleep(2)
 
         async with ctx.typing():
-            all_laws = await self.bot.db.fetch(
-                "SELECT id, name, link FROM bill WHERE status = $1 ORDER BY id;",
-                models.BillIsLaw.flag.value,
-            )
-            ugly_laws = [dict(r) for r in all_laws]
-            date = discord.utils.utcnow().strftime("%B %d, %Y at %H:%M")
-
-            result = await self.bot.run_apps_script(
-                script_id="MMV-pGVACMhaf_DjTn8jfEGqnXKElby-M",
-                function="generate_legal_code",
-                parameters=[
-                    doc_url,
-                    {"name": self.bot.mk.NATION_FULL_NAME, "date": date},
-                    ugly_laws,
-                ],
-            )
+            # skips the Apps Script run if no law changed since the Legal Code was last generated
+            result = await self.bot.legal_code.generate()
 
         embed = text.SafeEmbed(
             title=f"Generated Legal Code",
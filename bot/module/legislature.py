@@ -852,7 +852,7 @@ class Legislature(context.CustomCog, mixin.GovernmentMixin, name="Senate"):
         await self.gov_announcements_channel.send(embed=announcement)
 
         if should_dm_legislators:
-            await self.dm_legislators(
+            report = await self.dm_legislators(
                 reason="leg_session_open",
                 message=f":envelope_with_arrow: The **submission period** for Senate Session "
                 f"#{new_session_display_id} has started! Submit your bills and motions with "
@@ -860,6 +860,12 @@ class Legislature(context.CustomCog, mixin.GovernmentMixin, name="Senate"):
                 f"on the {self.bot.dciv.name} server.",
             )
 
+            if report:
+                await ctx.send(
+                    f"{config.YES} {report.delivered} {self.bot.mk.LEGISLATURE_LEGISLATOR_NAME_PLURAL} "
+                    f"were notified via DM ({report.opted_out} opted out, {report.failed} could not be reached)."
+                )
+
     @session.command(name="lock")
     @checks.has_democraciv_role(mk.DemocracivRole.MK13_SENATOR_PRESIDING)
     async def locksession(self, ctx):
@@ -998,12 +1004,18 @@ class Legislature(context.CustomCog, mixin.GovernmentMixin, name="Senate"):
         await self.gov_announcements_channel.send(embed=announcement)
 
         if should_dm_legislators:
-            await self.dm_legislators(
+            report = await self.dm_legislators(
                 reason="leg_session_update",
                 message=f":ballot_box: The **voting period** for Senate Session "
                 f"#{active_leg_session.mk13_house_id} has started!\nVote here: {voting_form}",
             )
 
+            if report:
+                await ctx.send(
+                    f"{config.YES} {report.delivered} {self.bot.mk.LEGISLATURE_LEGISLATOR_NAME_PLURAL} "
+                    f"were notified via DM ({report.opted_out} opted out, {report.failed} could not be reached)."
+                )
+
     @session.command(name="close", aliases=["c"])
     @checks.has_democraciv_role(mk.DemocracivRole.MK13_SENATOR_PRESIDING)
     async def closesession(self, ctx):
@@ -1384,30 +1396,34 @@ class Legislature(context.CustomCog, mixin.GovernmentMixin, name="Senate"):
         )
 
     async def paginate_all_sessions(self, ctx):
-        all_sessions = await self.bot.db.fetch(
-            "SELECT id, mk13_house_id, opened_on, closed_on FROM legislature_session WHERE house = 'senate' ORDER BY id"
-        )
-        pretty_sessions = []
+        def format_sessions(records):
+            pretty_sessions = []
 
-        for record in all_sessions:
-            opened_on = f"<t:{int(record["opened_on"].timestamp())}:D>"
+            for record in records:
+                opened_on = f"<t:{int(record["opened_on"].timestamp())}:D>"
 
-            if record["closed_on"]:
-                closed_on = f"<t:{int(record["closed_on"].timestamp())}:D>"
-                pretty_sessions.append(
-                    f"* **Session #{record['mk13_house_id']}**  - {opened_on} to {closed_on}"
-                )
-            else:
-                pretty_sessions.append(
-                    f"* **Session #{record['mk13_house_id']}**  - {opened_on}"
-                )
+                if record["closed_on"]:
+                    closed_on = f"<t:{int(record["closed_on"].timestamp())}:D>"
+                    pretty_sessions.append(
+                        f"* **Session #{record['mk13_house_id']}**  - {opened_on} to {closed_on}"
+                    )
+                else:
+                    pretty_sessions.append(
+                        f"* **Session #{record['mk13_house_id']}**  - {opened_on}"
+                    )
 
+            return pretty_sessions
+
+        source = paginator.KeysetPageSource(
+            self.bot.db,
+            query="SELECT id, mk13_house_id, opened_on, closed_on FROM legislature_session WHERE house = 'senate'",
+            formatter=format_sessions,
+            empty_message="There hasn't been a session yet.",
+        )
         pages = paginator.SimplePages(
-            entries=pretty_sessions,
+            source=source,
             icon=self.bot.mk.NATION_ICON_URL,
             author=f"All Sessions of the Senate",
-            empty_message="There hasn't been a session yet.",
-            per_page=12,
         )
         await pages.start(ctx)
 
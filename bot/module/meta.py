@@ -29,16 +29,8 @@ class Meta(context.CustomCog):
         await ctx.invoke(self.bot.get_command("jsk reload"), list(self.bot.extensions))
 
     async def ensure_dm_settings(self, user: int):
-        settings = await self.bot.db.fetchrow(
-            "SELECT * FROM dm_setting WHERE user_id = $1", user
-        )
-
-        if not settings:
-            settings = await self.bot.db.fetchrow(
-                "INSERT INTO dm_setting (user_id) VALUES ($1) RETURNING *", user
-            )
-
-        return settings
+        settings = await self.bot.dm_dispatcher.get_settings([user])
+        return settings[user]
 
     @commands.command(
         name="dms", aliases=["dm", "pm", "dmsettings", "dm-settings", "dmsetting"]
@@ -104,6 +96,7 @@ class Meta(context.CustomCog):
             *result.choices.values(),
             ctx.author.id,
         )
+        self.bot.dm_dispatcher.update_settings(ctx.author.id, result.choices)
 
         await ctx.send(f"{config.YES} Your settings were updated.")
 
@@ -214,22 +207,14 @@ class Meta(context.CustomCog):
         i = 0
         p = config.BOT_PREFIX
 
-        for name, cog in sorted(self.bot.cogs.items()):
+        for indexed in self.bot.help_index.cogs.values():
+            cog = indexed.cog
+
             if cog.hidden and cog.qualified_name != "Bank":
                 continue
 
-            cog_cmds = sorted(
-                [command for command in cog.walk_commands() if not command.hidden],
-                key=lambda c: c.qualified_name,
-            )
-
-            amounts += len(cog_cmds)
-
-            commands_list = []
-
-            for command in cog_cmds:
-                if not command.hidden:
-                    commands_list.append(f"`{p}{command.qualified_name}`")
+            amounts += len(indexed.entries)
+            commands_list = [f"`{p}{entry.name}`" for entry in indexed.entries]
 
             if i == 0:
                 description_text.append(f"**__{cog.qualified_name}__**\n")
@@ -1,8 +1,9 @@
 import datetime
+import logging
 import typing
 import discord
 
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.utils import escape_markdown
 
 from bot.config import config, mk
@@ -128,6 +129,11 @@ class Ministry(
 ):
     """Allows the {MINISTRY_NAME} to pass and veto bills"""
 
+    AUTO_PASS_TIMER = "ministry_auto_pass"
+    # bills that were sent to the Executive together are a few milliseconds apart, so they are passed in one batch
+    AUTO_PASS_GRACE = datetime.timedelta(seconds=5)
+    AUTO_PASS_RETRY = datetime.timedelta(minutes=10)
+
     def __init__(self, bot):
         super().__init__(bot)
         self.pass_scheduler = LawPassScheduler(
@@ -140,10 +146,58 @@ class Ministry(
             mk.DemocracivChannel.GOV_ANNOUNCEMENTS_CHANNEL,
             subreddit=config.DEMOCRACIV_SUBREDDIT,
         )
-        self.auto_pass_bills.start()
+        self.bot.loop.create_task(self.arm_auto_pass())
 
     def cog_unload(self):
-        self.auto_pass_bills.cancel()
+        self.bot.scheduler.cancel(self.AUTO_PASS_TIMER)
+
+    def _schedule_auto_pass(self, when: datetime.datetime):
+        self.bot.scheduler.schedule(
+            self.AUTO_PASS_TIMER,
+            when,
+            self.auto_pass_bills,
+            name="Automatic passing of bills after the Executive deadline",
+        )
+
+    async def arm_auto_pass(self, *, after_run=False):
+        """Sleep until the next Executive deadline of any bill, if there is one."""
+
+        await self.bot.wait_until_ready()
+
+        next_deadline = await self.bot.db.fetchval(
+            "SELECT MIN(executive_deadline_at) FROM bill WHERE status = $1",
+            models.BillAwaitingExecutive.flag.value,
+        )
+
+        if next_deadline is None:
+            self.bot.scheduler.cancel(self.AUTO_PASS_TIMER)
+            return
+
+        when = (
+            next_deadline.replace(tzinfo=datetime.timezone.utc) + self.AUTO_PASS_GRACE
+        )
+        now = discord.utils.utcnow()
+
+        if after_run and when <= now:
+            # a bill is past its deadline but could not be passed, don't spin on it
+            when = now + self.AUTO_PASS_RETRY
+
+        self._schedule_auto_pass(when)
+
+    @commands.Cog.listener()
+    async def on_leader_elected(self):
+        # bills that expired while another process was the leader
+        await self.arm_auto_pass()
+
+    @commands.Cog.listener()
+    async def on_executive_deadline_set(
+        self, bill: models.Bill, deadline: datetime.datetime
+    ):
+        when = deadline.replace(tzinfo=datetime.timezone.utc) + self.AUTO_PASS_GRACE
+        timer = self.bot.scheduler.get(self.AUTO_PASS_TIMER)
+
+        if timer is None or when < timer.when:
+            self._schedule_auto_pass(when)
 
     async def get_pretty_vetoes(self, do_paste=False) -> typing.List[str]:
         """Gets all bills awaiting Executive action."""
@@ -201,8 +255,19 @@ class Ministry(
 
         return pretty_bills
 
-    @tasks.loop(minutes=10)
     async def auto_pass_bills(self):
+        try:
+            await self._auto_pass_bills()
+        except Exception as e:
+            # the timer is gone once it fired, so it has to be re-armed even if something unexpected broke
+            logging.error(f"Error while automatically passing bills: {e!r}")
+            self._schedule_auto_pass(discord.utils.utcnow() + self.AUTO_PASS_RETRY)
+
+    async def _auto_pass_bills(self):
+        if not self.bot.leader.is_leader:
+            # the leader passes them, check again later in case it goes away
+            return await self.arm_auto_pass(after_run=True)
+
         expired_bills = await self.bot.db.fetch(
             "SELECT id FROM bill WHERE status = $1 AND executive_deadline_at IS NOT NULL "
             "AND executive_deadline_at <= $2 ORDER BY id",
@@ -211,28 +276,31 @@ class Ministry(
         )
 
         if not expired_bills:
-            return
+            return await self.arm_auto_pass(after_run=True)
 
         mock_ctx = context.MockContext(self.bot)
-        added_any = False
+        bills = []
 
         for record in expired_bills:
             try:
                 bill = await models.Bill.convert(mock_ctx, record["id"])
-                await bill.status.pass_into_law(auto_pass=True)
             except Exception:
                 continue
 
             bill._auto_passed = True
-            self.pass_scheduler.add(bill)
-            added_any = True
+            bills.append(bill)
+
+        consumer = models.LegalConsumer(
+            ctx=mock_ctx, objects=bills, action=models.BillStatus.pass_into_law
+        )
+        await consumer.filter(auto_pass=True)
 
-        if added_any:
-            await self.pass_scheduler.trigger_now()
+        if not consumer.passed:
+            return await self.arm_auto_pass(after_run=True)
 
-    @auto_pass_bills.before_loop
-    async def before_auto_pass_bills(self):
-        await self.bot.wait_until_ready()
+        await consumer.consume(scheduler=self.pass_scheduler, auto_pass=True)
+        await self.arm_auto_pass(after_run=True)
+        await self.pass_scheduler.trigger_now()
 
     MINISTRY_ALIASES = [
         "min",
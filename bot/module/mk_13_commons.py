@@ -1287,30 +1287,34 @@ class Commons(context.CustomCog, mixin.GovernmentMixin, name="Commons"):
         )
 
     async def paginate_all_sessions(self, ctx):
-        all_sessions = await self.bot.db.fetch(
-            "SELECT id, mk13_house_id, opened_on, closed_on FROM legislature_session WHERE house = 'commons' ORDER BY id"
-        )
-        pretty_sessions = []
+        def format_sessions(records):
+            pretty_sessions = []
 
-        for record in all_sessions:
-            opened_on = f"<t:{int(record["opened_on"].timestamp())}:D>"
+            for record in records:
+                opened_on = f"<t:{int(record["opened_on"].timestamp())}:D>"
 
-            if record["closed_on"]:
-                closed_on = f"<t:{int(record["closed_on"].timestamp())}:D>"
-                pretty_sessions.append(
-                    f"* **Session #{record['mk13_house_id']}**  - {opened_on} to {closed_on}"
-                )
-            else:
-                pretty_sessions.append(
-                    f"* **Session #{record['mk13_house_id']}**  - {opened_on}"
-                )
+                if record["closed_on"]:
+                    closed_on = f"<t:{int(record["closed_on"].timestamp())}:D>"
+                    pretty_sessions.append(
+                        f"* **Session #{record['mk13_house_id']}**  - {opened_on} to {closed_on}"
+                    )
+                else:
+                    pretty_sessions.append(
+                        f"* **Session #{record['mk13_house_id']}**  - {opened_on}"
+                    )
+
+            return pretty_sessions
 
+        source = paginator.KeysetPageSource(
+            self.bot.db,
+            query="SELECT id, mk13_house_id, opened_on, closed_on FROM legislature_session WHERE house = 'commons'",
+            formatter=format_sessions,
+            empty_message="There hasn't been a session yet.",
+        )
         pages = paginator.SimplePages(
-            entries=pretty_sessions,
+            source=source,
             icon=self.bot.mk.NATION_ICON_URL,
             author=f"All Sessions of the Commons",
-            empty_message="There hasn't been a session yet.",
-            per_page=12,
         )
         await pages.start(ctx)
 
@@ -1777,14 +1781,11 @@ class Commons(context.CustomCog, mixin.GovernmentMixin, name="Commons"):
             return
 
         if not self.is_cabinet(ctx.author):
-            if self.speaker is not None:
-                await self.bot.safe_send_dm(
-                    target=self.speaker, reason="leg_session_submit", embed=embed
-                )
-            if self.vice_speaker is not None:
-                await self.bot.safe_send_dm(
-                    target=self.vice_speaker, reason="leg_session_submit", embed=embed
-                )
+            await self.bot.dm_dispatcher.send(
+                [member for member in (self.speaker, self.vice_speaker) if member],
+                reason="leg_session_submit",
+                embed=embed,
+            )
 
     @commons.command(name="pass", aliases=["p"])
     @checks.has_any_democraciv_role(
@@ -227,7 +227,7 @@ class NPC(CustomCog):
                 return avatar
 
     async def _load_webhook_cache(self):
-        await self.bot.wait_until_ready()
+        await self.bot.startup.wait("database")
 
         webhooks = await self.bot.db.fetch(
             "SELECT channel_id, webhook_id, webhook_token FROM npc_webhook"
@@ -238,28 +238,30 @@ class NPC(CustomCog):
             self._webhook_cache[record["channel_id"]] = webhook_url
 
     async def _load_npc_cache(self):
-        await self.bot.wait_until_ready()
+        await self.bot.startup.wait("database")
 
-        npcs = await self.bot.db.fetch(
-            "SELECT npc.id, npc.name, npc.avatar_url, npc.owner_id, npc.trigger_phrase FROM npc"
-        )
+        with self.bot.query_profiler.profile("task:load_npc_cache"):
+            npcs = await self.bot.db.fetch(
+                "SELECT npc.id, npc.name, npc.avatar_url, npc.owner_id, npc.trigger_phrase FROM npc"
+            )
 
-        self._npc_cache.clear()
-        self._npc_access_cache.clear()
+            self._npc_cache.clear()
+            self._npc_access_cache.clear()
 
-        for record in npcs:
-            self._npc_cache[record["id"]] = dict(record)
-            self._npc_access_cache[record["owner_id"]].add(record["id"])
+            for record in npcs:
+                self._npc_cache[record["id"]] = dict(record)
+                self._npc_access_cache[record["owner_id"]].add(record["id"])
 
-            others = await self.bot.db.fetch(
-                "SELECT user_id FROM npc_allowed_user WHERE npc_id = $1", record["id"]
-            )
+                others = await self.bot.db.fetch(
+                    "SELECT user_id FROM npc_allowed_user WHERE npc_id = $1",
+                    record["id"],
+                )
 
-            for other in others:
-                self._npc_access_cache[other["user_id"]].add(record["id"])
+                for other in others:
+                    self._npc_access_cache[other["user_id"]].add(record["id"])
 
     async def _load_automatic_trigger_cache(self):
-        await self.bot.wait_until_ready()
+        await self.bot.startup.wait("database")
 
         npcs = await self.bot.db.fetch("SELECT * FROM npc_automatic_mode")
 
@@ -139,24 +139,25 @@ class Tags(context.CustomCog):
     async def local(self, ctx: context.CustomContext):
         """List all non-global tags on this server"""
 
-        all_tags = await self.bot.db.fetch(
-            "SELECT * FROM tag WHERE guild_id = $1 AND global = false "
-            "ORDER BY uses desc",
-            ctx.guild.id,
-        )
-        pretty_tags = []
-
-        for record in all_tags:
-            pretty_tags.append(
+        def format_tags(records):
+            return [
                 f"* `{config.BOT_PREFIX}{record['name']}`  {escape_markdown(record['title'])}"
-            )
+                for record in records
+            ]
 
+        source = paginator.KeysetPageSource(
+            self.bot.db,
+            query="SELECT id, name, title, uses FROM tag WHERE guild_id = $1 AND global = false",
+            args=(ctx.guild.id,),
+            keys=("uses", "id"),
+            descending=True,
+            formatter=format_tags,
+            empty_message="There are no local tags on this server.",
+        )
         pages = paginator.SimplePages(
-            entries=pretty_tags,
+            source=source,
             author=f"Local Tags in {ctx.guild.name}",
             icon=ctx.guild_icon,
-            empty_message="There are no local tags on this server.",
-            per_page=12,
         )
         await pages.start(ctx)
 
@@ -173,25 +174,26 @@ class Tags(context.CustomCog):
         """List the tags that someone made on this server"""
 
         member = person or ctx.author
-        all_tags = await self.bot.db.fetch(
-            "SELECT * FROM tag WHERE author = $1 AND guild_id = $2 ORDER BY uses desc",
-            member.id,
-            ctx.guild.id,
-        )
-
-        pretty_tags = []
 
-        for record in all_tags:
-            pretty_tags.append(
+        def format_tags(records):
+            return [
                 f"`{config.BOT_PREFIX}{record['name']}`  {escape_markdown(record['title'])}"
-            )
+                for record in records
+            ]
 
+        source = paginator.KeysetPageSource(
+            self.bot.db,
+            query="SELECT id, name, title, uses FROM tag WHERE author = $1 AND guild_id = $2",
+            args=(member.id, ctx.guild.id),
+            keys=("uses", "id"),
+            descending=True,
+            formatter=format_tags,
+            empty_message=f"{member} hasn't made any tags on this server yet.",
+        )
         pages = paginator.SimplePages(
-            entries=pretty_tags,
+            source=source,
             author=f"Tags from {member.display_name}",
             icon=member.display_avatar.url,
-            empty_message=f"{member} hasn't made any tags on this server yet.",
-            per_page=12,
         )
         await pages.start(ctx)
 
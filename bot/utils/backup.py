@@ -0,0 +1,208 @@
+import asyncio
+import collections
+import datetime
+import io
+import logging
+import os
+import pathlib
+import time
+import typing
+
+import discord
+
+from bot.config import token
+
+# bytes read from pg_dump's stdout at once
+CHUNK_SIZE = 1024 * 1024
+
+# leave room for the multipart overhead of the upload
+UPLOAD_MARGIN = 64 * 1024
+
+
+class BackupError(Exception):
+    pass
+
+
+class Backup(typing.NamedTuple):
+    database: str
+    path: pathlib.Path
+    size: int
+    duration: float
+    entries: int
+
+
+class DatabaseBackup:
+    """Dumps a database with `pg_dump` into `path/<database>/` and verifies the archive with `pg_restore --list`.
+
+    pg_dump's output is streamed to disk while it's running, and the job waits until pg_dump has exited.
+    It uses the custom archive format, which already compresses every table with zlib. The archive is
+    written to a `.partial` file first and is only renamed once it has been verified, so an unfinished
+    dump is never uploaded or counted as a backup. Only the newest `keep` backups of every database are
+    kept on disk.
+    """
+
+    def __init__(self, bot, *, path: pathlib.Path, keep: int, compression: int = 6):
+        self.bot = bot
+        self.path = path
+        self.keep = keep
+        self.compression = compression
+        self._locks: typing.DefaultDict[str, asyncio.Lock] = collections.defaultdict(
+            asyncio.Lock
+        )
+
+    @staticmethod
+    def _environment() -> typing.Dict[str, str]:
+        env = os.environ.copy()
+        env["PGPASSWORD"] = token.POSTGRESQL_PASSWORD
+        return env
+
+    def _connection_arguments(self) -> typing.List[str]:
+        return ["-U", token.POSTGRESQL_USER, "-h", token.POSTGRESQL_HOST, "-w"]
+
+    async def run(self, database: str) -> Backup:
+        async with self._locks[database]:
+            start = time.perf_counter()
+            directory = self.path / database
+            directory.mkdir(parents=True, exist_ok=True)
+
+            file = directory / f"{database}-backup-{time.time():.0f}.dump"
+            partial = file.with_name(f"{file.name}.partial")
+
+            try:
+                await self._dump(database, partial)
+                entries = await self._verify(partial)
+                partial.rename(file)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                self.bot.metrics.increment("backup_failures")
+                raise
+
+            backup = Backup(
+                database=database,
+                path=file,
+                size=file.stat().st_size,
+                duration=time.perf_counter() - start,
+                entries=entries,
+            )
+
+            self.bot.metrics.observe(f"backup:{database}", backup.duration)
+            self.bot.metrics.increment(f"backup_bytes:{database}", backup.size)
+            logging.info(
+                f"Backup of {database} with {backup.entries} entries "
+                f"({backup.size / 1024 / 1024:.1f} MB) finished in {backup.duration:.1f}s"
+            )
+
+            self._prune(directory, database)
+            return backup
+
+    async def _dump(self, database: str, destination: pathlib.Path):
+        process = await asyncio.create_subprocess_exec(
+            "pg_dump",
+            "-Fc",
+            f"-Z{self.compression}",
+            *self._connection_arguments(),
+            database,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._environment(),
+        )
+
+        async def copy():
+            with destination.open("wb") as f:
+                while True:
+                    chunk = await process.stdout.read(CHUNK_SIZE)
+
+                    if not chunk:
+                        break
+
+                    f.write(chunk)
+
+        # stderr has to be drained too, otherwise pg_dump blocks once its pipe is full
+        try:
+            _, stderr = await asyncio.gather(copy(), process.stderr.read())
+        finally:
+            if process.returncode is None:
+                process.kill()
+
+            await process.wait()
+
+        if process.returncode != 0:
+            raise BackupError(
+                f"pg_dump of {database} exited with {process.returncode}: {stderr.decode(errors='replace').strip()}"
+            )
+
+    async def _verify(self, archive: pathlib.Path) -> int:
+        """Check that the archive is complete and return the amount of entries in its table of contents."""
+
+        process = await asyncio.create_subprocess_exec(
+            "pg_restore",
+            "--list",
+            str(archive),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            raise BackupError(
+                f"pg_restore couldn't read {archive.name}: {stderr.decode(errors='replace').strip()}"
+            )
+
+        entries = sum(
+            1
+            for line in stdout.decode(errors="replace").splitlines()
+            if line.strip() and not line.startswith(";")
+        )
+
+        if not entries:
+            raise BackupError(f"{archive.name} is empty.")
+
+        return entries
+
+    def _prune(self, directory: pathlib.Path, database: str):
+        backups = sorted(
+            (
+                file
+                for file in directory.glob(f"{database}-backup-*")
+                if not file.name.endswith(".partial")
+            ),
+            key=lambda file: file.stat().st_mtime,
+            reverse=True,
+        )
+
+        for old in backups[self.keep :]:
+            old.unlink(missing_ok=True)
+            logging.info(f"Deleted old backup {old.name}")
+
+    async def upload(self, backup: Backup, channel: discord.abc.Messageable):
+        """Upload the archive in as many parts as needed to stay under the upload limit of the channel's guild.
+        The parts can be put back together with `cat`."""
+
+        limit = max(channel.guild.filesize_limit - UPLOAD_MARGIN, UPLOAD_MARGIN)
+        parts = max(1, -(-backup.size // limit))
+        pretty_time = datetime.datetime.fromtimestamp(
+            backup.path.stat().st_mtime, tz=datetime.timezone.utc
+        ).strftime("%A, %B %d %Y %H:%M:%S")
+
+        def read_part(index: int) -> bytes:
+            with backup.path.open("rb") as f:
+                f.seek(index * limit)
+                return f.read(limit)
+
+        for index in range(parts):
+            data = await self.bot.loop.run_in_executor(None, read_part, index)
+
+            if parts == 1:
+                filename = backup.path.name
+                content = f"---- Database Backup from {pretty_time} (UTC) ----"
+            else:
+                filename = f"{backup.path.name}.{index + 1:03}"
+                content = f"---- Database Backup from {pretty_time} (UTC), part {index + 1}/{parts} ----"
+
+                if index == 0:
+                    content = (
+                        f"{content}\nRestore with `cat {backup.path.name}.* > {backup.path.name}`"
+                        f" and `pg_restore -d {backup.database} {backup.path.name}`"
+                    )
+
+            await channel.send(content, file=discord.File(io.BytesIO(data), filename))
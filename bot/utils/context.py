@@ -58,6 +58,14 @@ class CustomCog(commands.Cog):
                 )
                 cooldown_deco(command)
 
+        # time every listener of this cog, discord.py looks them up by name when the cog is added
+        for _, method_name in self.__cog_listeners__:
+            name = f"{self.qualified_name}.{method_name}"
+            listener = self.bot.query_profiler.wrap_listener(
+                name, getattr(self, method_name)
+            )
+            setattr(self, method_name, self.bot.metrics.wrap_listener(name, listener))
+
     async def _transform_description(self):
         await self.bot.wait_until_ready()
 
@@ -0,0 +1,116 @@
+import asyncio
+import collections
+import logging
+import typing
+
+import discord
+
+from bot.config import config
+
+DMReport = collections.namedtuple("DMReport", "delivered failed opted_out")
+
+
+class DMDispatcher:
+    """Sends DM notifications to many users at once.
+
+    The `dm_setting` rows of all targets are loaded with a single query and cached in memory afterwards,
+    the `dms` command updates the cache whenever someone changes their settings. DMs are sent concurrently,
+    bounded by `concurrency` so that we stay well within Discord's rate limits for opening DM channels.
+    """
+
+    def __init__(self, bot, *, concurrency: int = 5):
+        self.bot = bot
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._settings: typing.Dict[int, typing.Dict[str, typing.Any]] = {}
+
+    async def get_settings(
+        self, user_ids: typing.Iterable[int]
+    ) -> typing.Dict[int, typing.Dict[str, typing.Any]]:
+        """Get the DM settings of every user, creating the default settings for users that have none yet."""
+
+        user_ids = set(user_ids)
+        missing = list(user_ids - self._settings.keys())
+
+        if missing:
+            records = await self.bot.db.fetch(
+                "SELECT * FROM dm_setting WHERE user_id = ANY($1::bigint[])", missing
+            )
+            self._settings.update({r["user_id"]: dict(r) for r in records})
+
+            new = [user for user in missing if user not in self._settings]
+
+            if new:
+                records = await self.bot.db.fetch(
+                    "INSERT INTO dm_setting (user_id) SELECT unnest($1::bigint[]) "
+                    "ON CONFLICT DO NOTHING RETURNING *",
+                    new,
+                )
+                self._settings.update({r["user_id"]: dict(r) for r in records})
+
+        return {
+            user: self._settings[user] for user in user_ids if user in self._settings
+        }
+
+    def update_settings(self, user_id: int, settings: typing.Dict[str, typing.Any]):
+        self._settings[user_id] = {"user_id": user_id, **settings}
+
+    @staticmethod
+    def _with_hint(message: typing.Optional[str]) -> str:
+        hint = (
+            f"{config.HINT} *You can enable and disable these DM notifications based on their subject. "
+            f"Check `{config.BOT_PREFIX}dms` for more information.*"
+        )
+
+        return f"{message}\n\n{hint}" if message else hint
+
+    async def _deliver(self, target, message, embed) -> bool:
+        async with self._semaphore:
+            try:
+                await target.send(content=message, embed=embed)
+                return True
+            except discord.HTTPException:
+                return False
+
+    async def send(
+        self,
+        targets: typing.Iterable[typing.Union[discord.User, discord.Member]],
+        *,
+        reason: str = None,
+        message: str = None,
+        embed: discord.Embed = None,
+    ) -> DMReport:
+        targets = {target.id: target for target in targets if not target.bot}
+
+        if not targets:
+            return DMReport(0, 0, 0)
+
+        settings = await self.get_settings(targets)
+        recipients = []
+
+        for user_id, target in targets.items():
+            try:
+                is_enabled = settings[user_id][reason]
+            except (KeyError, TypeError):
+                is_enabled = True
+
+            if is_enabled:
+                recipients.append(target)
+
+        message = self._with_hint(message)
+        results = await asyncio.gather(
+            *[self._deliver(target, message, embed) for target in recipients]
+        )
+
+        report = DMReport(
+            delivered=sum(results),
+            failed=len(results) - sum(results),
+            opted_out=len(targets) - len(recipients),
+        )
+
+        if len(targets) > 1:
+            logging.info(
+                f"Sent '{reason}' DMs: {report.delivered} delivered, {report.failed} failed, "
+                f"{report.opted_out} opted out."
+            )
+
+        return report
@@ -7,7 +7,9 @@ Based on RoboDanny by Rapptz: https://github.com/Rapptz/RoboDanny/blob/rewrite/L
 """
 
 import asyncio
+import collections
 import textwrap
+import typing
 
 import discord
 
@@ -42,32 +44,135 @@ If you want to add me to your own Discord Server, invite me [here](https://disco
 Use these buttons below to navigate between the pages."""
 
 
-class BotHelpPageSource(menus.ListPageSource):
-    def __init__(self, help_command, commands):
-        super().__init__(
-            entries=sorted(commands.keys(), key=lambda c: c.qualified_name), per_page=6
+HelpEntry = collections.namedtuple("HelpEntry", "command name signature short_doc")
+
+
+class IndexedCog(typing.NamedTuple):
+    cog: commands.Cog
+    short_doc: str
+    select_description: str
+    entries: typing.List[HelpEntry]
+    has_top_level_commands: bool
+
+
+class HelpIndex:
+    """Groups every non-hidden command by its cog with the signatures and descriptions already rendered,
+    so that the help pages don't have to walk and format every command again on each invocation.
+
+    The index is rebuilt lazily the first time it's used after a cog was added or removed, i.e. after an
+    extension was (re)loaded. Whether someone can run a command only depends on their server and their
+    roles for nearly all of our checks, so the results of `can_run` are cached per (guild, role set) as well.
+    They're only used to render commands in italic, so an outdated result is harmless.
+    """
+
+    def __init__(self, bot, *, max_cached_contexts: int = 256):
+        self.bot = bot
+        self.max_cached_contexts = max_cached_contexts
+        self._cogs: typing.Optional[typing.Dict[str, IndexedCog]] = None
+        self._allowed: typing.OrderedDict[typing.Hashable, typing.Dict[str, bool]] = (
+            collections.OrderedDict()
         )
-        self.commands = commands
+
+    def invalidate(self):
+        self._cogs = None
+        self._allowed.clear()
+
+    @property
+    def cogs(self) -> typing.Dict[str, IndexedCog]:
+        if self._cogs is None:
+            self._cogs = self._build()
+
+        return self._cogs
+
+    def get(self, cog: commands.Cog) -> typing.Optional[IndexedCog]:
+        return self.cogs.get(cog.qualified_name) if cog else None
+
+    def _build(self) -> typing.Dict[str, IndexedCog]:
+        cogs = {}
+
+        for name, cog in sorted(self.bot.cogs.items(), key=lambda x: x[0]):
+            cmds = sorted(
+                (command for command in cog.walk_commands() if not command.hidden),
+                key=lambda c: c.qualified_name,
+            )
+
+            entries = [
+                HelpEntry(
+                    command=command,
+                    name=command.qualified_name,
+                    signature=f"{config.BOT_PREFIX}{command.qualified_name} {command.signature}".rstrip(),
+                    short_doc=command.short_doc or "No help given.",
+                )
+                for command in cmds
+            ]
+
+            cogs[cog.qualified_name] = IndexedCog(
+                cog=cog,
+                short_doc=(
+                    cog.description.split("\n", 1)[0]
+                    if cog.description
+                    else "No help found."
+                ),
+                select_description=textwrap.shorten(
+                    cog.description, width=100, placeholder="..."
+                ),
+                entries=entries,
+                has_top_level_commands=any(command.parent is None for command in cmds),
+            )
+
+        return cogs
+
+    @staticmethod
+    def _context_key(ctx) -> typing.Hashable:
+        roles = frozenset(role.id for role in getattr(ctx.author, "roles", ()))
+        is_owner = ctx.author.id == getattr(ctx.bot, "owner_id", None)
+        return ctx.guild.id if ctx.guild else None, roles, is_owner
+
+    async def can_run(self, ctx, entry: HelpEntry) -> bool:
+        key = self._context_key(ctx)
+
+        try:
+            allowed = self._allowed[key]
+            self._allowed.move_to_end(key)
+        except KeyError:
+            allowed = self._allowed[key] = {}
+
+            if len(self._allowed) > self.max_cached_contexts:
+                self._allowed.popitem(last=False)
+
+        try:
+            return allowed[entry.name]
+        except KeyError:
+            pass
+
+        try:
+            is_allowed = await entry.command.can_run(ctx)
+        except Exception:
+            is_allowed = False
+
+        allowed[entry.name] = is_allowed
+        return is_allowed
+
+
+class BotHelpPageSource(menus.ListPageSource):
+    def __init__(self, help_command, cogs: typing.List[IndexedCog]):
+        super().__init__(entries=cogs, per_page=6)
         self.help_command = help_command
         self.prefix = config.BOT_PREFIX
 
-    def format_commands(self, cog, commands):
+    def format_commands(self, cog: IndexedCog):
         # A field can only have 1024 characters so we need to paginate a bit
         # just in case it doesn't fit perfectly
         # However, we have 6 per page so I'll try cutting it off at around 800 instead
         # Since there's a 6000 character limit overall in the embed
-        if cog.description:
-            short_doc = cog.description.split("\n", 1)[0] + "\n"
-        else:
-            short_doc = "No help found.\n"
-
+        short_doc = f"{cog.short_doc}\n"
         current_count = len(short_doc)
         ending_note = "+%d not shown"
         ending_length = len(ending_note)
 
         page = []
-        for command in commands:
-            value = f"`{self.prefix}{command.qualified_name}`"
+        for entry in cog.entries:
+            value = f"`{self.prefix}{entry.name}`"
             count = len(value) + 2  # The space
             if count + current_count < 800:
                 current_count += count
@@ -81,11 +186,11 @@ class BotHelpPageSource(menus.ListPageSource):
                 # Done paginating so just exit
                 break
 
-        if len(page) == len(commands):
+        if len(page) == len(cog.entries):
             # We're not hiding anything so just return it as-is
             return short_doc + "  ".join(page)
 
-        hidden = len(commands) - len(page)
+        hidden = len(cog.entries) - len(page)
         return short_doc + "  ".join(page) + "\n" + (ending_note % hidden)
 
     async def format_page(self, menu, cogs):
@@ -98,20 +203,11 @@ class BotHelpPageSource(menus.ListPageSource):
         embed = text.SafeEmbed(title="All Categories | Help", description=description)
 
         for cog in cogs:
-            if cog.hidden:
-                continue
-
-            commands = self.commands.get(cog)
-            if commands:
-                # value = self.format_commands(cog, commands)
-
-                if cog.description:
-                    short_doc = cog.description.split("\n", 1)[0] + "\n"
-                else:
-                    short_doc = "No help found.\n"
-
-                value = f"{short_doc}`{config.BOT_PREFIX}help {cog.qualified_name}`"
-                embed.add_field(name=cog.qualified_name, value=value, inline=True)
+            # value = self.format_commands(cog)
+            value = (
+                f"{cog.short_doc}\n`{config.BOT_PREFIX}help {cog.cog.qualified_name}`"
+            )
+            embed.add_field(name=cog.cog.qualified_name, value=value, inline=True)
 
         maximum = self.get_max_pages()
         embed.set_footer(text=f"Page {menu.current_page + 1}/{maximum}")
@@ -128,13 +224,9 @@ class GroupHelpPageSource(menus.ListPageSource):
 
     async def format_page(self, menu, commands):
         embed = text.SafeEmbed(title=self.title, description=self.description)
-        fmt_commands = []
-
-        for command in commands:
-            hlp = command.short_doc or "No help given."
-            fmt_commands.append(
-                f"__**{config.BOT_PREFIX}{command.qualified_name} {command.signature}**__\n{hlp}\n"
-            )
+        fmt_commands = [
+            f"__**{entry.signature}**__\n{entry.short_doc}\n" for entry in commands
+        ]
 
         if fmt_commands:
             embed.add_field(
@@ -166,27 +258,13 @@ class CogHelpPageSource(menus.ListPageSource):
     async def format_page(self, menu, commands):
         embed = text.SafeEmbed(title=self.title, description=self.description)
 
-        for command in commands:
-            try:
-                is_allowed = await command.can_run(menu.ctx)
-            except Exception:
-                is_allowed = False
-
-            if is_allowed:
-                signature = f"__{config.BOT_PREFIX}{command.qualified_name} {command.signature}__"
+        for entry in commands:
+            if await menu.bot.help_index.can_run(menu.ctx, entry):
+                signature = f"__{entry.signature}__"
             else:
-                default_sig = f"__*{config.BOT_PREFIX}{command.qualified_name} {command.signature}"
+                signature = f"__*{entry.signature}*__"
 
-                if default_sig.endswith(" "):
-                    default_sig = default_sig[:-1]
-
-                signature = f"{default_sig}*__"
-
-            embed.add_field(
-                name=signature,
-                value=command.short_doc or "No help given.",
-                inline=False,
-            )
+            embed.add_field(name=signature, value=entry.short_doc, inline=False)
 
         maximum = self.get_max_pages()
         if maximum > 1:
@@ -220,14 +298,12 @@ class HelpMenu(Pages, inherit_buttons=False):
         if view and self.is_bot_help:
             options = [
                 discord.SelectOption(
-                    label=cog.qualified_name,
-                    description=textwrap.shorten(
-                        cog.description, width=100, placeholder="..."
-                    ),
+                    label=cog.cog.qualified_name,
+                    description=cog.select_description,
                     value=name,
                 )
-                for name, cog in sorted(self.bot.cogs.items(), key=lambda x: x[0])
-                if not cog.hidden
+                for name, cog in self.bot.help_index.cogs.items()
+                if not cog.cog.hidden
             ]
             view.add_item(
                 HelpSelect(
@@ -386,29 +462,21 @@ class PaginatedHelpCommand(commands.HelpCommand):
         return f"{config.BOT_PREFIX}{alias} {command.signature}"
 
     async def send_bot_help(self, mapping):
-        bot = self.context.bot
-        entries = await self.filter_commands(
-            bot.commands, sort=True, key=lambda c: c.qualified_name
-        )
-
-        all_commands = {}
-        for command in entries:
-            if command.cog is None:
-                continue
-            try:
-                all_commands[command.cog].append(command)
-            except KeyError:
-                all_commands[command.cog] = [command]
+        cogs = [
+            cog
+            for cog in self.context.bot.help_index.cogs.values()
+            if not cog.cog.hidden and cog.has_top_level_commands
+        ]
 
-        menu = HelpMenu(BotHelpPageSource(self, all_commands), send_intro=False)
+        menu = HelpMenu(BotHelpPageSource(self, cogs), send_intro=False)
         await menu.start(self.context)
 
     async def send_cog_help(self, cog):
-        entries = await self.filter_commands(
-            cog.walk_commands(), sort=True, key=lambda c: c.qualified_name
-        )
+        indexed = self.context.bot.help_index.get(cog)
         menu = HelpMenu(
-            CogHelpPageSource(cog, entries, prefix=config.BOT_PREFIX),
+            CogHelpPageSource(
+                cog, indexed.entries if indexed else [], prefix=config.BOT_PREFIX
+            ),
             send_intro=False,
         )
         await menu.start(self.context)
@@ -496,11 +564,14 @@ class PaginatedHelpCommand(commands.HelpCommand):
         return await super().command_callback(ctx, command=command)
 
     async def _send_group_help(self, group):
-        subcommands = list(group.walk_commands())
-        if len(subcommands) == 0:
-            return await self.send_command_help(group)
+        indexed = self.context.bot.help_index.get(group.cog)
+        prefix = f"{group.qualified_name} "
+        entries = [
+            entry
+            for entry in (indexed.entries if indexed else [])
+            if entry.name.startswith(prefix)
+        ]
 
-        entries = await self.filter_commands(subcommands, sort=True)
         if len(entries) == 0:
             return await self.send_command_help(group)
 
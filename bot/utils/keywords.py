@@ -0,0 +1,117 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import multiprocessing
+import typing
+
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _extract_keywords(content: str) -> typing.List[str]:
+    # This runs in a worker process of KeywordExtractor's process pool
+    import yake
+
+    kw_extractor = yake.KeywordExtractor(lan="en", n=2, top=20)
+    keywords = kw_extractor.extract_keywords(content)
+    return [kw[0] for kw in keywords if kw[0]]
+
+
+class KeywordExtractor:
+    """Extracts keywords from bill content with YAKE in a small process pool, so that the extraction neither holds
+    the GIL of the event loop nor competes with it in the default thread pool.
+
+    Results are memoised by the hash of the content in the `bill_keyword_cache` table, so unchanged bills
+    never have their keywords extracted twice."""
+
+    def __init__(self, bot, *, max_workers: int = 2):
+        self.bot = bot
+        self._max_workers = max_workers
+        self._pool: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            # the bot is multithreaded by the time this is first needed, forking it could deadlock the workers
+            # on a lock held by another thread, and they would inherit all of its memory including discord.py's cache
+            method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+
+        return self._pool
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    async def extract(self, content: str) -> typing.List[str]:
+        result = await self.extract_many([content])
+        return result[0]
+
+    async def extract_many(
+        self, contents: typing.Sequence[str]
+    ) -> typing.List[typing.List[str]]:
+        """Extract the keywords of many documents at once. Cached documents are looked up with a single query,
+        the rest are spread over the process pool concurrently. Returns the keywords in the order of `contents`.
+        """
+
+        hashes = [
+            self.hash_content(content) if content else None for content in contents
+        ]
+        unique = {h: c for h, c in zip(hashes, contents) if h is not None}
+        results: typing.Dict[typing.Optional[str], typing.List[str]] = {None: []}
+
+        if unique:
+            cached = await self.bot.db.fetch(
+                "SELECT content_hash, keywords FROM bill_keyword_cache WHERE content_hash = ANY($1::text[])",
+                list(unique),
+            )
+            results.update({r["content_hash"]: list(r["keywords"]) for r in cached})
+
+        missing = {h: c for h, c in unique.items() if h not in results}
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            extracted = await asyncio.gather(
+                *[
+                    loop.run_in_executor(self.pool, _extract_keywords, content)
+                    for content in missing.values()
+                ],
+                return_exceptions=True,
+            )
+
+            to_cache = []
+
+            for content_hash, keywords in zip(missing, extracted):
+                if isinstance(keywords, BaseException):
+                    logging.error(f"Error while extracting keywords: {keywords!r}")
+
+                    if isinstance(keywords, BrokenProcessPool):
+                        # a worker died, start with a fresh pool next time
+                        self.close()
+
+                    keywords = []
+                else:
+                    to_cache.append((content_hash, keywords))
+
+                results[content_hash] = keywords
+
+            if to_cache:
+                await self.bot.db.executemany(
+                    "INSERT INTO bill_keyword_cache (content_hash, keywords) VALUES ($1, $2) "
+                    "ON CONFLICT DO NOTHING",
+                    to_cache,
+                )
+
+        return [list(results[h]) for h in hashes]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
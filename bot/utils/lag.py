@@ -0,0 +1,172 @@
+import asyncio
+import collections
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+import typing
+
+from bot.config import config
+from bot.utils import text
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a short sleep, which is exactly how long synchronous
+    work blocked the loop in the meantime.
+
+    A watchdog thread captures the stack of the loop's thread whenever the loop stalls for longer than
+    `slow_callback` seconds, so we know *what* blocked it. If the lag of the last window is over budget,
+    a summary with the captured stacks is posted to the technical notifications channel, together with
+    the lag reported by the internal API.
+    """
+
+    def __init__(
+        self,
+        bot,
+        *,
+        interval: float = 0.5,
+        budget: float = 0.25,
+        slow_callback: float = 0.1,
+        report_interval: float = 300,
+        window: int = 600,
+    ):
+        self.bot = bot
+        self.interval = interval
+        self.budget = budget
+        self.slow_callback = slow_callback
+        self.report_interval = report_interval
+        self._samples: typing.Deque[float] = collections.deque(maxlen=window)
+        self._stalls: typing.Deque[typing.Tuple[float, str]] = collections.deque(
+            maxlen=5
+        )
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: typing.Optional[int] = None
+        self._tasks: typing.List[asyncio.Task] = []
+        self._stopped = threading.Event()
+        self._watchdog: typing.Optional[threading.Thread] = None
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        loop.slow_callback_duration = self.slow_callback
+
+        if config.LOOP_LAG_ASYNCIO_DEBUG:
+            # asyncio's own slow callback logging only works in debug mode, which is too expensive to always run
+            loop.set_debug(True)
+
+        self._loop_thread_id = threading.get_ident()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        self._tasks = [
+            loop.create_task(self._sample()),
+            loop.create_task(self._report()),
+        ]
+
+    def close(self):
+        self._stopped.set()
+
+        for task in self._tasks:
+            task.cancel()
+
+    @staticmethod
+    def _percentile(samples: typing.List[float], percentile: int) -> float:
+        if len(samples) < 2:
+            return samples[0] if samples else 0.0
+
+        return statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+    def summary(self) -> typing.Dict[str, float]:
+        samples = list(self._samples)
+        return {
+            "samples": len(samples),
+            "p50_ms": round(self._percentile(samples, 50) * 1000, 2),
+            "p99_ms": round(self._percentile(samples, 99) * 1000, 2),
+            "max_ms": round(max(samples, default=0) * 1000, 2),
+        }
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._samples.append(lag)
+            self.bot.metrics.observe("loop:lag", lag)
+
+    def _watch(self):
+        # runs in its own thread, so it keeps running while the loop is blocked
+        reported_heartbeat = None
+
+        while not self._stopped.wait(self.slow_callback / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+
+            if blocked_for < self.slow_callback or heartbeat == reported_heartbeat:
+                continue
+
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+
+            if frame is None:
+                continue
+
+            stack = "".join(traceback.format_stack(frame, limit=8))
+            self._stalls.append((time.time(), stack))
+            self.bot.metrics.increment("loop_stalls")
+            logging.warning(
+                f"Event loop blocked for more than {blocked_for * 1000:.0f}ms in:\n{stack}"
+            )
+
+    async def _report(self):
+        await self.bot.wait_until_ready()
+
+        while True:
+            await asyncio.sleep(self.report_interval)
+
+            try:
+                own = self.summary()
+                api = await self.bot.api_request("GET", "lag", silent=True)
+                over_budget = [
+                    (name, summary)
+                    for name, summary in (("Bot", own), ("API", api))
+                    if summary and summary["p99_ms"] > self.budget * 1000
+                ]
+
+                if over_budget:
+                    await self._post(over_budget)
+            except Exception as e:
+                logging.error(f"Error while reporting event loop lag: {e!r}")
+
+            self._stalls.clear()
+
+    async def _post(self, over_budget):
+        channel = self.bot.get_channel(config.BOT_TECHNICAL_NOTIFICATIONS_CHANNEL)
+
+        if not channel:
+            return
+
+        embed = text.SafeEmbed(
+            title=f":snail:  Event loop lag over budget ({self.budget * 1000:.0f}ms)"
+        )
+
+        for name, summary in over_budget:
+            embed.add_field(
+                name=name,
+                value=f"p50 {summary['p50_ms']}ms, p99 {summary['p99_ms']}ms, "
+                f"max {summary['max_ms']}ms ({summary['samples']} samples)",
+                inline=False,
+            )
+
+        for when, stack in list(self._stalls)[-2:]:
+            embed.add_field(
+                name="Blocked in",
+                value=f"<t:{int(when)}:T>\n```py\n{stack[-950:]}```",
+                inline=False,
+            )
+
+        await channel.send(embed=embed)
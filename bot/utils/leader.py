@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+import typing
+
+# first key of the two-key advisory locks, the second one is the hash of the election's name
+NAMESPACE = 4_912_072
+
+
+class LeaderElection:
+    """Elects one leader among all bot processes that share the database, i.e. the bot and a hot standby.
+
+    The leader holds a session-level advisory lock on a connection it keeps checked out of the pool. If the
+    leader dies, Postgres releases the lock together with its connection, and the first follower to retry
+    (every `interval` seconds) takes over. Periodic jobs that must only run once check `is_leader` before
+    they do anything. On election, `on_leader_elected` is dispatched so that cogs can catch up on jobs that
+    were skipped while this process was a follower.
+    """
+
+    def __init__(self, bot, name: str = "bot", *, interval: float = 5.0):
+        self.bot = bot
+        self.name = name
+        self.interval = interval
+        self.elected_at: typing.Optional[float] = None
+        self._elected = asyncio.Event()
+        self._connection = None
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._elected.is_set()
+
+    async def wait_until_leader(self):
+        await self._elected.wait()
+
+    async def start(self):
+        # the first attempt is awaited, so that jobs right after startup already know who they are
+        await self._campaign()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._campaign()
+
+    async def _campaign(self):
+        try:
+            if self._connection is None:
+                self._connection = await self.bot.db.acquire()
+
+            if self.is_leader:
+                # the lock is only ours as long as this connection is alive
+                await self._connection.fetchval("SELECT 1")
+                return
+
+            if await self._connection.fetchval(
+                "SELECT pg_try_advisory_lock($1, hashtext($2))", NAMESPACE, self.name
+            ):
+                self.elected_at = time.time()
+                self._elected.set()
+                logging.info(f"This process is now the leader of '{self.name}'")
+                self.bot.dispatch("leader_elected")
+        except Exception as e:
+            logging.warning(f"Lost connection of leader election '{self.name}': {e!r}")
+            await self._step_down()
+
+    async def _step_down(self):
+        if self.is_leader:
+            logging.warning(f"This process is no longer the leader of '{self.name}'")
+
+        self._elected.clear()
+        self.elected_at = None
+        connection, self._connection = self._connection, None
+
+        if connection is None:
+            return
+
+        try:
+            # the pool resets the connection on release, which unlocks all advisory locks
+            await self.bot.db.release(connection, timeout=self.interval)
+        except Exception:
+            connection.terminate()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+        await self._step_down()
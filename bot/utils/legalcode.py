@@ -0,0 +1,259 @@
+import asyncio
+import collections
+import datetime
+import hashlib
+import html
+import json
+import logging
+import re
+import time
+import typing
+
+import discord
+
+from bot.utils import models
+
+LEGAL_CODE_DOC_URL = "https://docs.google.com/document/d/1ywV_F70odxHh5fLcqcghpFOToPao85CjfT5Y_mYcml0/edit?usp=sharing"
+LEGAL_CODE_SCRIPT_ID = "MMV-pGVACMhaf_DjTn8jfEGqnXKElby-M"
+
+_markdown_link_text = re.compile(r"([\\\[\]])")
+_markdown_link_url = {"(": "%28", ")": "%29", " ": "%20"}
+
+
+class LegalCodeGenerator:
+    """Generates the Google Docs Legal Code through Apps Script, but only if the set of active laws changed
+    since the last run. Concurrent calls wait for the run that is already in progress instead of starting their own.
+
+    Attributes
+    ----------
+
+     last_hash: Optional[str]
+        The hash of the ordered (id, name, link) law set the Legal Code was last generated from
+
+     last_duration: Optional[float]
+        How long the last generation took, in seconds
+
+     last_generated_at: Optional[datetime.datetime]
+        When the Legal Code was last generated
+
+     last_result: Optional[dict]
+        The Apps Script response of the last generation
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._lock = asyncio.Lock()
+        self.last_hash: typing.Optional[str] = None
+        self.last_duration: typing.Optional[float] = None
+        self.last_generated_at: typing.Optional[datetime.datetime] = None
+        self.last_result: typing.Optional[typing.Dict] = None
+        self.skipped = 0
+
+    @staticmethod
+    def hash_laws(laws: typing.Iterable[typing.Dict]) -> str:
+        digest = hashlib.sha256()
+
+        for law in laws:
+            digest.update(f"{law['id']}\x1f{law['name']}\x1f{law['link']}\x1e".encode())
+
+        return digest.hexdigest()
+
+    async def fetch_laws(self) -> typing.List[typing.Dict]:
+        records = await self.bot.db.fetch(
+            "SELECT id, name, link FROM bill WHERE status = $1 ORDER BY id;",
+            models.BillIsLaw.flag.value,
+        )
+        return [dict(r) for r in records]
+
+    async def generate(self, *, force: bool = False) -> typing.Optional[typing.Dict]:
+        """Regenerate the Legal Code if the active laws changed since the last run, or if `force` is True.
+
+        Returns the Apps Script response of the run that produced the current Legal Code.
+        """
+
+        async with self._lock:
+            # Callers that queued up behind a run re-check the hash here and return early, which
+            # coalesces bursts of scheduler flushes into a single Apps Script execution.
+            laws = await self.fetch_laws()
+            law_hash = self.hash_laws(laws)
+
+            if not force and law_hash == self.last_hash:
+                self.skipped += 1
+                logging.info("Legal Code is up-to-date, skipping regeneration.")
+                return self.last_result
+
+            date = discord.utils.utcnow().strftime("%B %d, %Y at %H:%M")
+            started = time.perf_counter()
+
+            result = await self.bot.run_apps_script(
+                script_id=LEGAL_CODE_SCRIPT_ID,
+                function="generate_legal_code",
+                parameters=[
+                    LEGAL_CODE_DOC_URL,
+                    {"name": self.bot.mk.NATION_FULL_NAME, "date": date},
+                    laws,
+                ],
+            )
+
+            self.last_duration = time.perf_counter() - started
+            self.last_generated_at = discord.utils.utcnow()
+            self.last_hash = law_hash
+            self.last_result = result
+
+            logging.info(
+                f"Generated Legal Code with {len(laws)} laws in {self.last_duration:.2f}s."
+            )
+            return result
+
+
+RenderedLaw = collections.namedtuple("RenderedLaw", "hash html markdown entry")
+
+
+class LegalCodeRenderer:
+    """Renders the Legal Code locally from the `bill` table into HTML, Markdown and a compact JSON feed, and
+    stores them in the `legal_code_snapshot` table from where the API serves them.
+
+    Every law is rendered into a fragment that is cached by the hash of its name, link and content, so only
+    laws that changed since the last run are rendered again. Snapshots are only written if any law changed.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._lock = asyncio.Lock()
+        self._fragments: typing.Dict[int, RenderedLaw] = {}
+        self.last_hash: typing.Optional[str] = None
+        self.last_duration: typing.Optional[float] = None
+
+    @staticmethod
+    def hash_law(law: typing.Mapping) -> str:
+        return hashlib.sha256(
+            f"{law['name']}\x1f{law['link']}\x1f{law['content']}".encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _render_html(law: typing.Mapping) -> str:
+        paragraphs = "\n".join(
+            f"<p>{html.escape(line)}</p>"
+            for line in law["content"].splitlines()
+            if line.strip()
+        )
+
+        return (
+            f'<article id="law-{law["id"]}">\n'
+            f'<h2><a href="{html.escape(law["link"], quote=True)}">Law #{law["id"]} - {html.escape(law["name"])}</a></h2>\n'
+            f"{paragraphs}\n</article>"
+        )
+
+    @staticmethod
+    def _render_markdown(law: typing.Mapping) -> str:
+        # a bracket in the name or a parenthesis in the link would end the link early
+        name = _markdown_link_text.sub(r"\\\1", law["name"])
+        link = "".join(_markdown_link_url.get(char, char) for char in law["link"])
+        return f"## [Law #{law['id']} - {name}]({link})\n\n{law['content'].strip()}\n"
+
+    def _render_law(self, law: typing.Mapping, law_hash: str) -> RenderedLaw:
+        return RenderedLaw(
+            hash=law_hash,
+            html=self._render_html(law),
+            markdown=self._render_markdown(law),
+            entry={"id": law["id"], "name": law["name"], "link": law["link"]},
+        )
+
+    def _assemble(
+        self, laws: typing.List[RenderedLaw], date: str
+    ) -> typing.Dict[str, str]:
+        nation = self.bot.mk.NATION_FULL_NAME
+        title = f"Legal Code of {nation}"
+
+        toc = "\n".join(
+            f'<li><a href="#law-{law.entry["id"]}">Law #{law.entry["id"]} - {html.escape(law.entry["name"])}</a></li>'
+            for law in laws
+        )
+        body = "\n".join(law.html for law in laws)
+
+        as_html = (
+            f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{html.escape(title)}</title>\n</head>\n<body>\n"
+            f"<h1>{html.escape(title)}</h1>\n<p><em>Last updated on {date} (UTC)</em></p>\n"
+            f"<ol>\n{toc}\n</ol>\n{body}\n</body>\n</html>\n"
+        )
+
+        as_markdown = "\n".join(
+            [f"# {title}\n\n*Last updated on {date} (UTC)*\n"]
+            + [law.markdown for law in laws]
+        )
+
+        as_json = json.dumps(
+            {"name": nation, "date": date, "laws": [law.entry for law in laws]},
+            separators=(",", ":"),
+        )
+
+        return {"html": as_html, "markdown": as_markdown, "json": as_json}
+
+    async def render(self, *, force: bool = False) -> bool:
+        """Render and store the Legal Code snapshots. Returns whether new snapshots were written."""
+
+        async with self._lock:
+            started = time.perf_counter()
+            records = await self.bot.db.fetch(
+                "SELECT id, name, link, content FROM bill WHERE status = $1 ORDER BY id;",
+                models.BillIsLaw.flag.value,
+            )
+
+            fragments = {}
+            rendered = 0
+
+            for record in records:
+                law_hash = self.hash_law(record)
+                cached = self._fragments.get(record["id"])
+
+                if cached is None or cached.hash != law_hash:
+                    cached = self._render_law(record, law_hash)
+                    rendered += 1
+
+                fragments[record["id"]] = cached
+
+            # drops fragments of laws that were repealed since the last run
+            self._fragments = fragments
+
+            code_hash = hashlib.sha256(
+                "".join(
+                    f"{law_id}:{law.hash}" for law_id, law in fragments.items()
+                ).encode()
+            ).hexdigest()
+
+            if not force and code_hash == self.last_hash:
+                return False
+
+            now = discord.utils.utcnow()
+            snapshots = self._assemble(
+                list(fragments.values()), now.strftime("%B %d, %Y at %H:%M")
+            )
+
+            await self.bot.db.executemany(
+                "INSERT INTO legal_code_snapshot (format, content, law_hash, generated_at) "
+                "VALUES ($1, $2, $3, $4) ON CONFLICT (format) DO UPDATE SET content = $2, "
+                "law_hash = $3, generated_at = $4",
+                [
+                    (fmt, content, code_hash, now.replace(tzinfo=None))
+                    for fmt, content in snapshots.items()
+                ],
+            )
+
+            self.last_hash = code_hash
+            self.last_duration = time.perf_counter() - started
+            logging.info(
+                f"Rendered local Legal Code ({rendered}/{len(fragments)} laws re-rendered) "
+                f"in {self.last_duration * 1000:.1f}ms."
+            )
+            return True
+
+    async def refresh(self) -> bool:
+        """Like `render()`, but errors are logged instead of raised. The snapshots are only a cache of the `bill`
+        table, so a failed render must not abort whatever changed the laws."""
+
+        try:
+            return await self.render()
+        except Exception as e:
+            logging.error(f"Error while rendering the local Legal Code: {e!r}")
+            return False
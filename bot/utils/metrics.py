@@ -0,0 +1,197 @@
+import bisect
+import collections
+import contextlib
+import functools
+import logging
+import re
+import time
+import typing
+
+import aiohttp
+from aiohttp import web
+
+# upper bounds of the latency buckets, in milliseconds
+BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+_snowflake = re.compile(r"\d{15,}")
+_whitespace = re.compile(r"\s+")
+
+
+class Histogram:
+    """Counts observed latencies in fixed buckets, so that percentiles can be estimated without
+    keeping every single observation around."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, milliseconds: float):
+        self.buckets[bisect.bisect_left(BUCKETS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Upper bound of the bucket that contains the given percentile (0-100)."""
+
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percentile / 100
+        seen = 0
+
+        for bound, amount in zip(BUCKETS, self.buckets):
+            seen += amount
+
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 2),
+            "mean_ms": round(self.mean, 2),
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 2),
+            "buckets": {
+                str(bound): amount for bound, amount in zip(BUCKETS, self.buckets)
+            },
+        }
+
+
+class Metrics:
+    """Bot-wide counters and latency histograms.
+
+    Names are grouped by a `kind` prefix (`command`, `listener`, `db`, `http`, `discord`), `top` returns the
+    worst offenders of a kind by their total time spent.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.counters: typing.DefaultDict[str, int] = collections.defaultdict(int)
+        self.histograms: typing.DefaultDict[str, Histogram] = collections.defaultdict(
+            Histogram
+        )
+
+    def increment(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def observe(self, name: str, seconds: float):
+        self.histograms[name].observe(seconds * 1000)
+
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def top(
+        self, kind: str, *, limit: int = 5
+    ) -> typing.List[typing.Tuple[str, Histogram]]:
+        prefix = f"{kind}:"
+        matches = [
+            (name[len(prefix) :], histogram)
+            for name, histogram in self.histograms.items()
+            if name.startswith(prefix)
+        ]
+        return sorted(matches, key=lambda x: x[1].total, reverse=True)[:limit]
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at),
+            "counters": dict(self.counters),
+            "histograms": {
+                name: histogram.to_dict() for name, histogram in self.histograms.items()
+            },
+        }
+
+    # -- instrumentation hooks --
+
+    def wrap_listener(self, name: str, listener: typing.Callable) -> typing.Callable:
+        @functools.wraps(listener)
+        async def wrapped(*args, **kwargs):
+            start = time.perf_counter()
+
+            try:
+                return await listener(*args, **kwargs)
+            except Exception:
+                self.increment(f"listener_errors:{name}")
+                raise
+            finally:
+                self.observe(f"listener:{name}", time.perf_counter() - start)
+
+        return wrapped
+
+    def log_query(self, record):
+        # asyncpg query logger, called with a LoggedQuery after every query of a pool connection
+        query = _whitespace.sub(" ", record.query).strip()
+
+        if len(query) > 120:
+            query = f"{query[:117]}..."
+
+        self.observe(f"db:{query}", record.elapsed)
+
+        if record.exception is not None:
+            self.increment("db_errors")
+
+    def trace_config(self, kind: str) -> aiohttp.TraceConfig:
+        """Times every request made with an aiohttp session, grouped by method, host and path (with ids removed)."""
+
+        async def on_request_start(session, trace_ctx, params):
+            trace_ctx.start = time.perf_counter()
+
+        async def on_request_end(session, trace_ctx, params):
+            url = params.url
+            path = _snowflake.sub(":id", url.path)
+            name = f"{kind}:{params.method} {url.host}{path}"
+            self.observe(name, time.perf_counter() - trace_ctx.start)
+            self.increment(f"{kind}_status:{params.response.status}")
+
+        async def on_request_exception(session, trace_ctx, params):
+            self.increment(f"{kind}_errors")
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+
+class MetricsServer:
+    """Serves the bot's metrics as JSON on `GET /metrics` on localhost, like the BankListener does for DMs."""
+
+    def __init__(self, bot, *, port: int):
+        self.bot = bot
+        self.port = port
+        self.app = web.Application()
+        self.app.add_routes([web.get("/metrics", self.metrics)])
+        self.runner = web.AppRunner(self.app)
+
+    async def setup(self):
+        try:
+            await self.runner.setup()
+            site = web.TCPSite(self.runner, "127.0.0.1", self.port)
+            await site.start()
+        except OSError as e:
+            logging.error(f"Could not start metrics server on port {self.port}: {e!r}")
+
+    async def shutdown(self):
+        if self.runner.server is not None:
+            await self.runner.cleanup()
+
+    async def metrics(self, request):
+        return web.json_response(self.bot.metrics.to_dict())
@@ -0,0 +1,162 @@
+import hashlib
+import importlib.util
+import logging
+import pathlib
+import re
+import time
+import typing
+
+import asyncpg
+
+MIGRATIONS_PATH = pathlib.Path(__file__).parent.parent / "db" / "migrations"
+
+# the bot and the API share one database and both migrate it on startup
+LOCK_ID = 4_912_071
+
+_filename = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    name: str
+    path: pathlib.Path
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    async def apply(self, connection: asyncpg.Connection):
+        if self.path.suffix == ".sql":
+            await connection.execute(self.path.read_text())
+            return
+
+        # Python migrations are for data that can't be moved with SQL alone, they define `async def upgrade(connection)`
+        spec = importlib.util.spec_from_file_location(
+            f"migration_{self.version}", self.path
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        await module.upgrade(connection)
+
+
+def discover(path: pathlib.Path = MIGRATIONS_PATH) -> typing.List[Migration]:
+    migrations = []
+
+    for file in path.iterdir():
+        match = _filename.match(file.name)
+
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), file))
+
+    migrations.sort()
+
+    for before, after in zip(migrations, migrations[1:]):
+        if before.version == after.version:
+            raise RuntimeError(
+                f"Migrations {before.path.name} and {after.path.name} have the same version."
+            )
+
+    return migrations
+
+
+class MigrationRunner:
+    """Brings the database schema up to date with the numbered migrations in `bot/db/migrations`.
+
+    Applied migrations are recorded in the `schema_version` table. If the database is already at the
+    latest version, startup costs a single query and no DDL is executed at all, so restarts don't
+    take locks on busy tables anymore. Pending migrations are applied in order, in one transaction,
+    while holding an advisory lock so that the bot and the API never migrate at the same time.
+    """
+
+    def __init__(
+        self, db, *, component: str = "bot", path: pathlib.Path = MIGRATIONS_PATH
+    ):
+        self.db = db
+        self.component = component
+        self.migrations = discover(path)
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def current_version(self, connection: asyncpg.Connection) -> int:
+        if not await connection.fetchval(
+            "SELECT to_regclass('schema_version') IS NOT NULL"
+        ):
+            return 0
+
+        return await connection.fetchval(
+            "SELECT coalesce(max(version), 0) FROM schema_version WHERE component = $1",
+            self.component,
+        )
+
+    async def upgrade(self) -> typing.List[Migration]:
+        """Apply all pending migrations and return them."""
+
+        start = time.perf_counter()
+
+        async with self.db.acquire() as connection:
+            current = await self.current_version(connection)
+
+            if current >= self.latest_version:
+                logging.info(
+                    f"Database schema of {self.component} is up to date at version {current}, "
+                    f"checked in {(time.perf_counter() - start) * 1000:.1f}ms"
+                )
+                return []
+
+            async with connection.transaction():
+                await connection.execute("SELECT pg_advisory_xact_lock($1)", LOCK_ID)
+                await connection.execute(
+                    "CREATE TABLE IF NOT EXISTS schema_version("
+                    "component text NOT NULL, "
+                    "version int NOT NULL, "
+                    "name text NOT NULL, "
+                    "checksum text NOT NULL, "
+                    "duration_ms real NOT NULL, "
+                    "applied_at timestamp WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc') NOT NULL, "
+                    "PRIMARY KEY (component, version))"
+                )
+
+                # someone else might have migrated while we were waiting for the lock
+                applied = {
+                    record["version"]: record["checksum"]
+                    for record in await connection.fetch(
+                        "SELECT version, checksum FROM schema_version WHERE component = $1",
+                        self.component,
+                    )
+                }
+                pending = []
+
+                for migration in self.migrations:
+                    if migration.version in applied:
+                        if applied[migration.version] != migration.checksum:
+                            logging.warning(
+                                f"Migration {migration.path.name} was changed after it was applied."
+                            )
+
+                        continue
+
+                    migration_start = time.perf_counter()
+                    await migration.apply(connection)
+                    duration = (time.perf_counter() - migration_start) * 1000
+
+                    await connection.execute(
+                        "INSERT INTO schema_version (component, version, name, checksum, duration_ms) "
+                        "VALUES ($1, $2, $3, $4, $5)",
+                        self.component,
+                        migration.version,
+                        migration.name,
+                        migration.checksum,
+                        duration,
+                    )
+                    pending.append(migration)
+                    logging.info(
+                        f"Applied migration {migration.path.name} in {duration:.1f}ms"
+                    )
+
+        logging.info(
+            f"Database schema of {self.component} migrated from version {current} to {self.latest_version} "
+            f"with {len(pending)} migration(s) in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return pending
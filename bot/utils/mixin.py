@@ -3,7 +3,7 @@ import typing
 import discord
 
 from bot.config import mk, config
-from bot.utils import exceptions, context, models, paginator, text, converter
+from bot.utils import exceptions, context, models, paginator, text, converter, dms
 
 
 def _make_property(role: mk.DemocracivRole):
@@ -50,25 +50,35 @@ class GovernmentMixin:
         except (IndexError, exceptions.RoleNotFoundError):
             return None
 
+    def _model_pages(
+        self, ctx, *, model, query: str, args=(), empty_message: str, **kwargs
+    ) -> paginator.SimplePages:
+        """Lazily paginate the bills, laws or motions whose ids are returned by `query`."""
+
+        async def formatter(records):
+            objs = await model.convert_many(ctx, [record["id"] for record in records])
+            return [f"* {obj.formatted}" for obj in objs]
+
+        source = paginator.KeysetPageSource(
+            self.bot.db,
+            query=query,
+            args=args,
+            formatter=formatter,
+            per_page=12 if model is models.Motion else 8,
+            empty_message=empty_message,
+        )
+        return paginator.SimplePages(source=source, **kwargs)
+
     async def _paginate_all_(self, ctx, *, model):
-        per_page = None
+        args = ()
 
         if model is models.Bill:
-            all_objects = await self.bot.db.fetch("SELECT id FROM bill ORDER BY id;")
+            query = "SELECT id FROM bill"
         elif model is models.Law:
-            all_objects = await self.bot.db.fetch(
-                "SELECT id FROM bill WHERE status = $1 ORDER BY id;",
-                models.BillIsLaw.flag.value,
-            )
+            query = "SELECT id FROM bill WHERE status = $1"
+            args = (models.BillIsLaw.flag.value,)
         elif model is models.Motion:
-            per_page = 12
-            all_objects = await self.bot.db.fetch("SELECT id FROM motion ORDER BY id;")
-
-        formatted = []
-
-        for record in all_objects:
-            obj = await model.convert(ctx, record["id"])
-            formatted.append(f"* {obj.formatted}")
+            query = "SELECT id FROM motion"
 
         if model is models.Law:
             title = f"All Laws in {self.bot.mk.NATION_NAME}"
@@ -77,12 +87,14 @@ class GovernmentMixin:
             title = f"All Submitted {model.__name__}s — Senate & Commons"
             empty_message = f"No one has submitted any {model.__name__.lower()}s yet."
 
-        pages = paginator.SimplePages(
-            entries=formatted,
+        pages = self._model_pages(
+            ctx,
+            model=model,
+            query=query,
+            args=args,
             icon=self.bot.mk.NATION_ICON_URL,
             author=title,
             empty_message=empty_message,
-            per_page=per_page,
         )
         await ctx.send(
             f"-# {config.HINT} Check out [laws.democraciv.com](<https://laws.democraciv.com>) as well!"
@@ -206,30 +218,8 @@ class GovernmentMixin:
         )
         await pages.start(ctx)
 
-    async def generate_google_docs_legal_code(self):
-        doc_url = "https://docs.google.com/document/d/1ywV_F70odxHh5fLcqcghpFOToPao85CjfT5Y_mYcml0/edit?usp=sharing"
-
-        if not doc_url:
-            return
-
-        all_laws = await self.bot.db.fetch(
-            "SELECT id, name, link FROM bill WHERE status = $1 ORDER BY id;",
-            models.BillIsLaw.flag.value,
-        )
-        ugly_laws = [dict(r) for r in all_laws]
-        date = discord.utils.utcnow().strftime("%B %d, %Y at %H:%M")
-
-        result = await self.bot.run_apps_script(
-            script_id="MMV-pGVACMhaf_DjTn8jfEGqnXKElby-M",
-            function="generate_legal_code",
-            parameters=[
-                doc_url,
-                {"name": self.bot.mk.NATION_FULL_NAME, "date": date},
-                ugly_laws,
-            ],
-        )
-
-        return result
+    async def generate_google_docs_legal_code(self, *, force=False):
+        return await self.bot.legal_code.generate(force=force)
 
     async def _search_model(self, ctx, *, model, query: str, return_model=False):
         if len(query) < 3:
@@ -369,7 +359,6 @@ class GovernmentMixin:
     async def _from_person_model(self, ctx, *, member_or_party, model, paginate=True):
         member = member_or_party or ctx.author
         submit_term = "written" if model is models.Law else "submitted"
-        per_page = None
 
         if isinstance(member, converter.PoliticalParty):
             name = member.role.name
@@ -387,38 +376,27 @@ class GovernmentMixin:
             icon = member.display_avatar.url
 
         if model is models.Bill:
-            objs_from_thing = await self.bot.db.fetch(
-                "SELECT id FROM bill WHERE submitter = ANY($1::bigint[]) ORDER BY id;",
-                members,
-            )
-
+            query = "SELECT id FROM bill WHERE submitter = ANY($1::bigint[])"
+            args = (members,)
         elif model is models.Law:
-            objs_from_thing = await self.bot.db.fetch(
-                "SELECT id FROM bill WHERE submitter = ANY($1::bigint[]) AND status = $2 ORDER BY id;",
-                members,
-                models.BillIsLaw.flag.value,
-            )
+            query = "SELECT id FROM bill WHERE submitter = ANY($1::bigint[]) AND status = $2"
+            args = (members, models.BillIsLaw.flag.value)
         else:
-            objs_from_thing = await self.bot.db.fetch(
-                "SELECT id FROM motion WHERE submitter = ANY($1::bigint[]) ORDER BY id;",
-                members,
-            )
-            per_page = 12
-
-        formatted = []
-
-        for record in objs_from_thing:
-            obj = await model.convert(ctx, record["id"])
-            formatted.append(f"* {obj.formatted}")
+            query = "SELECT id FROM motion WHERE submitter = ANY($1::bigint[])"
+            args = (members,)
 
         if not paginate:
-            return formatted
-
-        pages = paginator.SimplePages(
-            entries=formatted,
+            ids = await self.bot.db.fetch(f"{query} ORDER BY id", *args)
+            objs = await model.convert_many(ctx, [record["id"] for record in ids])
+            return [f"* {obj.formatted}" for obj in objs]
+
+        pages = self._model_pages(
+            ctx,
+            model=model,
+            query=query,
+            args=args,
             author=title,
             icon=icon,
-            per_page=per_page,
             empty_message=empty,
         )
         await pages.start(ctx)
@@ -637,14 +615,15 @@ class GovernmentMixin:
         except exceptions.RoleNotFoundError:
             return None
 
-    async def dm_legislators(self, *, message: str, reason: str):
+    async def dm_legislators(
+        self, *, message: str, reason: str
+    ) -> typing.Optional[dms.DMReport]:
         if not self.legislator_role:
             return
 
-        for legislator in self.legislator_role.members:
-            await self.bot.safe_send_dm(
-                target=legislator, reason=reason, message=message
-            )
+        return await self.bot.dm_dispatcher.send(
+            self.legislator_role.members, reason=reason, message=message
+        )
 
     def is_cabinet(self, member: discord.Member) -> bool:
         return (
@@ -1,9 +1,10 @@
+import collections
 import datetime
 import enum
+import logging
 import re
 import textwrap
 import typing
-import yake
 import discord
 
 from collections import namedtuple
@@ -272,6 +273,8 @@ class Bill(commands.Converter, FuzzyableMixin):
             )
         )
 
+        await self._bot.legal_code_renderer.refresh()
+
     @property
     def sponsors(self) -> typing.List[typing.Union[discord.Member, discord.User]]:
         return list(
@@ -284,13 +287,18 @@ class Bill(commands.Converter, FuzzyableMixin):
             )
         )
 
-    def extract_keywords(self, content):
-        kw_extractor = yake.KeywordExtractor(lan="en", n=2, top=20)
-        keywords = kw_extractor.extract_keywords(content)
-        return [kw[0] for kw in keywords if kw[0]]
+    @staticmethod
+    def make_lookup_tags(name: str, keywords: typing.Iterable[str]) -> typing.List[str]:
+        keywords = list(keywords)
+        name_abbreviation = "".join([c[0].lower() for c in name.split()])
 
-    async def fetch_name_and_keywords(self) -> typing.Tuple[str, typing.List[str], str]:
+        if name.lower().startswith("the"):
+            keywords.append(name_abbreviation[1:])
+
+        keywords.append(name_abbreviation)
+        return list(set(keywords))
 
+    async def fetch_name_and_content(self) -> typing.Tuple[str, str]:
         try:
             response: typing.Dict = await self._bot.run_apps_script(
                 script_id="MtyscpHHIi0Ck1h8XfuBIn2qnXKElby-M",
@@ -300,22 +308,17 @@ class Bill(commands.Converter, FuzzyableMixin):
 
             self.name = name = response["response"]["result"]["title"]
             self.content = content = response["response"]["result"]["content"]
-            keywords = await self._bot.loop.run_in_executor(
-                None, self.extract_keywords, content
-            )
 
         except (DemocracivBotException, KeyError):
-            keywords = []
             self.name = name = ""
             self.content = content = ""
 
-        name_abbreviation = "".join([c[0].lower() for c in self.name.split()])
-
-        if self.name.lower().startswith("the"):
-            keywords.append(name_abbreviation[1:])
+        return name, content
 
-        keywords.append(name_abbreviation)
-        return name, list(set(keywords)), content
+    async def fetch_name_and_keywords(self) -> typing.Tuple[str, typing.List[str], str]:
+        name, content = await self.fetch_name_and_content()
+        keywords = await self._bot.keyword_extractor.extract(content)
+        return name, self.make_lookup_tags(name, keywords), content
 
     @property
     def submitter(self) -> typing.Union[discord.Member, discord.User, None]:
@@ -372,14 +375,63 @@ class Bill(commands.Converter, FuzzyableMixin):
         )
         sponsors = [record["sponsor"] for record in sponsors]
 
+        history_record = await ctx.bot.db.fetch(
+            "SELECT * FROM bill_history WHERE bill_id = $1 ORDER BY date DESC",
+            bill["id"],
+        )
+
+        return cls._from_records(ctx, bill, session, sponsors, history_record)
+
+    @classmethod
+    async def convert_many(cls, ctx, ids: typing.Iterable[int]) -> typing.List["Bill"]:
+        """Load many bills at once with one query per table instead of one per bill and table.
+        Returns the bills in the order of `ids`, ids of bills that don't exist (anymore) are skipped.
+        """
+
+        ids = list(ids)
+        bills = await ctx.bot.db.fetch(
+            "SELECT * FROM bill WHERE id = ANY($1::int[])", ids
+        )
+
+        sponsors = collections.defaultdict(list)
+        histories = collections.defaultdict(list)
+        sessions = {}
+
+        for record in await ctx.bot.db.fetch(
+            "SELECT bill_id, sponsor FROM bill_sponsor WHERE bill_id = ANY($1::int[])",
+            ids,
+        ):
+            sponsors[record["bill_id"]].append(record["sponsor"])
+
+        for record in await ctx.bot.db.fetch(
+            "SELECT * FROM bill_history WHERE bill_id = ANY($1::int[]) ORDER BY date DESC",
+            ids,
+        ):
+            histories[record["bill_id"]].append(record)
+
+        for session_id in {bill["leg_session"] for bill in bills}:
+            sessions[session_id] = await Session.convert(ctx, session_id)
+
+        by_id = {
+            bill["id"]: cls._from_records(
+                ctx,
+                bill,
+                sessions[bill["leg_session"]],
+                sponsors[bill["id"]],
+                histories[bill["id"]],
+            )
+            for bill in bills
+        }
+
+        return [by_id[bill_id] for bill_id in ids if bill_id in by_id]
+
+    @classmethod
+    def _from_records(cls, ctx, bill, session, sponsors, history_record):
         obj = cls(**bill, session=session, bot=ctx.bot, sponsors=sponsors)
 
         status = BillStatus.from_flag_value(bill["status"])(ctx.bot, obj)
         obj.status = status
 
-        history_record = await ctx.bot.db.fetch(
-            "SELECT * FROM bill_history WHERE bill_id = $1 ORDER BY date DESC", obj.id
-        )
         history = []
 
         for record in history_record:
@@ -534,12 +586,7 @@ class Motion(commands.Converter, FuzzyableMixin):
 
     async def withdraw(self):
         await self._bot.db.execute("DELETE FROM motion WHERE id = $1", self.id)
-        await self._bot.api_request(
-            "POST",
-            "document/delete",
-            silent=True,
-            json={"id": self.id, "type": "motion"},
-        )
+        self._bot.search_index.delete("motion", self.id)
 
     async def get_fuzzy_source(
         self, ctx: context.CustomContext, argument: str
@@ -584,6 +631,131 @@ class Motion(commands.Converter, FuzzyableMixin):
         session = await Session.convert(ctx, motion["leg_session"])
         return cls(**motion, session=session, bot=ctx.bot, sponsors=sponsors)
 
+    @classmethod
+    async def convert_many(
+        cls, ctx, ids: typing.Iterable[int]
+    ) -> typing.List["Motion"]:
+        """Load many motions at once, see `Bill.convert_many`."""
+
+        ids = list(ids)
+        motions = await ctx.bot.db.fetch(
+            "SELECT * FROM motion WHERE id = ANY($1::int[])", ids
+        )
+
+        sponsors = collections.defaultdict(list)
+        sessions = {}
+
+        for record in await ctx.bot.db.fetch(
+            "SELECT motion_id, sponsor FROM motion_sponsor WHERE motion_id = ANY($1::int[])",
+            ids,
+        ):
+            sponsors[record["motion_id"]].append(record["sponsor"])
+
+        for session_id in {motion["leg_session"] for motion in motions}:
+            sessions[session_id] = await Session.convert(ctx, session_id)
+
+        by_id = {
+            motion["id"]: cls(
+                **motion,
+                session=sessions[motion["leg_session"]],
+                bot=ctx.bot,
+                sponsors=sponsors[motion["id"]],
+            )
+            for motion in motions
+        }
+
+        return [by_id[motion_id] for motion_id in ids if motion_id in by_id]
+
+
+class BillStatusBatch:
+    """Collects the database writes of many bill status transitions and applies them in a single transaction.
+
+    While a BillStatus has a batch attached, `_apply_status` and `log_history` queue their writes here instead
+    of executing them. Updates are grouped by the set of columns they change, so each group is a single
+    `executemany`, and sessions that are looked up by many transitions are only fetched once.
+    """
+
+    def __init__(self, bot):
+        self._bot = bot
+        self._updates: typing.Dict[typing.Tuple[str, ...], typing.List] = {}
+        self._bill_sessions = []
+        self._history = []
+        self._deleted_history = []
+        self._sessions: typing.Dict[int, Session] = {}
+        self._open_sessions: typing.Dict[str, typing.Optional[int]] = {}
+
+    def __len__(self):
+        return sum(len(rows) for rows in self._updates.values())
+
+    def update_bill(self, bill_id: int, columns: typing.Dict[str, typing.Any]):
+        self._updates.setdefault(tuple(columns), []).append(
+            (*columns.values(), bill_id)
+        )
+
+    def link_session(self, bill_id: int, leg_session: int):
+        self._bill_sessions.append((bill_id, leg_session))
+
+    def add_history(self, *row):
+        self._history.append(row)
+
+    def delete_history(self, *row):
+        self._deleted_history.append(row)
+
+    async def fetch_session(self, session_id: int) -> Session:
+        try:
+            return self._sessions[session_id]
+        except KeyError:
+            session = await Session.convert(context.MockContext(self._bot), session_id)
+            self._sessions[session_id] = session
+            return session
+
+    async def fetch_open_session_id(self, house: str) -> typing.Optional[int]:
+        if house not in self._open_sessions:
+            self._open_sessions[house] = await self._bot.db.fetchval(
+                "SELECT id FROM legislature_session WHERE status != 'Closed' AND house = $1 ORDER BY id DESC LIMIT 1",
+                house,
+            )
+
+        return self._open_sessions[house]
+
+    async def commit(self):
+        if not (self._updates or self._history or self._deleted_history):
+            return
+
+        async with self._bot.db.acquire() as connection:
+            async with connection.transaction():
+                if self._deleted_history:
+                    await connection.executemany(
+                        "DELETE FROM bill_history WHERE bill_id = $1 AND after_status = $2 AND note = $3",
+                        self._deleted_history,
+                    )
+
+                for columns, rows in self._updates.items():
+                    assignments = ", ".join(
+                        f"{column} = ${i}" for i, column in enumerate(columns, start=1)
+                    )
+                    await connection.executemany(
+                        f"UPDATE bill SET {assignments} WHERE id = ${len(columns) + 1}",
+                        rows,
+                    )
+
+                if self._bill_sessions:
+                    await connection.executemany(
+                        "INSERT INTO bill_session (bill_id, leg_session) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+                        self._bill_sessions,
+                    )
+
+                if self._history:
+                    await connection.executemany(
+                        "INSERT INTO bill_history (bill_id, date, before_status, after_status, note) "
+                        "VALUES ($1, $2, $3, $4, $5)",
+                        self._history,
+                    )
+
+        logging.info(
+            f"Applied {len(self)} bill status transitions in {len(self._updates)} batches."
+        )
+
 
 class LegalConsumer:
     def __init__(
@@ -621,11 +793,18 @@ class LegalConsumer:
         self._passed_objs = self.objects - self._filtered_out_objs
 
     async def consume(self, *, scheduler=None, **kwargs):
+        batch = BillStatusBatch(self.ctx.bot)
+
         for obj in self.passed:
+            obj.status._batch = batch
             action = getattr(obj.status, self.action.__name__)
             await maybe_coroutine(action, dry=False, **kwargs)
 
-            if scheduler:
+        # all status transitions are written at once, and only then announced
+        await batch.commit()
+
+        if scheduler:
+            for obj in self.passed:
                 scheduler.add(obj)
 
     @property
@@ -712,6 +891,7 @@ class BillStatus:
     def __init__(self, bot, bill):
         self._bot: "bot.DemocracivBot" = bot
         self._bill: Bill = bill
+        self._batch: typing.Optional[BillStatusBatch] = None
 
     def __eq__(self, other):
         return isinstance(other, BillStatus) and self.flag == other.flag
@@ -729,14 +909,15 @@ class BillStatus:
         self, old_status: _BillStatusFlag, new_status: _BillStatusFlag, *, note=None
     ):
         logged_at = datetime.datetime.utcnow()
-        await self._bot.db.execute(
-            "INSERT INTO bill_history (bill_id, date, before_status, after_status, note) VALUES ($1, $2, $3, $4, $5)",
-            self._bill.id,
-            logged_at,
-            old_status.value,
-            new_status.value,
-            note,
-        )
+        row = (self._bill.id, logged_at, old_status.value, new_status.value, note)
+
+        if self._batch is not None:
+            self._batch.add_history(*row)
+        else:
+            await self._bot.db.execute(
+                "INSERT INTO bill_history (bill_id, date, before_status, after_status, note) VALUES ($1, $2, $3, $4, $5)",
+                *row,
+            )
 
         self._bill.status = BillStatus.from_flag_value(new_status.value)(
             self._bot, self._bill
@@ -757,12 +938,7 @@ class BillStatus:
             )
 
         if old_status is _BillStatusFlag.LAW or new_status is _BillStatusFlag.LAW:
-            await self._bot.api_request(
-                "POST",
-                "document/update",
-                silent=True,
-                json={"id": self._bill.id, "type": "bill"},
-            )
+            self._bot.search_index.update("bill", self._bill.id)
 
     async def veto(self, dry=False, **kwargs):
         raise IllegalBillOperation()
@@ -903,13 +1079,19 @@ class BillStatus:
             )
 
     async def _fetch_session(self, session_id: int) -> Session:
+        if self._batch is not None:
+            return await self._batch.fetch_session(session_id)
+
         return await Session.convert(context.MockContext(self._bot), session_id)
 
     async def _get_open_session(self, house: str) -> typing.Optional[Session]:
-        session_id = await self._bot.db.fetchval(
-            "SELECT id FROM legislature_session WHERE status != 'Closed' AND house = $1 ORDER BY id DESC LIMIT 1",
-            house,
-        )
+        if self._batch is not None:
+            session_id = await self._batch.fetch_open_session_id(house)
+        else:
+            session_id = await self._bot.db.fetchval(
+                "SELECT id FROM legislature_session WHERE status != 'Closed' AND house = $1 ORDER BY id DESC LIMIT 1",
+                house,
+            )
 
         if session_id is None:
             return None
@@ -943,42 +1125,56 @@ class BillStatus:
         leg_session=_UNCHANGED,
         executive_deadline_at=_UNCHANGED,
     ):
-        query = ["status = $1"]
-        args = [new_status.value]
-        param_no = 2
+        columns = {"status": new_status.value}
 
         if leg_session is not _UNCHANGED:
-            query.append(f"leg_session = ${param_no}")
-            args.append(leg_session)
-            param_no += 1
+            columns["leg_session"] = leg_session
 
         if executive_deadline_at is not _UNCHANGED:
-            query.append(f"executive_deadline_at = ${param_no}")
-            args.append(executive_deadline_at)
-            param_no += 1
-
-        args.append(self._bill.id)
+            columns["executive_deadline_at"] = executive_deadline_at
 
-        await self._bot.db.execute(
-            f"UPDATE bill SET {', '.join(query)} WHERE id = ${param_no}", *args
-        )
-
-        if leg_session is not _UNCHANGED:
+        if self._batch is not None:
+            self._batch.update_bill(self._bill.id, columns)
+        else:
+            query = ", ".join(
+                f"{column} = ${i}" for i, column in enumerate(columns, start=1)
+            )
             await self._bot.db.execute(
-                "INSERT INTO bill_session (bill_id, leg_session) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+                f"UPDATE bill SET {query} WHERE id = ${len(columns) + 1}",
+                *columns.values(),
                 self._bill.id,
-                leg_session,
             )
+
+        if leg_session is not _UNCHANGED:
+            if self._batch is not None:
+                self._batch.link_session(self._bill.id, leg_session)
+            else:
+                await self._bot.db.execute(
+                    "INSERT INTO bill_session (bill_id, leg_session) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+                    self._bill.id,
+                    leg_session,
+                )
+
             self._bill.session = await self._fetch_session(leg_session)
 
         if executive_deadline_at is not _UNCHANGED:
             self._bill.executive_deadline_at = executive_deadline_at
 
+            if executive_deadline_at is not None:
+                # lets the Ministry re-arm its auto-pass timer, see Ministry.on_executive_deadline_set
+                self._bot.dispatch(
+                    "executive_deadline_set", self._bill, executive_deadline_at
+                )
+
         await self.log_history(old_status, new_status, note=note)
 
     async def _delete_matching_history(
         self, *, after_status: _BillStatusFlag, note: str
     ):
+        if self._batch is not None:
+            self._batch.delete_history(self._bill.id, after_status.value, note)
+            return
+
         await self._bot.db.execute(
             "DELETE FROM bill_history WHERE bill_id = $1 AND after_status = $2 AND note = $3",
             self._bill.id,
@@ -1112,12 +1308,7 @@ class BillSubmitted(BillStatus):
             return
 
         await self._bot.db.execute("DELETE FROM bill WHERE id = $1", self._bill.id)
-        await self._bot.api_request(
-            "POST",
-            "document/delete",
-            silent=True,
-            json={"id": self._bill.id, "type": "bill"},
-        )
+        self._bot.search_index.delete("bill", self._bill.id)
 
     async def fail_in_legislature(self, dry=False, **kwargs):
         if dry:
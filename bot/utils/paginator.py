@@ -11,6 +11,7 @@ import typing
 import discord
 
 from discord.ext import menus
+from discord.utils import maybe_coroutine
 from discord.ext.commands import Paginator as CommandPaginator
 from discord.ext.menus.views import ViewMenuPages
 
@@ -85,11 +86,160 @@ class SimplePageSource(menus.ListPageSource):
         return menu.embed
 
 
+class KeysetPageSource(menus.PageSource):
+    """Fetches the pages of a listing lazily from the database with keyset pagination instead of loading
+    and formatting every row before the first page can be shown.
+
+    `query` is any SELECT statement that returns the `keys` columns, the page boundaries are resolved with
+    `WHERE (keys) > (last seen keys)` (or `<` if `descending`) on top of it. Visited pages are cached, and
+    the page after the one that is currently shown is fetched in the background. `formatter` turns the
+    records of one page into the lines that should be shown, it can be a coroutine function.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        query: str,
+        args: typing.Sequence = (),
+        keys: typing.Sequence[str] = ("id",),
+        descending: bool = False,
+        formatter: typing.Callable,
+        per_page: int = 12,
+        empty_message: str = "*No entries.*",
+    ):
+        self.db = db
+        self.query = query
+        self.args = tuple(args)
+        self.keys = tuple(keys)
+        self.descending = descending
+        self.formatter = formatter
+        self.per_page = per_page
+        self.empty_message = empty_message
+        self.total = 0
+
+        self._entries: typing.Dict[int, typing.List[str]] = {}
+        self._bounds: typing.Dict[int, typing.Tuple[tuple, tuple]] = {}
+        self._lock = asyncio.Lock()
+        self._prefetch_task: typing.Optional[asyncio.Task] = None
+
+    async def prepare(self):
+        self.total = await self.db.fetchval(
+            f"SELECT count(*) FROM ({self.query}) AS listing", *self.args
+        )
+
+    def is_paginating(self):
+        return self.total > self.per_page
+
+    def get_max_pages(self):
+        return max(1, -(-self.total // self.per_page))
+
+    def _build_query(self, *, after: typing.Optional[tuple], backwards: bool):
+        columns = ", ".join(self.keys)
+        descending = self.descending != backwards
+        direction = "DESC" if descending else "ASC"
+        args = list(self.args)
+        sql = f"SELECT * FROM ({self.query}) AS listing"
+
+        if after is not None:
+            placeholders = ", ".join(
+                f"${len(args) + i + 1}" for i in range(len(self.keys))
+            )
+            sql = (
+                f"{sql} WHERE ({columns}) {'<' if descending else '>'} ({placeholders})"
+            )
+            args.extend(after)
+
+        order = ", ".join(f"{key} {direction}" for key in self.keys)
+        return f"{sql} ORDER BY {order} LIMIT ${len(args) + 1}", args
+
+    async def _fetch(self, *, after=None, backwards=False, limit=None):
+        sql, args = self._build_query(after=after, backwards=backwards)
+        records = await self.db.fetch(sql, *args, limit or self.per_page)
+        return list(reversed(records)) if backwards else records
+
+    async def _load_page(self, page_number: int):
+        last_page = self.get_max_pages() - 1
+
+        if page_number == 0:
+            records = await self._fetch()
+        elif page_number - 1 in self._bounds:
+            records = await self._fetch(after=self._bounds[page_number - 1][1])
+        elif page_number + 1 in self._bounds:
+            # every page before the last one is full, so we can just as well walk backwards
+            records = await self._fetch(
+                after=self._bounds[page_number + 1][0], backwards=True
+            )
+        elif page_number == last_page:
+            records = await self._fetch(
+                backwards=True, limit=self.total - page_number * self.per_page
+            )
+        else:
+            # jumped somewhere we haven't been yet, walk there from the closest page we know
+            known = max(
+                (page for page in self._bounds if page < page_number), default=0
+            )
+
+            for page in range(known + 1, page_number):
+                await self._load_page(page)
+
+            if page_number - 1 in self._bounds:
+                return await self._load_page(page_number)
+
+            # rows were deleted since we counted them, there is nothing left to show here
+            records = []
+
+        if records:
+            self._bounds[page_number] = (
+                tuple(records[0][key] for key in self.keys),
+                tuple(records[-1][key] for key in self.keys),
+            )
+
+        self._entries[page_number] = list(
+            await maybe_coroutine(self.formatter, records)
+        )
+
+    async def _get_entries(self, page_number: int) -> typing.List[str]:
+        async with self._lock:
+            if page_number not in self._entries:
+                if page_number != 0 and 0 not in self._bounds:
+                    await self._load_page(0)
+
+                await self._load_page(page_number)
+
+            return self._entries[page_number]
+
+    def _prefetch(self, page_number: int):
+        if page_number >= self.get_max_pages() or page_number in self._entries:
+            return
+
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self._get_entries(page_number))
+
+    async def get_page(self, page_number: int):
+        if self.total == 0:
+            return [self.empty_message]
+
+        entries = await self._get_entries(page_number)
+        self._prefetch(page_number + 1)
+        return entries
+
+    async def format_page(self, menu: "Pages", entries: typing.List[str]):
+        menu.embed.description = "\n".join(entries) or self.empty_message
+        maximum = self.get_max_pages()
+
+        if maximum > 1:
+            menu.embed.set_footer(text=f"Page {menu.current_page + 1}/{maximum}")
+
+        return menu.embed
+
+
 class SimplePages(Pages, inherit_buttons=False):
     def __init__(
         self,
-        entries: typing.List[str],
+        entries: typing.List[str] = None,
         *,
+        source: menus.PageSource = None,
         per_page=None,
         empty_message: str = "*No entries.*",
         reply=False,
@@ -98,9 +248,14 @@ class SimplePages(Pages, inherit_buttons=False):
     ):
         self.reply = reply
         self.ephemeral_webhook = ephemeral_webhook
-        if len(entries) == 0:
-            entries.append(empty_message)
-        super().__init__(SimplePageSource(entries, per_page=per_page), **kwargs)
+
+        if source is None:
+            if len(entries) == 0:
+                entries.append(empty_message)
+
+            source = SimplePageSource(entries, per_page=per_page)
+
+        super().__init__(source, **kwargs)
 
     async def send_initial_message(self, ctx, channel):
         page = await self._source.get_page(0)
@@ -0,0 +1,107 @@
+import collections
+import contextlib
+import contextvars
+import functools
+import logging
+import re
+import time
+import typing
+
+_whitespace = re.compile(r"\s+")
+
+
+class QueryProfile:
+    """The queries of a single command invocation, listener call or background task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.count = 0
+        self.elapsed = 0.0
+        self.statements: typing.Counter[str] = collections.Counter()
+        self.statement_elapsed: typing.DefaultDict[str, float] = (
+            collections.defaultdict(float)
+        )
+
+    def record(self, query: str, elapsed: float):
+        query = _whitespace.sub(" ", query).strip()
+        self.count += 1
+        self.elapsed += elapsed
+        self.statements[query] += 1
+        self.statement_elapsed[query] += elapsed
+
+    def fan_out(self, threshold: int) -> typing.List[typing.Tuple[str, int, float]]:
+        """Statements that were executed at least `threshold` times, which usually means that they're
+        run once per row of a previous query, i.e. an N+1 pattern."""
+
+        return [
+            (query, count, self.statement_elapsed[query])
+            for query, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryProfiler:
+    """Attributes every database query to the command, listener or background task that issued it.
+
+    The current profile is kept in a context variable, asyncpg's query loggers are called with the context
+    of the query's caller, so queries end up in the right profile even with many commands running at once.
+    When a profile is finished, statements that were executed at least `threshold` times are reported as
+    likely N+1 patterns. Profiling is off by default and can be toggled at runtime with `-jsk profiler`.
+    """
+
+    def __init__(self, bot, *, enabled: bool = False, threshold: int = 10):
+        self.bot = bot
+        self.enabled = enabled
+        self.threshold = threshold
+        self._current: contextvars.ContextVar[typing.Optional[QueryProfile]] = (
+            contextvars.ContextVar("query_profile", default=None)
+        )
+        self.recent: typing.Deque[QueryProfile] = collections.deque(maxlen=50)
+        self.suspects: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+
+    @contextlib.contextmanager
+    def profile(self, name: str):
+        if not self.enabled or self._current.get() is not None:
+            # nested profiles are attributed to the outermost one
+            yield None
+            return
+
+        profile = QueryProfile(name)
+        token = self._current.set(profile)
+
+        try:
+            yield profile
+        finally:
+            self._current.reset(token)
+            # asyncpg calls the query loggers with call_soon, the last query's is still pending at this point
+            self.bot.loop.call_soon(self._finish, profile)
+
+    def wrap_listener(self, name: str, listener: typing.Callable) -> typing.Callable:
+        @functools.wraps(listener)
+        async def wrapped(*args, **kwargs):
+            with self.profile(f"listener:{name}"):
+                return await listener(*args, **kwargs)
+
+        return wrapped
+
+    def log_query(self, record):
+        # asyncpg query logger, see Metrics.log_query
+        profile = self._current.get()
+
+        if profile is not None:
+            profile.record(record.query, record.elapsed)
+
+    def _finish(self, profile: QueryProfile):
+        if not profile.count:
+            return
+
+        self.recent.append(profile)
+
+        for query, count, elapsed in profile.fan_out(self.threshold):
+            self.suspects[(profile.name, query)] += 1
+            self.bot.metrics.increment("db_n_plus_one")
+            logging.warning(
+                f"Possible N+1 query in {profile.name}: {count}x in {elapsed * 1000:.1f}ms, "
+                f"{profile.count} queries in total: {query[:200]}"
+            )
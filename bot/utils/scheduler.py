@@ -0,0 +1,97 @@
+import asyncio
+import collections
+import datetime
+import heapq
+import itertools
+import logging
+import typing
+
+import discord
+
+Timer = collections.namedtuple("Timer", "when seq key name callback")
+
+
+class TimerScheduler:
+    """A single bot-wide scheduler for one-off deadlines, backed by a heap.
+
+    Every timer is identified by a key, scheduling a key again replaces its previous deadline. One task sleeps
+    until the earliest deadline, so idle timers cost nothing and callbacks run at their exact deadline.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._heap: typing.List[Timer] = []
+        self._timers: typing.Dict[typing.Hashable, Timer] = {}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+        self._task: typing.Optional[asyncio.Task] = None
+
+    def schedule(
+        self,
+        key: typing.Hashable,
+        when: datetime.datetime,
+        callback: typing.Callable[[], typing.Awaitable],
+        *,
+        name: str = None,
+    ):
+        """Run the coroutine function `callback` at `when`, replacing any pending timer with the same key."""
+
+        timer = Timer(when, next(self._counter), key, name or str(key), callback)
+        self._timers[key] = timer
+        heapq.heappush(self._heap, timer)
+        self._wake_up()
+
+    def cancel(self, key: typing.Hashable):
+        # the heap entry is dropped lazily once it comes up
+        if self._timers.pop(key, None) is not None:
+            self._wake_up()
+
+    def get(self, key: typing.Hashable) -> typing.Optional[Timer]:
+        return self._timers.get(key)
+
+    @property
+    def pending(self) -> typing.List[Timer]:
+        return sorted(self._timers.values())
+
+    def _wake_up(self):
+        self._changed.set()
+
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._run())
+
+    def _pop_stale(self):
+        while self._heap and self._timers.get(self._heap[0].key) is not self._heap[0]:
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._changed.clear()
+            self._pop_stale()
+
+            if not self._heap:
+                return
+
+            delay = (self._heap[0].when - discord.utils.utcnow()).total_seconds()
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            timer = heapq.heappop(self._heap)
+            del self._timers[timer.key]
+            self.bot.loop.create_task(self._fire(timer))
+
+    @staticmethod
+    async def _fire(timer: Timer):
+        try:
+            await timer.callback()
+        except Exception as e:
+            logging.error(f"Error in scheduled timer {timer.name}: {e!r}")
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
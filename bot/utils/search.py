@@ -0,0 +1,88 @@
+import asyncio
+import collections
+import logging
+import typing
+
+
+class SearchIndexQueue:
+    """Coalesces search index updates and deletions of documents and sends them to the internal API
+    in bulk, so that passing or closing a whole session ends up as a single `document/bulk` request
+    per document type instead of one request per bill. Documents whose request failed are queued again
+    and retried after `retry_delay` seconds."""
+
+    def __init__(self, bot, *, delay: float = 2.0, retry_delay: float = 30.0):
+        self.bot = bot
+        self.delay = delay
+        self.retry_delay = retry_delay
+        self._updates: typing.Dict[str, typing.Set[int]] = collections.defaultdict(set)
+        self._deletes: typing.Dict[str, typing.Set[int]] = collections.defaultdict(set)
+        self._flush_task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(ids) for ids in self._updates.values()) + sum(
+            len(ids) for ids in self._deletes.values()
+        )
+
+    def update(self, document_type: str, document_id: int):
+        self._deletes[document_type].discard(document_id)
+        self._updates[document_type].add(document_id)
+        self._schedule()
+
+    def delete(self, document_type: str, document_id: int):
+        self._updates[document_type].discard(document_id)
+        self._deletes[document_type].add(document_id)
+        self._schedule()
+
+    def _schedule(self, delay: typing.Optional[float] = None):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self.bot.loop.create_task(
+                self._flush_later(self.delay if delay is None else delay)
+            )
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    def _requeue(self, action: str, document_type: str, ids: typing.Set[int]):
+        # ids that were changed again in the meantime keep their newer action
+        if action == "update":
+            self._updates[document_type].update(ids - self._deletes[document_type])
+        else:
+            self._deletes[document_type].update(ids - self._updates[document_type])
+
+    async def flush(self):
+        # changes that arrive while this flush waits for the API are sent by a flush of their own
+        self._flush_task = None
+        failed = False
+
+        updates, self._updates = self._updates, collections.defaultdict(set)
+        deletes, self._deletes = self._deletes, collections.defaultdict(set)
+
+        for action, pending in (("update", updates), ("delete", deletes)):
+            for document_type, ids in pending.items():
+                if not ids:
+                    continue
+
+                logging.info(
+                    f"Sending {len(ids)} search index {action}(s) for {document_type}."
+                )
+
+                try:
+                    response = await self.bot.api_request(
+                        "POST",
+                        f"document/bulk/{action}",
+                        silent=True,
+                        json={"ids": sorted(ids), "type": document_type},
+                    )
+                except Exception as e:
+                    logging.warning(f"Search index {action} failed: {e!r}")
+                    response = None
+
+                # api_request returns None if the API couldn't be reached or didn't answer with 200
+                if response is None:
+                    failed = True
+                    self._requeue(action, document_type, ids)
+
+        if failed:
+            self._schedule(self.retry_delay)
@@ -0,0 +1,140 @@
+import asyncio
+import collections
+import logging
+import time
+import traceback
+import typing
+
+
+class StartupPhase:
+    def __init__(self, name: str, func: typing.Callable, after: typing.Sequence[str]):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.started_at: typing.Optional[float] = None
+        self.finished_at: typing.Optional[float] = None
+        self.failed = False
+
+    @property
+    def duration(self) -> typing.Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+
+        return self.finished_at - self.started_at
+
+
+class StartupGraph:
+    """The bot's startup as a graph of named phases, i.e. database → caches → cogs.
+
+    Every phase starts as soon as the phases it comes `after` are finished, so independent phases run
+    concurrently instead of racing each other through `wait_until_ready`. Code that needs a phase to be
+    finished, i.e. a cog's cache loader that needs the database, awaits `wait(name)`. Once every phase is
+    done, a report of the time spent per phase and per extension is logged, it's also available with
+    `-stats startup`.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.phases: typing.Dict[str, StartupPhase] = {}
+        self.extensions: typing.Dict[str, typing.Tuple[float, bool]] = {}
+        self.started_at = time.perf_counter()
+        self._done: typing.DefaultDict[str, asyncio.Event] = collections.defaultdict(
+            asyncio.Event
+        )
+        self._tasks: typing.List[asyncio.Task] = []
+
+    def add(
+        self,
+        name: str,
+        func: typing.Callable[[], typing.Awaitable],
+        *,
+        after: typing.Sequence[str] = (),
+    ):
+        self.phases[name] = StartupPhase(name, func, after)
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._run(phase))
+            for phase in self.phases.values()
+            if phase.started_at is None
+        ]
+        asyncio.create_task(self._report_when_done(self._tasks))
+
+    async def wait(self, name: str):
+        await self._done[name].wait()
+
+    def is_done(self, name: str) -> bool:
+        return self._done[name].is_set()
+
+    async def _run(self, phase: StartupPhase):
+        for dependency in phase.after:
+            await self.wait(dependency)
+
+        phase.started_at = time.perf_counter()
+
+        try:
+            await phase.func()
+        except Exception:
+            # dependents still run, they'd have raced ahead before this existed too
+            phase.failed = True
+            logging.error(f"Startup phase '{phase.name}' failed.")
+            traceback.print_exc()
+        finally:
+            phase.finished_at = time.perf_counter()
+            self._done[phase.name].set()
+
+    async def load_extensions(self, extensions: typing.Iterable[str]):
+        """Load all extensions concurrently, anything a cog awaits in `cog_load` overlaps with the others."""
+
+        async def load(extension: str):
+            start = time.perf_counter()
+            ok = True
+
+            try:
+                await self.bot.load_extension(extension)
+            except Exception:
+                ok = False
+                logging.error(f"Failed to load module {extension}.")
+                traceback.print_exc()
+
+            self.extensions[extension] = (time.perf_counter() - start, ok)
+
+        await asyncio.gather(*[load(extension) for extension in extensions])
+        logging.info(
+            f"Loaded {sum(ok for _, ok in self.extensions.values())}/{len(self.extensions)} extensions"
+        )
+
+    def report(self) -> typing.List[str]:
+        lines = []
+        phases = sorted(
+            self.phases.values(),
+            key=lambda p: p.started_at if p.started_at is not None else float("inf"),
+        )
+
+        for phase in phases:
+            if phase.duration is None:
+                lines.append(f"{phase.name}: pending")
+                continue
+
+            status = " (failed)" if phase.failed else ""
+            lines.append(
+                f"{phase.name}: {phase.duration * 1000:.0f}ms, "
+                f"started at +{(phase.started_at - self.started_at) * 1000:.0f}ms{status}"
+            )
+
+        return lines
+
+    def extension_report(self) -> typing.List[str]:
+        return [
+            f"{extension}: {seconds * 1000:.0f}ms{'' if ok else ' (failed)'}"
+            for extension, (seconds, ok) in sorted(
+                self.extensions.items(), key=lambda e: e[1][0], reverse=True
+            )
+        ]
+
+    async def _report_when_done(self, tasks: typing.List[asyncio.Task]):
+        await asyncio.gather(*tasks, return_exceptions=True)
+        total = time.perf_counter() - self.started_at
+        self.bot.metrics.observe("startup", total)
+        lines = "\n    ".join(self.report() + self.extension_report())
+        logging.info(f"Startup finished in {total:.2f}s:\n    {lines}")
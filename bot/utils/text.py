@@ -1,11 +1,13 @@
+import asyncio
 import collections
-import copy
 import datetime
+import logging
 import textwrap
 import typing
+import uuid
 import discord
 
-from discord.ext import tasks, commands
+from discord.ext import commands
 from bot.config import config, mk
 from bot.utils import exceptions
 
@@ -30,17 +32,29 @@ def split_string_into_multiple(string: str, length: int):
 
 
 class AnnouncementScheduler:
+    """Collects objects (bills) and announces them together once `wait_time` minutes have passed
+    since the last addition.
+
+    Pending objects are persisted in the `announcement_queue` table and rehydrated when the scheduler is
+    created again after a restart. Every flush claims its rows with a flush key, and every completed step
+    of a flush is recorded in `announcement_flush_step`, so a flush interrupted by a crash is resumed on
+    the next start without announcing anything twice."""
+
+    # truthy attributes of queued objects with these names survive a restart
+    persisted_flags: typing.Tuple[str, ...] = ("_auto_passed",)
+
+    # flush keys of flushes currently in progress in this process
+    _in_flight: typing.Set[str] = set()
+
     def __init__(self, bot, channel):
         self.bot = bot
         self._channel: mk.DemocracivChannel = channel
         self._objects: typing.List = []
         self._last_addition = None
+        self._pending_writes: typing.Set[asyncio.Task] = set()
         self.wait_time = 20
-        self._task = None
-
-    def __del__(self):
-        if self._task is not None:
-            self._task.cancel()
+        self.kind = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        self.bot.loop.create_task(self._rehydrate())
 
     @property
     def channel(self) -> typing.Optional[discord.TextChannel]:
@@ -53,27 +67,206 @@ class AnnouncementScheduler:
         pass
 
     def add(self, obj):
-        if len(self._objects) == 0:
-            self._task = copy.copy(self._wait)
-            self._task.start()
-
         self._objects.append(obj)
         self._last_addition = discord.utils.utcnow()
 
+        task = self.bot.loop.create_task(self._persist(obj, self._last_addition))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+        self._schedule()
+
+    def _schedule(self):
+        # every addition pushes the flush back to `wait_time` minutes after the last one
+        self.bot.scheduler.schedule(
+            self.kind,
+            self._last_addition + datetime.timedelta(minutes=self.wait_time),
+            self._trigger,
+            name=f"{self.__class__.__name__} ({len(self._objects)} pending)",
+        )
+
+    async def _persist(self, obj, added_at: datetime.datetime):
+        flags = [flag for flag in self.persisted_flags if getattr(obj, flag, False)]
+
+        # queued again while an earlier flush has it claimed, that flush must neither delete nor skip it
+        await self.bot.db.execute(
+            "INSERT INTO announcement_queue (kind, object_id, added_at, flags) VALUES ($1, $2, $3, $4) "
+            "ON CONFLICT (kind, object_id) DO UPDATE SET added_at = $3, flags = $4, flush_key = NULL",
+            self.kind,
+            obj.id,
+            added_at.replace(tzinfo=None),
+            flags,
+        )
+
+    async def load_objects(self, ids: typing.List[int]) -> typing.List:
+        # imported here, bot.utils.context and bot.utils.models depend on this module
+        from bot.utils import context, models
+
+        return await models.Bill.convert_many(context.MockContext(self.bot), ids)
+
+    async def _load_rows(self, rows) -> typing.List:
+        objects = await self.load_objects([row["object_id"] for row in rows])
+        flags = {row["object_id"]: row["flags"] for row in rows}
+        missing = set(flags) - {obj.id for obj in objects}
+
+        if missing:
+            # the bill was deleted in the meantime, i.e. withdrawn
+            await self.bot.db.execute(
+                "DELETE FROM announcement_queue WHERE kind = $1 AND object_id = ANY($2::int[])",
+                self.kind,
+                list(missing),
+            )
+
+        for obj in objects:
+            for flag in flags[obj.id]:
+                setattr(obj, flag, True)
+
+        return objects
+
+    async def _rehydrate(self):
+        await self.bot.wait_until_ready()
+
+        rows = await self.bot.db.fetch(
+            "SELECT object_id, added_at, flags, flush_key FROM announcement_queue "
+            "WHERE kind = $1 ORDER BY added_at",
+            self.kind,
+        )
+
+        unclaimed = [row for row in rows if row["flush_key"] is None]
+        interrupted = collections.defaultdict(list)
+
+        for row in rows:
+            if row["flush_key"] is not None and row["flush_key"] not in self._in_flight:
+                interrupted[row["flush_key"]].append(row)
+
+        for flush_key, claimed in interrupted.items():
+            logging.info(
+                f"Resuming interrupted announcement flush {flush_key} of {self.kind}."
+            )
+            await self._flush(
+                flush_key,
+                await self._load_rows(claimed),
+                max(row["added_at"] for row in claimed),
+            )
+
+        if not unclaimed:
+            return
+
+        known = {obj.id for obj in self._objects}
+        self._objects.extend(
+            obj for obj in await self._load_rows(unclaimed) if obj.id not in known
+        )
+
+        last_addition = unclaimed[-1]["added_at"].replace(tzinfo=datetime.timezone.utc)
+        self._last_addition = max(self._last_addition or last_addition, last_addition)
+        self._schedule()
+
+        logging.info(
+            f"Rehydrated {len(unclaimed)} pending announcement(s) of {self.kind}."
+        )
+
     async def trigger_now(self):
         await self._trigger()
 
     async def _trigger(self):
+        self.bot.scheduler.cancel(self.kind)
         self._last_addition = None
-        self._objects.sort(key=lambda obj: obj.id)
-        await self.send_messages()
 
-        await self.bot.get_cog("Law").generate_google_docs_legal_code()
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+        objects, self._objects = self._objects, []
+
+        if not objects:
+            return
+
+        flush_key = uuid.uuid4().hex
+        ids = [obj.id for obj in objects]
+
+        claimed = await self.bot.db.fetch(
+            "UPDATE announcement_queue SET flush_key = $1 WHERE kind = $2 AND "
+            "object_id = ANY($3::int[]) AND flush_key IS NULL RETURNING added_at",
+            flush_key,
+            self.kind,
+            ids,
+        )
+        claimed_until = max(
+            (row["added_at"] for row in claimed),
+            default=discord.utils.utcnow().replace(tzinfo=None),
+        )
+
+        # objects that were claimed by another flush already, i.e. of a reloaded scheduler, are skipped
+        taken = await self.bot.db.fetch(
+            "SELECT object_id FROM announcement_queue WHERE kind = $1 AND "
+            "object_id = ANY($2::int[]) AND flush_key != $3",
+            self.kind,
+            ids,
+            flush_key,
+        )
+        taken = {row["object_id"] for row in taken}
+        await self._flush(
+            flush_key, [obj for obj in objects if obj.id not in taken], claimed_until
+        )
+
+    async def _flush(
+        self, flush_key: str, objects: typing.List, claimed_until: datetime.datetime
+    ):
+        if not objects:
+            return
+
+        self._in_flight.add(flush_key)
 
-        self._objects.clear()
+        # get_embed() and friends read self._objects, additions that arrive during the flush are kept aside
+        queued, self._objects = self._objects, sorted(objects, key=lambda obj: obj.id)
 
-        if self._task:
-            self._task.cancel()
+        try:
+            await self.send_messages(flush_key)
+
+            await self.bot.legal_code_renderer.refresh()
+            await self.bot.legal_code.generate()
+
+            async with self.bot.db.acquire() as connection:
+                async with connection.transaction():
+                    # rows that were queued again after they were claimed are left for the next flush
+                    await connection.execute(
+                        "DELETE FROM announcement_queue WHERE flush_key = $1 AND added_at <= $2",
+                        flush_key,
+                        claimed_until,
+                    )
+                    await connection.execute(
+                        "DELETE FROM announcement_flush_step WHERE flush_key = $1",
+                        flush_key,
+                    )
+        finally:
+            self._in_flight.discard(flush_key)
+
+            # compared by identity, a bill that was added again during the flush equals the one that was sent
+            self._objects = queued + [
+                obj
+                for obj in self._objects
+                if not any(obj is flushed for flushed in objects)
+            ]
+
+    async def _run_step_once(
+        self, flush_key: str, step: str, func: typing.Callable[[], typing.Awaitable]
+    ):
+        """Runs `func` unless this step of the flush already completed before an interruption."""
+
+        done = await self.bot.db.fetchval(
+            "SELECT TRUE FROM announcement_flush_step WHERE flush_key = $1 AND step = $2",
+            flush_key,
+            step,
+        )
+
+        if done:
+            return
+
+        await func()
+        await self.bot.db.execute(
+            "INSERT INTO announcement_flush_step (flush_key, step) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+            flush_key,
+            step,
+        )
 
     def _split_embeds(
         self, original_embed: discord.Embed
@@ -99,7 +292,10 @@ class AnnouncementScheduler:
 
         return embeds
 
-    async def send_messages(self):
+    async def send_messages(self, flush_key: str):
+        await self._run_step_once(flush_key, "discord", self.send_discord_messages)
+
+    async def send_discord_messages(self):
         message = self.get_message()
         embed = self.get_embed()
 
@@ -122,15 +318,6 @@ class AnnouncementScheduler:
             message, embed=embed, allowed_mentions=discord.AllowedMentions(roles=True)
         )
 
-    @tasks.loop(seconds=30)
-    async def _wait(self):
-        if (
-            self._last_addition is not None
-            and discord.utils.utcnow() - self._last_addition
-            > datetime.timedelta(minutes=self.wait_time)
-        ):
-            await self._trigger()
-
 
 class RedditAnnouncementScheduler(AnnouncementScheduler):
     def __init__(self, bot, channel, *, subreddit):
@@ -144,13 +331,15 @@ class RedditAnnouncementScheduler(AnnouncementScheduler):
     def get_reddit_post_content(self) -> str:
         raise NotImplementedError()
 
-    async def send_messages(self):
+    async def send_messages(self, flush_key: str):
+        await super().send_messages(flush_key)
+        await self._run_step_once(flush_key, "reddit", self.post_to_reddit)
+
+    async def post_to_reddit(self):
         title = self.get_reddit_post_title()
         content = self.get_reddit_post_content()
 
         js = {"subreddit": self.subreddit, "title": title, "content": content}
-
-        await super().send_messages()
         await self.bot.api_request("POST", "reddit/post", silent=True, json=js)
 
 